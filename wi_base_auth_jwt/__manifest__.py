@@ -16,7 +16,9 @@
         "security/ir.model.access.csv",
         "views/auth_jwt_validator_views.xml",
         "views/auth_jwt_request_views.xml",
+        "views/auth_jwt_request_daily_views.xml",
         "data/auth_jwt_validator.xml",
+        "data/auth_jwt_request_cron.xml",
     ],
     "assets": {
         "web.assets_backend": [
@@ -1,9 +1,12 @@
 import json
+from urllib.parse import urlencode
 
-from odoo import _
+from odoo import _, fields
 from odoo.http import Controller, Response, request, route
 
 DEFAULT_RESPONSE = {"status": 204, "message": "Data Not Found", "data": []}
+MAX_PAGE_LIMIT = 1000
+STREAM_CHUNK_SIZE = 200
 
 API_ENDPOINTS = {
     "GET": [
@@ -65,18 +68,81 @@ class BaseController(Controller):
             PUT_PATH_DATA.update(put_path)
         return True
 
-    def get_api_data(self, request, params=None):
+    def _get_api_page(self, request):
+        limit = request.params.get("limit")
+        offset = request.params.get("offset")
+        if not limit and not offset:
+            return None
+        limit = int(limit or MAX_PAGE_LIMIT)
+        offset = int(offset or 0)
+        if limit <= 0 or offset < 0:
+            raise ValueError(_("Limit must be positive and offset not negative"))
+        return {"limit": min(limit, MAX_PAGE_LIMIT), "offset": offset}
+
+    def _prepare_pagination(self, request, page):
+        next_offset = page["offset"] + page["limit"]
+        next_url = None
+        if next_offset < page["total"]:
+            args = request.httprequest.args.to_dict()
+            args.update({"limit": page["limit"], "offset": next_offset})
+            next_url = f"{request.httprequest.base_url}?{urlencode(args)}"
+        return {
+            "total": page["total"],
+            "limit": page["limit"],
+            "offset": page["offset"],
+            "next": next_url,
+        }
+
+    def _bad_request_response(self, request, message):
+        res = self._generate_response(
+            getattr(request, "jwt_request_id", None), 400, message, []
+        )
+        return Response(json.dumps(res), content_type="application/json", status=400)
+
+    def _stream_json_response(self, res):
+        """Serialize the response chunk by chunk instead of in one string."""
+        res = dict(res)
+        data = res.pop("data")
+        yield json.dumps(res)[:-1] + ', "data": ['
+        for index in range(0, len(data), STREAM_CHUNK_SIZE):
+            chunk = json.dumps(data[index : index + STREAM_CHUNK_SIZE])[1:-1]
+            yield f",{chunk}" if index else chunk
+        yield "]}"
+
+    def get_api_data(self, request, params=None, since=None):
         res = DEFAULT_RESPONSE
         company_id = getattr(request, "jwt_company_id", None)
         path = request.httprequest.path
         model = GET_PATH_DATA[path]["model"]
         function = GET_PATH_DATA[path]["function"]
         success_message = GET_PATH_DATA[path]["success_message"]
-        data = (
-            getattr(request.env[model], function)(company=company_id, params=params)
-            if params
-            else getattr(request.env[model], function)(company=company_id)
-        )
+        kwargs = {"company": company_id}
+        if params:
+            kwargs["params"] = params
+        if since:
+            try:
+                fields.Datetime.to_datetime(since)
+            except ValueError:
+                return self._bad_request_response(
+                    request, _("Invalid since cursor: %s", since)
+                )
+            kwargs["since"] = since
+        try:
+            page = self._get_api_page(request)
+        except ValueError as e:
+            return self._bad_request_response(request, str(e))
+        if not page and request.params.get("stream"):
+            # a stream is read page by page, the model never builds the whole
+            # result and the pagination links to the next page
+            page = {"limit": MAX_PAGE_LIMIT, "offset": 0}
+        records = request.env[model]
+        if page:
+            records = records.with_context(jwt_api_page=page)
+        data = getattr(records, function)(**kwargs)
+        if page and isinstance(data, list) and "total" not in page:
+            # the endpoint does not paginate its search, slice its result
+            page["total"] = len(data)
+            data = data[page["offset"] : page["offset"] + page["limit"]]
         if data:
             res = self._generate_response(
                 getattr(request, "jwt_request_id", None),
@@ -84,6 +150,14 @@ class BaseController(Controller):
                 success_message,
                 data,
             )
+            if page and isinstance(data, list):
+                res["pagination"] = self._prepare_pagination(request, page)
+        if isinstance(res["data"], list) and request.params.get("stream"):
+            return Response(
+                self._stream_json_response(res),
+                content_type="application/json",
+                status=200,
+            )
         return Response(json.dumps(res), content_type="application/json", status=200)
 
     def generate_failed_response(self, models, data):
@@ -1,5 +1,9 @@
+from . import base
 from . import auth_jwt_validator
 from . import auth_jwt_request
 from . import ir_http
 from . import auth_jwt_route
 from . import res_company
+from . import res_partner
+from . import res_users
+from . import auth_jwt_request_daily
@@ -1,8 +1,50 @@
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
 from datetime import datetime
 
-from odoo import api, fields, models
+from odoo import SUPERUSER_ID, api, fields, models, tools
+from odoo.modules.registry import Registry
 from odoo.tools.misc import _format_time_ago
 
+_logger = logging.getLogger(__name__)
+
+REQUEST_METHODS = [
+    ("GET", "GET"),
+    ("POST", "POST"),
+    ("PUT", "PUT"),
+    ("DELETE", "DELETE"),
+]
+
+# Request logs waiting to be written, per database, for the current process
+_REQUEST_LOG_QUEUES = defaultdict(list)
+_REQUEST_LOG_LOCK = threading.Lock()
+
+
+def flush_request_log(dbname):
+    """Write the buffered request logs of a database in a single batch with a
+    dedicated cursor. Called once the response is sent, so neither the
+    request nor its transaction waits for the logs."""
+    with _REQUEST_LOG_LOCK:
+        vals_list = [vals for _queued_at, vals in _REQUEST_LOG_QUEUES.pop(dbname, [])]
+    if not vals_list:
+        return
+    try:
+        with Registry(dbname).cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            env["auth.jwt.request"].create(vals_list)
+    except Exception:
+        _logger.exception("Failed to write %d JWT request logs", len(vals_list))
+
+
+@atexit.register
+def _flush_all_request_logs():
+    # a recycled worker writes what it still buffers before exiting
+    for dbname in list(_REQUEST_LOG_QUEUES):
+        flush_request_log(dbname)
+
 
 class AuthJwtRequest(models.Model):
     _name = "auth.jwt.request"
@@ -12,13 +54,13 @@ class AuthJwtRequest(models.Model):
     name = fields.Char(required=True)
     authorization = fields.Char(required=True)
     request_id = fields.Char(required=True)
-    method = fields.Selection(
-        [("GET", "GET"), ("POST", "POST"), ("PUT", "PUT"), ("DELETE", "DELETE")],
-        required=True,
-    )
+    method = fields.Selection(REQUEST_METHODS, required=True)
     url = fields.Char(required=True)
+    route = fields.Char()
     payload = fields.Text(required=True)
-    request_date = fields.Datetime(required=True)
+    request_date = fields.Datetime(required=True, index=True)
+    status_code = fields.Integer("Status")
+    duration = fields.Float("Duration (ms)", digits=(16, 1))
     ip_address = fields.Char(required=True)
     country_id = fields.Many2one("res.country")
     country_flag = fields.Char(related="country_id.image_url", readonly=True)
@@ -33,9 +75,63 @@ class AuthJwtRequest(models.Model):
     )
     request_body = fields.Text(readonly=False)
 
+    def init(self):
+        tools.create_index(
+            self.env.cr,
+            "auth_jwt_request_validator_id_request_date_index",
+            self._table,
+            ["validator_id", "request_date"],
+        )
+
     @api.depends("request_date")
     def _compute_time_statistics(self):
         for request in self:
             request.time_since_last_action = _format_time_ago(
                 self.env, (datetime.now() - request.request_date)
             )
+
+    @api.model
+    def _enqueue_request_log(self, vals):
+        """Buffer a request log of this process. Return whether the buffer is
+        due to be written, by flush_request_log once the response is sent:
+        when it holds auth_jwt.request_log_batch_size logs or its oldest log
+        is older than auth_jwt.request_log_max_delay seconds."""
+        params = self.env["ir.config_parameter"].sudo()
+        batch_size = int(params.get_param("auth_jwt.request_log_batch_size", 50))
+        max_delay = int(params.get_param("auth_jwt.request_log_max_delay", 60))
+        with _REQUEST_LOG_LOCK:
+            queue = _REQUEST_LOG_QUEUES[self.env.cr.dbname]
+            queue.append((time.monotonic(), vals))
+            return (
+                len(queue) >= batch_size
+                or time.monotonic() - queue[0][0] >= max_delay
+            )
+
+    @api.model
+    def _cron_archive_request_log(self):
+        """Apply the retention policy of every validator: requests older than
+        the retention limit are rolled up into auth.jwt.request.daily and
+        removed from the history."""
+        for validator in self.env["auth.jwt.validator"].search([]):
+            cutoff = validator._get_request_log_cutoff()
+            if cutoff:
+                self._archive_request_log(validator, cutoff)
+
+    @api.model
+    def _archive_request_log(self, validator, cutoff):
+        self.flush_model()
+        self.env["auth.jwt.request.daily"]._rollup_request_log(validator, cutoff)
+        self.env.cr.execute(
+            """
+            DELETE FROM auth_jwt_request
+            WHERE validator_id = %s AND request_date < %s
+            """,
+            [validator.id, cutoff],
+        )
+        _logger.info(
+            "Archived %d JWT requests of validator %s older than %s",
+            self.env.cr.rowcount,
+            validator.name,
+            cutoff,
+        )
+        self.invalidate_model()
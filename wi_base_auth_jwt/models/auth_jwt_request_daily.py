@@ -0,0 +1,98 @@
+from odoo import fields, models, tools
+
+from .auth_jwt_request import REQUEST_METHODS
+
+
+class AuthJwtRequestDaily(models.Model):
+    _name = "auth.jwt.request.daily"
+    _description = "Auth JWT Request Daily Statistics"
+    _order = "date desc"
+
+    date = fields.Date(required=True, readonly=True)
+    validator_id = fields.Many2one(
+        "auth.jwt.validator", required=True, readonly=True, ondelete="cascade"
+    )
+    partner_id = fields.Many2one("res.partner", readonly=True)
+    method = fields.Selection(REQUEST_METHODS, required=True, readonly=True)
+    route = fields.Char(readonly=True)
+    status_code = fields.Integer("Status", readonly=True)
+    request_count = fields.Integer("Requests", readonly=True)
+    duration_p50 = fields.Float(
+        "Median Duration (ms)", digits=(16, 1), readonly=True, aggregator="avg"
+    )
+    duration_p95 = fields.Float(
+        "P95 Duration (ms)", digits=(16, 1), readonly=True, aggregator="max"
+    )
+
+    def init(self):
+        tools.create_unique_index(
+            self.env.cr,
+            "auth_jwt_request_daily_unique_index",
+            self._table,
+            [
+                "date",
+                "validator_id",
+                "COALESCE(partner_id, 0)",
+                "method",
+                "COALESCE(route, '')",
+                "COALESCE(status_code, 0)",
+            ],
+        )
+
+    def _rollup_request_log(self, validator, cutoff):
+        """Aggregate the requests of a validator older than cutoff per day.
+
+        A day rolled up in several runs keeps the sum of the counts, the
+        average of the medians weighted by count and the highest p95.
+        Requests logged without a duration count as 0 ms when none of the
+        requests of their group has one.
+        """
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            INSERT INTO auth_jwt_request_daily (
+                date, validator_id, partner_id, method, route, status_code,
+                request_count, duration_p50, duration_p95,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT
+                request_date::date,
+                validator_id,
+                partner_id,
+                method,
+                COALESCE(route, ''),
+                COALESCE(status_code, 0),
+                COUNT(*),
+                COALESCE(PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY duration), 0),
+                COALESCE(PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY duration), 0),
+                %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+            FROM auth_jwt_request
+            WHERE validator_id = %(validator_id)s AND request_date < %(cutoff)s
+            GROUP BY 1, 2, 3, 4, 5, 6
+            ON CONFLICT (
+                date,
+                validator_id,
+                COALESCE(partner_id, 0),
+                method,
+                COALESCE(route, ''),
+                COALESCE(status_code, 0)
+            )
+            DO UPDATE SET
+                duration_p50 = (
+                    COALESCE(auth_jwt_request_daily.duration_p50, 0)
+                    * auth_jwt_request_daily.request_count
+                    + EXCLUDED.duration_p50 * EXCLUDED.request_count
+                ) / (auth_jwt_request_daily.request_count + EXCLUDED.request_count),
+                duration_p95 = GREATEST(
+                    COALESCE(auth_jwt_request_daily.duration_p95, 0),
+                    EXCLUDED.duration_p95
+                ),
+                request_count = (
+                    auth_jwt_request_daily.request_count + EXCLUDED.request_count
+                ),
+                write_uid = EXCLUDED.write_uid,
+                write_date = EXCLUDED.write_date
+            """,
+            {"uid": self.env.uid, "validator_id": validator.id, "cutoff": cutoff},
+        )
+        self.invalidate_model()
@@ -1,7 +1,12 @@
 import datetime
+import hashlib
 import logging
+import random
 import re
+import threading
+import time
 from calendar import timegm
+from collections import OrderedDict, defaultdict
 from functools import partial
 
 import jwt  # pylint: disable=missing-manifest-dependency
@@ -25,6 +30,12 @@ _logger = logging.getLogger(__name__)
 
 AUTHORIZATION_RE = re.compile(r"^Bearer ([^ ]+)$")
 
+# Verified tokens of the current process, least recently used first
+TOKEN_CACHE_SIZE = 4096
+_TOKEN_CACHE = OrderedDict()
+_TOKEN_CACHE_STATS = defaultdict(lambda: {"hits": 0, "misses": 0})
+_TOKEN_CACHE_LOCK = threading.Lock()
+
 
 class AuthJwtValidator(models.Model):
     _name = "auth.jwt.validator"
@@ -96,6 +107,60 @@ class AuthJwtValidator(models.Model):
         default=True, help="Set to false only for development without https."
     )
 
+    request_log_rate_get = fields.Float(
+        "GET Sampling (%)",
+        default=100.0,
+        help="Percentage of GET requests recorded in the request history.",
+    )
+    request_log_rate_post = fields.Float(
+        "POST Sampling (%)",
+        default=100.0,
+        help="Percentage of POST requests recorded in the request history.",
+    )
+    request_log_rate_put = fields.Float(
+        "PUT Sampling (%)",
+        default=100.0,
+        help="Percentage of PUT requests recorded in the request history.",
+    )
+    request_log_rate_delete = fields.Float(
+        "DELETE Sampling (%)",
+        default=100.0,
+        help="Percentage of DELETE requests recorded in the request history.",
+    )
+    token_cache_enabled = fields.Boolean(
+        "Cache Verified Tokens",
+        default=True,
+        help="Keep verified tokens and the partner, company and user resolved "
+        "from them in memory, until the token expires or the cache lifetime "
+        "is reached.",
+    )
+    token_cache_ttl = fields.Integer(
+        "Token Cache Lifetime (s)",
+        default=0,
+        help="Maximum lifetime of a cached token in seconds. "
+        "0 keeps it until the token expires.",
+    )
+    token_cache_hits = fields.Integer(
+        compute="_compute_token_cache_stats",
+        help="Requests served from the token cache by this server process.",
+    )
+    token_cache_misses = fields.Integer(
+        compute="_compute_token_cache_stats",
+        help="Requests that had to verify the token in this server process.",
+    )
+    request_log_max_age = fields.Integer(
+        "Keep History (Days)",
+        default=0,
+        help="Requests older than this number of days are rolled up into the "
+        "daily statistics and removed from the history. 0 keeps everything.",
+    )
+    request_log_max_rows = fields.Integer(
+        "Keep History (Requests)",
+        default=0,
+        help="Maximum number of requests kept in the history, older days are "
+        "rolled up into the daily statistics. 0 keeps everything.",
+    )
+
     _sql_constraints = [
         ("name_uniq", "unique(name)", "JWT validator names must be unique !"),
     ]
@@ -181,8 +246,92 @@ class AuthJwtValidator(models.Model):
         )
         return self._get_jwt_token(payload, secret)
 
+    def _compute_token_cache_stats(self):
+        for rec in self:
+            stats = _TOKEN_CACHE_STATS.get((self.env.cr.dbname, rec.id), {})
+            rec.token_cache_hits = stats.get("hits", 0)
+            rec.token_cache_misses = stats.get("misses", 0)
+
+    def init(self):
+        self.env.cr.execute(
+            "CREATE SEQUENCE IF NOT EXISTS auth_jwt_token_cache_generation"
+        )
+
+    @api.model
+    def _get_token_cache_generation(self):
+        """Generation of the token cache, shared by every server process
+        through a database sequence and read once per cursor, that is once
+        per request."""
+        cache = self.env.cr.cache
+        if "auth_jwt_token_cache_generation" not in cache:
+            # a new sequence reports the value its first nextval returns
+            self.env.cr.execute(
+                """
+                SELECT CASE WHEN is_called THEN last_value ELSE 0 END
+                FROM auth_jwt_token_cache_generation
+                """
+            )
+            cache["auth_jwt_token_cache_generation"] = self.env.cr.fetchone()[0]
+        return cache["auth_jwt_token_cache_generation"]
+
+    def _get_token_cache_key(self, token, secret=None):
+        return (
+            self.env.cr.dbname,
+            self.id,
+            bool(secret),
+            hashlib.sha256(token.encode()).hexdigest(),
+        )
+
+    def _get_token_cache_entry(self, token, secret=None):
+        """Return the cache entry of a token verified earlier, if still valid."""
+        if not self.token_cache_enabled:
+            return None
+        key = self._get_token_cache_key(token, secret)
+        generation = self._get_token_cache_generation()
+        with _TOKEN_CACHE_LOCK:
+            entry = _TOKEN_CACHE.get(key)
+            stats = _TOKEN_CACHE_STATS[key[:2]]
+            if (
+                entry
+                and entry["generation"] == generation
+                and entry["expire"] > time.time()
+            ):
+                _TOKEN_CACHE.move_to_end(key)
+                stats["hits"] += 1
+                return entry
+            _TOKEN_CACHE.pop(key, None)
+            stats["misses"] += 1
+        return None
+
+    def _set_token_cache_entry(self, token, secret, payload):
+        if not self.token_cache_enabled:
+            return
+        expire = payload["exp"]
+        if self.token_cache_ttl > 0:
+            expire = min(expire, time.time() + self.token_cache_ttl)
+        entry = {
+            "generation": self._get_token_cache_generation(),
+            "expire": expire,
+            "payload": payload,
+        }
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE[self._get_token_cache_key(token, secret)] = entry
+            while len(_TOKEN_CACHE) > TOKEN_CACHE_SIZE:
+                _TOKEN_CACHE.popitem(last=False)
+
     def _decode(self, token, secret=None):
-        """Validate and decode a JWT token, return the payload."""
+        """Validate and decode a JWT token, return the payload.
+
+        Verified tokens are cached until they expire, see token_cache_enabled.
+        """
+        entry = self._get_token_cache_entry(token, secret)
+        if entry:
+            return dict(entry["payload"])
+        payload = self._decode_token(token, secret=secret)
+        self._set_token_cache_entry(token, secret, payload)
+        return dict(payload)
+
+    def _decode_token(self, token, secret=None):
         if secret:
             key = secret
             algorithm = "HS256"
@@ -275,6 +424,40 @@ class AuthJwtValidator(models.Model):
             raise UnauthorizedPartnerNotFound()
         return partner_id, company_id
 
+    def _get_and_check_identity(self, token, payload, secret=None):
+        """Return the partner, company and user ids of a decoded token, from
+        the token cache when they were already resolved for this token."""
+        key = self._get_token_cache_key(token, secret)
+        entry = None
+        if self.token_cache_enabled:
+            generation = self._get_token_cache_generation()
+            with _TOKEN_CACHE_LOCK:
+                entry = _TOKEN_CACHE.get(key)
+                if entry and entry["generation"] != generation:
+                    entry = None
+                elif entry and "uid" in entry:
+                    return entry["partner_id"], entry["company_id"], entry["uid"]
+        partner_id, company_id = self._get_and_check_partner_id(payload)
+        uid = self._get_and_check_uid(partner_id)
+        if entry:
+            with _TOKEN_CACHE_LOCK:
+                entry.update(partner_id=partner_id, company_id=company_id, uid=uid)
+        return partner_id, company_id, uid
+
+    @api.model
+    def _invalidate_token_cache(self):
+        """Renew the generation of the token cache once the transaction is
+        committed, so no process caches identities resolved before it."""
+        self.env.cr.cache.pop("auth_jwt_token_cache_generation", None)
+        if "auth_jwt_token_cache_generation" in self.env.cr.postcommit.data:
+            return
+        self.env.cr.postcommit.data["auth_jwt_token_cache_generation"] = True
+
+        @self.env.cr.postcommit.add
+        def renew_generation():
+            with self.env.registry.cursor() as cr:
+                cr.execute("SELECT nextval('auth_jwt_token_cache_generation')")
+
     def _register_hook(self):
         res = super()._register_hook()
         self.search([])._register_auth_method()
@@ -316,10 +499,12 @@ class AuthJwtValidator(models.Model):
             self._unregister_auth_method()
         res = super().write(vals)
         self._register_auth_method()
+        self._invalidate_token_cache()
         return res
 
     def unlink(self):
         self._unregister_auth_method()
+        self._invalidate_token_cache()
         return super().unlink()
 
     def _get_jwt_cookie_secret(self):
@@ -349,19 +534,67 @@ class AuthJwtValidator(models.Model):
     def _create_record_request_log(
         self, request, payload, uid, client_ip, request_id, partner_id, body
     ):
+        if not self._is_request_logged(request.httprequest.method):
+            return
         data = self.prepare_request_history(
             request, payload, uid, client_ip, request_id, partner_id, body
         )
-        request.env["auth.jwt.request"].sudo().create(data)
+        # Queued by ir.http once the response status and duration are known
+        request.jwt_request_log = data
+        request.jwt_request_start = time.monotonic()
+
+    def _is_request_logged(self, method):
+        rate_field = f"request_log_rate_{method.lower()}"
+        if rate_field not in self._fields:
+            return False
+        rate = self[rate_field]
+        return rate >= 100 or random.random() * 100 < rate
+
+    @api.model
+    @tools.ormcache("country_code")
+    def _get_country_id(self, country_code):
+        if not country_code:
+            return False
+        country = (
+            self.env["res.country"]
+            .sudo()
+            .search([("code", "=", country_code)], limit=1)
+        )
+        return country.id
+
+    def _get_request_log_cutoff(self):
+        """Return the start of the oldest day kept in the request history, or
+        False when the retention policy keeps everything."""
+        self.ensure_one()
+        cutoffs = []
+        if self.request_log_max_age > 0:
+            cutoffs.append(
+                datetime.datetime.now()
+                - datetime.timedelta(days=self.request_log_max_age)
+            )
+        if self.request_log_max_rows > 0:
+            self.env["auth.jwt.request"].flush_model(["validator_id", "request_date"])
+            self.env.cr.execute(
+                """
+                SELECT request_date FROM auth_jwt_request
+                WHERE validator_id = %s
+                ORDER BY request_date DESC
+                OFFSET %s LIMIT 1
+                """,
+                [self.id, self.request_log_max_rows],
+            )
+            row = self.env.cr.fetchone()
+            if row:
+                cutoffs.append(row[0])
+        if not cutoffs:
+            return False
+        # Whole days only, so each day is rolled up at once
+        return datetime.datetime.combine(max(cutoffs).date(), datetime.time.min)
 
     def prepare_request_history(
         self, request, payload, uid, client_ip, request_id, partner_id, body
     ):
-        country_id = (
-            request.env["res.country"]
-            .sudo()
-            .search([("code", "=", request.geoip.get("country_code"))])
-        )
+        country_id = self._get_country_id(request.geoip.get("country_code"))
         return {
             "name": _("API Request #%s", request_id),
             "partner_id": partner_id,
@@ -369,11 +602,12 @@ class AuthJwtValidator(models.Model):
             "request_id": request_id,
             "method": request.httprequest.method,
             "url": request.httprequest.url,
+            "route": request.httprequest.path,
             "payload": payload,
             "request_date": datetime.datetime.now(),
             "ip_address": client_ip,
             "validator_id": self.id,
-            "country_id": country_id.id if country_id else False,
+            "country_id": country_id,
             "request_body": body,
         }
 
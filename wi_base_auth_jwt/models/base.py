@@ -0,0 +1,19 @@
+from odoo import models
+
+
+class Base(models.AbstractModel):
+    _inherit = "base"
+
+    def _api_paginate(self):
+        """Restrict the records to the page requested on a JWT GET endpoint.
+
+        The page is passed by ``BaseController.get_api_data`` in the
+        ``jwt_api_page`` context key, the total is reported back in it so
+        only the records of the page are serialized.
+        """
+        page = self.env.context.get("jwt_api_page")
+        if not page:
+            return self
+        page["total"] = len(self)
+        ids = sorted(self._ids)[page["offset"] : page["offset"] + page["limit"]]
+        return self.browse(ids)
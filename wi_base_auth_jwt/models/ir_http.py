@@ -1,5 +1,7 @@
+import functools
 import json
 import logging
+import time
 import uuid
 
 from odoo import SUPERUSER_ID, api, models
@@ -13,6 +15,7 @@ from ..exceptions import (
     UnauthorizedMissingCookie,
     UnauthorizedSessionMismatch,
 )
+from .auth_jwt_request import flush_request_log
 
 _logger = logging.getLogger(__name__)
 
@@ -54,16 +57,23 @@ class IrHttpJwt(models.AbstractModel):
     def _get_jwt_payload(cls, validator):
         """Obtain and validate the JWT payload from the request authorization header or
         cookie."""
+        return cls._get_jwt_token_payload(validator)[2]
+
+    @classmethod
+    def _get_jwt_token_payload(cls, validator):
+        """Same as _get_jwt_payload, but also return the token and the secret
+        it was decoded with."""
         try:
             token = cls._get_bearer_token()
             assert token
-            return validator._decode(token)
+            return token, None, validator._decode(token)
         except UnauthorizedMissingAuthorizationHeader:
             if not validator.cookie_enabled:
                 raise
             token = cls._get_cookie_token(validator.cookie_name)
             assert token
-            return validator._decode(token, secret=validator._get_jwt_cookie_secret())
+            secret = validator._get_jwt_cookie_secret()
+            return token, secret, validator._decode(token, secret=secret)
 
     @classmethod
     def _get_request_json(cls, data):
@@ -85,11 +95,11 @@ class IrHttpJwt(models.AbstractModel):
         validator = env["auth.jwt.validator"]._get_validator_by_name(validator_name)
         assert len(validator) == 1
 
-        payload = None
+        token = secret = payload = None
         exceptions = {}
         while validator:
             try:
-                payload = cls._get_jwt_payload(validator)
+                token, secret, payload = cls._get_jwt_token_payload(validator)
                 break
             except Unauthorized as e:
                 exceptions[validator.name] = e
@@ -117,8 +127,9 @@ class IrHttpJwt(models.AbstractModel):
                 httponly=True,
             )
 
-        partner_id, company_id = validator._get_and_check_partner_id(payload)
-        uid = validator._get_and_check_uid(partner_id)
+        partner_id, company_id, uid = validator._get_and_check_identity(
+            token, payload, secret=secret
+        )
         assert uid
         validator._create_record_request_log(
             request, payload, uid, client_ip, request_id, partner_id, body
@@ -130,6 +141,37 @@ class IrHttpJwt(models.AbstractModel):
         request.jwt_company_id = company_id
         request.jwt_body = body
 
+    @classmethod
+    def _post_dispatch(cls, response):
+        super()._post_dispatch(response)
+        cls._enqueue_jwt_request_log(response)
+
+    @classmethod
+    def _handle_error(cls, exception):
+        response = super()._handle_error(exception)
+        cls._enqueue_jwt_request_log(response)
+        return response
+
+    @classmethod
+    def _enqueue_jwt_request_log(cls, response):
+        data = getattr(request, "jwt_request_log", None)
+        if not data:
+            return
+        request.jwt_request_log = None
+        data.update(
+            {
+                "status_code": getattr(response, "status_code", 500),
+                "duration": (time.monotonic() - request.jwt_request_start) * 1000,
+            }
+        )
+        if request.env["auth.jwt.request"].sudo()._enqueue_request_log(data):
+            # written in one batch once the response is sent, otherwise by a
+            # later request or when the process exits
+            if hasattr(response, "call_on_close"):
+                response.call_on_close(
+                    functools.partial(flush_request_log, request.env.cr.dbname)
+                )
+
     @classmethod
     def _auth_method_public_or_jwt(cls, validator_name=None):
         if "HTTP_AUTHORIZATION" not in request.httprequest.environ:
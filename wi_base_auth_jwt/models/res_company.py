@@ -4,6 +4,12 @@ from odoo import models
 class ResCompany(models.Model):
     _inherit = "res.company"
 
+    def write(self, vals):
+        res = super().write(vals)
+        if "company_registry" in vals:
+            self.env["auth.jwt.validator"]._invalidate_token_cache()
+        return res
+
     def _get_company_details(self):
         return {
             "id": self.id,
@@ -16,7 +22,7 @@ class ResCompany(models.Model):
 
     def get_company_data(self, company=None):
         res = []
-        data = self.sudo().search([], order="id asc")
+        data = self.sudo().search([], order="id asc")._api_paginate()
         if data:
             for company_data in data:
                 res.append(company_data._get_company_details())
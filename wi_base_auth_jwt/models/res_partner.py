@@ -0,0 +1,23 @@
+from odoo import api, models
+
+
+class ResPartner(models.Model):
+    _inherit = "res.partner"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        if any(vals.get("email") for vals in vals_list):
+            self.env["auth.jwt.validator"]._invalidate_token_cache()
+        return res
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"email", "active"} & set(vals):
+            self.env["auth.jwt.validator"]._invalidate_token_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env["auth.jwt.validator"]._invalidate_token_cache()
+        return res
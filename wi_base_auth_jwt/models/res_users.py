@@ -0,0 +1,22 @@
+from odoo import api, models
+
+
+class ResUsers(models.Model):
+    _inherit = "res.users"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        self.env["auth.jwt.validator"]._invalidate_token_cache()
+        return res
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"active", "partner_id", "login"} & set(vals):
+            self.env["auth.jwt.validator"]._invalidate_token_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env["auth.jwt.validator"]._invalidate_token_cache()
+        return res
@@ -24,6 +24,7 @@
         "security/farm_security.xml",
         "data/farm_sequence.xml",
         "data/activity_analytic_account.xml",
+        "data/estate_premi_cron.xml",
         "report/harvest_activity_report_template.xml",
         "report/harvest_activity_report.xml",
         "report/seed_mutation_report_view.xml",
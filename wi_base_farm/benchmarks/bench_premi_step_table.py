@@ -0,0 +1,78 @@
+"""Benchmark of the premi step table used by the harvest premi computation.
+
+Run it from an Odoo shell on a database with this module installed::
+
+    odoo-bin shell -d <database> < bench_premi_step_table.py
+
+The step premi of synthetic harvested weights is computed once by walking
+the quantifiers, the way ``_calculate_premi_by_step_calculation`` used to
+work, and once with the compiled step table. Both results are compared.
+The quantifiers are in-memory records, nothing is written to the database.
+"""
+
+import random
+import time
+
+HARVEST_COUNT = 100000
+STEPS = ((0, 20.0, 5000.0), (500, 35.0, 0.0), (1000, 50.0, 0.0), (1500, 65.0, 0.0))
+
+
+def _prepare_quantifiers(env, steps=STEPS):
+    # a base weight of 1 makes each quantifier its own base quantifier
+    condition = env["estate.premi.condition"].new({"harvest_base_qty": 1.0})
+    quantifier = env["estate.premi.quantifier"]
+    for base, premi_extra, attendance_premi in steps:
+        quantifier |= quantifier.new(
+            {
+                "condition_id": condition.id,
+                "quantifier": base,
+                "premi_extra": premi_extra,
+                "attendance_premi": attendance_premi,
+            }
+        )
+    return quantifier
+
+
+def _walk_steps(quantifiers, harvested_qty):
+    premi_rules = quantifiers.filtered(
+        lambda x, qty=harvested_qty: x.base_quantifier <= qty
+    ).sorted("base_quantifier", reverse=True)
+    premi_base_extra = 0
+    for premi in premi_rules:
+        net_weight = max(harvested_qty - premi.base_quantifier, 0)
+        premi_base_extra += premi.premi_extra * net_weight
+        harvested_qty -= net_weight
+    return (
+        premi_base_extra,
+        premi_rules[0].attendance_premi if premi_rules else 0,
+    )
+
+
+def run(env, count=HARVEST_COUNT):
+    quantifiers = _prepare_quantifiers(env)
+    quantities = [random.uniform(1, 2500) for _index in range(count)]
+
+    start = time.perf_counter()
+    walked = [_walk_steps(quantifiers, qty) for qty in quantities]
+    walk_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    step_table = quantifiers._compile_step_table()
+    get_step_premi = env["estate.premi.quantifier"]._get_step_premi
+    searched = [get_step_premi(step_table, qty) for qty in quantities]
+    table_time = time.perf_counter() - start
+
+    mismatch = sum(
+        1
+        for (walk_premi, walk_attendance), (premi, attendance) in zip(walked, searched)
+        if abs(walk_premi - premi) > 1e-6 or walk_attendance != attendance
+    )
+    print(f"{'harvests':>9} {'walk s':>9} {'table s':>9} {'speedup':>8} {'diff':>5}")
+    print(
+        f"{count:>9} {walk_time:>9.3f} {table_time:>9.3f} "
+        f"{walk_time / table_time:>7.1f}x {mismatch:>5}"
+    )
+
+
+if "env" in globals():
+    run(env)  # noqa: F821
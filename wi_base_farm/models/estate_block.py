@@ -1,9 +1,12 @@
+import logging
 from datetime import date
 
 from dateutil import relativedelta
 
 from odoo import _, api, fields, models
 
+_logger = logging.getLogger(__name__)
+
 
 class EstateBlock(models.Model):
     _name = "estate.block"
@@ -97,6 +100,11 @@ class EstateBlock(models.Model):
     block_value = fields.Monetary(
         help="All Plant Value in this block", default=0, copy=False, tracking=True
     )
+    block_value_ids = fields.One2many(
+        comodel_name="estate.block.value",
+        inverse_name="block_id",
+        string="Monthly Value",
+    )
 
     bjr_ids = fields.One2many(
         comodel_name="estate.bjr",
@@ -186,21 +194,61 @@ class EstateBlock(models.Model):
             res.append((record.id, name))
         return res
 
-    def _compute_block_values(self):
-        for record in self:
-            record.block_value = 0
-            labour = self.env["estate.upkeep.labour"].search(
-                [("location_id", "=", record.id)]
-            )
-            material = self.env["estate.upkeep.material"].search(
-                [("location_id", "=", record.id)]
-            )
-            for operation in labour:
-                if operation:
-                    record.block_value += operation.total_amount
-            for operation in material:
-                if operation:
-                    record.block_value += operation.price_total
+    def write(self, vals):
+        res = super().write(vals)
+        if "estate_id" in vals or "company_id" in vals:
+            self.env["estate.harvest.daily"].sudo()._refresh(self.ids)
+        return res
+
+    @api.model
+    def _rebuild_block_value(self, block_ids=None):
+        """Rebuild the monthly values of the given blocks, all blocks if none
+        are given, from the posted upkeep lines in SQL, and reset the block
+        value to their sum where it drifted. Return the drifted blocks as
+        {block id: (stored value, rebuilt value)}."""
+        self.env["estate.block.value"].sudo()._rebuild(block_ids)
+        self.flush_model(["block_value"])
+        self.env.cr.execute(
+            """
+            SELECT eb.id, eb.block_value, COALESCE(SUM(ebv.amount), 0)
+            FROM
+                estate_block eb
+                LEFT JOIN estate_block_value ebv ON ebv.block_id = eb.id
+            WHERE
+                %(block_ids)s IS NULL OR eb.id = ANY(%(block_ids)s)
+            GROUP BY
+                eb.id
+            HAVING
+                ROUND(COALESCE(eb.block_value, 0), 2)
+                    <> ROUND(COALESCE(SUM(ebv.amount), 0)::numeric, 2)
+            """,
+            {"block_ids": list(block_ids) if block_ids is not None else None},
+        )
+        drift = {
+            block_id: (float(stored or 0), rebuilt)
+            for block_id, stored, rebuilt in self.env.cr.fetchall()
+        }
+        for block in self.browse(drift):
+            block.block_value = drift[block.id][1]
+        if drift:
+            _logger.warning("Block value rebuilt for drifted blocks %s", drift)
+        return drift
+
+    def action_rebuild_block_value(self):
+        drift = self._rebuild_block_value(self.ids)
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Block Value Verified"),
+                "message": _(
+                    "%(count)s block value(s) corrected out of %(total)s.",
+                    count=len(drift),
+                    total=len(self),
+                ),
+                "type": "warning" if drift else "success",
+            },
+        }
 
     @api.depends(
         "name",
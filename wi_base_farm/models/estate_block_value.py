@@ -0,0 +1,141 @@
+from odoo import api, fields, models, tools
+
+
+class EstateBlockValue(models.Model):
+    """
+    Upkeep cost per block and month, maintained by delta when upkeep
+    operations are posted or cancelled
+    """
+
+    _name = "estate.block.value"
+    _description = "Estate Block Value"
+    _order = "month desc, block_id"
+
+    month = fields.Date(
+        required=True, readonly=True, index=True, help="First day of the month"
+    )
+    block_id = fields.Many2one(
+        "estate.block", required=True, readonly=True, ondelete="cascade"
+    )
+    labour_amount = fields.Float(readonly=True)
+    material_amount = fields.Float(readonly=True)
+    amount = fields.Float(readonly=True)
+
+    def init(self):
+        tools.create_unique_index(
+            self.env.cr,
+            "estate_block_value_unique_index",
+            self._table,
+            ["block_id", "month"],
+        )
+        self.env.cr.execute("SELECT 1 FROM estate_block_value LIMIT 1")
+        if not self.env.cr.rowcount:
+            self._rebuild()
+
+    @api.model
+    def _add_amounts(self, amounts):
+        """Add the labour and material deltas given per (block id, month)
+        with a single upsert"""
+        if not amounts:
+            return
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            INSERT INTO estate_block_value (
+                block_id, month, labour_amount, material_amount, amount,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT
+                delta.block_id,
+                delta.month,
+                delta.labour_amount,
+                delta.material_amount,
+                delta.labour_amount + delta.material_amount,
+                %(uid)s, NOW() AT TIME ZONE 'UTC',
+                %(uid)s, NOW() AT TIME ZONE 'UTC'
+            FROM
+                UNNEST(
+                    %(block_ids)s::int[],
+                    %(months)s::date[],
+                    %(labour_amounts)s::float8[],
+                    %(material_amounts)s::float8[]
+                ) AS delta(block_id, month, labour_amount, material_amount)
+            ON CONFLICT (block_id, month) DO UPDATE SET
+                labour_amount = estate_block_value.labour_amount
+                    + EXCLUDED.labour_amount,
+                material_amount = estate_block_value.material_amount
+                    + EXCLUDED.material_amount,
+                amount = estate_block_value.amount + EXCLUDED.amount,
+                write_uid = EXCLUDED.write_uid,
+                write_date = EXCLUDED.write_date
+            """,
+            {
+                "uid": self.env.uid,
+                "block_ids": [block_id for block_id, _month in amounts],
+                "months": [month for _block_id, month in amounts],
+                "labour_amounts": [labour for labour, _material in amounts.values()],
+                "material_amounts": [
+                    material for _labour, material in amounts.values()
+                ],
+            },
+        )
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild(self, block_ids=None):
+        """Recompute the rows of the given blocks, all rows if none are
+        given, from the upkeep lines of the posted and done operations"""
+        self.env["estate.upkeep.labour"].flush_model()
+        self.env["estate.upkeep.material"].flush_model()
+        self.env["estate.operation"].flush_model(["state", "operation_date"])
+        where = "TRUE"
+        params = {"uid": self.env.uid}
+        if block_ids is not None:
+            where = "{alias}block_id = ANY(%(block_ids)s)"
+            params["block_ids"] = list(block_ids)
+        self.env.cr.execute(
+            f"DELETE FROM estate_block_value WHERE {where.format(alias='')}", params
+        )
+        self.env.cr.execute(
+            f"""
+            WITH upkeep AS (
+                SELECT
+                    eul.location_id AS block_id,
+                    eul.estate_operation_id,
+                    eul.total_amount AS labour_amount,
+                    0 AS material_amount
+                FROM estate_upkeep_labour eul
+                UNION ALL
+                SELECT
+                    eum.location_id,
+                    eum.estate_operation_id,
+                    0,
+                    eum.price_total
+                FROM estate_upkeep_material eum
+            )
+            INSERT INTO estate_block_value (
+                block_id, month, labour_amount, material_amount, amount,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT
+                u.block_id,
+                DATE_TRUNC('month', eo.operation_date)::date,
+                COALESCE(SUM(u.labour_amount), 0),
+                COALESCE(SUM(u.material_amount), 0),
+                COALESCE(SUM(u.labour_amount + u.material_amount), 0),
+                %(uid)s, NOW() AT TIME ZONE 'UTC',
+                %(uid)s, NOW() AT TIME ZONE 'UTC'
+            FROM
+                upkeep u
+                JOIN estate_operation eo ON u.estate_operation_id = eo.id
+            WHERE
+                eo.state IN ('posted', 'done')
+                AND u.block_id IS NOT NULL
+                AND {where.format(alias="u.")}
+            GROUP BY
+                u.block_id,
+                DATE_TRUNC('month', eo.operation_date)
+            """,
+            params,
+        )
+        self.invalidate_model()
@@ -184,14 +184,12 @@ class EstateEstate(models.Model):
     total_area = fields.Float(
         help="Total Area for this Estate",
         compute="_compute_estate_summary",
-        recursive=True,
         store=True,
     )
 
     total_harvest_uom_qty = fields.Float(
         string="Harvest UoM Quantity",
         compute="_compute_estate_summary",
-        recursive=True,
         help="Overall Harvest Quantity, based on the last month",
         digits="Product Unit of Measure",
         store=True,
@@ -200,7 +198,6 @@ class EstateEstate(models.Model):
     total_harvest_qty = fields.Float(
         string="Harvest Quantity",
         compute="_compute_estate_summary",
-        recursive=True,
         help="Overall Harvest Quantity, based on the last month",
         digits="Product Unit of Measure",
         store=True,
@@ -208,7 +205,6 @@ class EstateEstate(models.Model):
 
     average_weight = fields.Float(
         compute="_compute_estate_summary",
-        recursive=True,
         store=True,
         help="Overall Average Weight, based on the last month",
         digits="Product Unit of Measure",
@@ -218,7 +214,6 @@ class EstateEstate(models.Model):
         string="Total Tree Quantity",
         help="Total Tree Quantity for this Estate",
         compute="_compute_estate_summary",
-        recursive=True,
         store=True,
     )
 
@@ -257,39 +252,83 @@ class EstateEstate(models.Model):
     @api.depends(
         "block_ids",
         "block_ids.total_area",
-        "block_ids.total_harvest_uom_qty",
-        "block_ids.total_harvest_qty",
+        "block_ids.total_tree",
         "child_ids",
-        "child_ids.total_area",
-        "child_ids.total_harvest_uom_qty",
-        "child_ids.total_harvest_qty",
+        "child_ids.block_ids",
+        "child_ids.block_ids.total_area",
+        "child_ids.block_ids.total_tree",
     )
     def _compute_estate_summary(self):
+        summary = self._get_estate_summary()
         for record in self:
-            data = (
-                record.child_ids
-                if record.location_type == "estate"
-                else record.block_ids
+            area, tree, harvest_qty, harvest_uom_qty = summary.get(
+                record._origin.id, (0, 0, 0.0, 0.0)
             )
-            harvest_data = self.env["estate.harvest"].search(
-                [("block_id", "in", data.ids)]
-                if record.location_type == "afdeling"
-                else [("afdeling_id", "in", data.ids)]
+            if not record.id:
+                # new or onchange record, its blocks are only in memory
+                blocks = (
+                    record.child_ids.block_ids
+                    if record.location_type == "estate"
+                    else record.block_ids
+                )
+                area = sum(blocks.mapped("total_area"))
+                tree = sum(blocks.mapped("total_tree"))
+            record.total_area = area
+            record.total_tree_qty = tree
+            record.total_harvest_qty = harvest_qty
+            record.total_harvest_uom_qty = harvest_uom_qty
+            record.average_weight = (
+                harvest_uom_qty / harvest_qty if harvest_qty and harvest_uom_qty else 0
+            )
+
+    def _get_estate_summary(self, date_from=None, date_to=None):
+        """Return (area, trees, harvest quantity, harvest weight) per estate
+        and afdeling of self, from one grouped query on the blocks and one on
+        the harvest daily table. The harvest can be limited to the dates
+        between date_from and date_to."""
+        records = self._origin
+        estates = records.filtered(lambda r: r.location_type == "estate")
+        afdelings = (records - estates) | estates.child_ids
+        block_data = {
+            afdeling.id: (area, tree)
+            for afdeling, area, tree in self.env["estate.block"]._read_group(
+                [("estate_id", "in", afdelings.ids)],
+                ["estate_id"],
+                ["total_area:sum", "total_tree:sum"],
             )
-            record.total_area = sum(data.mapped("total_area"))
-            record.total_harvest_qty = sum(harvest_data.mapped("harvest_qty_unit"))
-            record.total_harvest_uom_qty = sum(
-                harvest_data.mapped("harvest_qty_weight")
+        }
+        harvest_domain = [("afdeling_id", "in", afdelings.ids)]
+        if date_from:
+            harvest_domain.append(("operation_date", ">=", date_from))
+        if date_to:
+            harvest_domain.append(("operation_date", "<=", date_to))
+        harvest_daily = self.env["estate.harvest.daily"].sudo()
+        harvest_data = {
+            afdeling.id: (harvest_qty, harvest_uom_qty)
+            for afdeling, harvest_qty, harvest_uom_qty in harvest_daily._read_group(
+                harvest_domain,
+                ["afdeling_id"],
+                ["harvest_qty_unit:sum", "harvest_qty_weight:sum"],
             )
-            if record.total_harvest_uom_qty and record.total_harvest_qty:
-                record.average_weight = (
-                    record.total_harvest_uom_qty / record.total_harvest_qty
+        }
+        summary = {
+            afdeling.id: block_data.get(afdeling.id, (0, 0))
+            + harvest_data.get(afdeling.id, (0.0, 0.0))
+            for afdeling in afdelings
+        }
+        for estate in estates:
+            summary[estate.id] = tuple(
+                sum(values)
+                for values in zip(
+                    (0, 0, 0.0, 0.0),
+                    *(summary[afdeling.id] for afdeling in estate.child_ids),
                 )
-            record.total_tree_qty = (
-                sum(data.mapped("total_tree"))
-                if record.location_type != "estate"
-                else sum(record.child_ids.mapped("block_ids").mapped("total_tree"))
             )
+        return summary
+
+    def _recompute_estate_summary(self):
+        for fname in ("total_harvest_qty", "total_harvest_uom_qty", "average_weight"):
+            self.env.add_to_compute(self._fields[fname], self)
 
     @api.constrains("parent_id")
     def _check_estate_recursion(self):
@@ -0,0 +1,120 @@
+from odoo import api, fields, models, tools
+
+
+class EstateHarvestDaily(models.Model):
+    """
+    Harvest totals per block, day and harvest products, maintained from the
+    posted harvest lines so reports do not aggregate estate_harvest again
+    """
+
+    _name = "estate.harvest.daily"
+    _description = "Estate Harvest Daily"
+    _order = "operation_date desc, block_id"
+
+    operation_date = fields.Date(required=True, readonly=True, index=True)
+    block_id = fields.Many2one(
+        "estate.block", required=True, readonly=True, ondelete="cascade"
+    )
+    afdeling_id = fields.Many2one("estate.estate", readonly=True, index=True)
+    estate_id = fields.Many2one("estate.estate", readonly=True, index=True)
+    company_id = fields.Many2one("res.company", readonly=True)
+    harvest_main_product_id = fields.Many2one("product.product", readonly=True)
+    harvest_other_product_id = fields.Many2one("product.product", readonly=True)
+    harvest_qty_unit = fields.Float(readonly=True)
+    harvest_qty_weight = fields.Float(readonly=True)
+    other_harvest_qty = fields.Float(readonly=True)
+    other_harvest_stock_qty = fields.Float(readonly=True)
+    total_premi = fields.Float(readonly=True)
+    daily_wages = fields.Float(readonly=True)
+    penalty_total = fields.Float(readonly=True)
+    total_include_penalty = fields.Float(readonly=True)
+
+    def init(self):
+        tools.create_unique_index(
+            self.env.cr,
+            "estate_harvest_daily_unique_index",
+            self._table,
+            [
+                "block_id",
+                "operation_date",
+                "COALESCE(harvest_main_product_id, 0)",
+                "COALESCE(harvest_other_product_id, 0)",
+            ],
+        )
+        self.env.cr.execute("SELECT 1 FROM estate_harvest_daily LIMIT 1")
+        if not self.env.cr.rowcount:
+            self._refresh()
+
+    def _get_daily_aggregates(self):
+        """Return the aggregated columns, as column name: SQL expression on
+        estate_harvest (aliased eh)"""
+        return {
+            "harvest_qty_unit": "SUM(eh.harvest_qty_unit)",
+            "harvest_qty_weight": "SUM(eh.harvest_qty_weight)",
+            "other_harvest_qty": "SUM(eh.other_harvest_qty)",
+            "other_harvest_stock_qty": "SUM(eh.other_harvest_stock_qty)",
+            "total_premi": "SUM(eh.total_premi)",
+            "daily_wages": "SUM(eh.daily_wages)",
+            "penalty_total": "SUM(eh.penalty_total)",
+            "total_include_penalty": "SUM(eh.total_include_penalty)",
+        }
+
+    @api.model
+    def _refresh(self, block_ids=None, dates=None):
+        """Rebuild the rows of the given blocks and dates, all rows if none
+        are given, from the posted and done harvest lines."""
+        self.env["estate.harvest"].flush_model()
+        self.env["estate.block"].flush_model(["estate_id", "company_id"])
+        self.env["estate.estate"].flush_model(["parent_id"])
+        conditions = ["TRUE"]
+        params = {"uid": self.env.uid}
+        if block_ids is not None:
+            conditions.append("{alias}block_id = ANY(%(block_ids)s)")
+            params["block_ids"] = list(block_ids)
+        if dates is not None:
+            conditions.append("{alias}operation_date = ANY(%(dates)s)")
+            params["dates"] = list(dates)
+        where = " AND ".join(conditions)
+        aggregates = self._get_daily_aggregates()
+        self.env.cr.execute(
+            f"DELETE FROM estate_harvest_daily WHERE {where.format(alias='')}", params
+        )
+        self.env.cr.execute(
+            f"""
+            INSERT INTO estate_harvest_daily (
+                operation_date, block_id, afdeling_id, estate_id, company_id,
+                harvest_main_product_id, harvest_other_product_id,
+                {", ".join(aggregates)},
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT
+                eh.operation_date,
+                eh.block_id,
+                eb.estate_id,
+                ee.parent_id,
+                eb.company_id,
+                eh.harvest_main_product_id,
+                eh.harvest_other_product_id,
+                {", ".join(aggregates.values())},
+                %(uid)s, NOW() AT TIME ZONE 'UTC',
+                %(uid)s, NOW() AT TIME ZONE 'UTC'
+            FROM
+                estate_harvest eh
+                JOIN estate_block eb ON eh.block_id = eb.id
+                LEFT JOIN estate_estate ee ON eb.estate_id = ee.id
+            WHERE
+                eh.state IN ('posted', 'done')
+                AND eh.operation_date IS NOT NULL
+                AND {where.format(alias="eh.")}
+            GROUP BY
+                eh.operation_date,
+                eh.block_id,
+                eb.estate_id,
+                ee.parent_id,
+                eb.company_id,
+                eh.harvest_main_product_id,
+                eh.harvest_other_product_id
+            """,
+            params,
+        )
+        self.invalidate_model()
@@ -1,4 +1,5 @@
 from ast import literal_eval
+from collections import defaultdict
 from datetime import date
 
 from odoo import _, api, fields, models
@@ -520,70 +521,96 @@ class FarmOperationActivity(models.Model):
             )
 
     def action_post(self):
-        for record in self:
-            if record.required_validation and record.state == "draft":
-                raise UserError(_("Operation must be validated first!"))
-            record._action_posted()
+        if any(r.required_validation and r.state == "draft" for r in self):
+            raise UserError(_("Operation must be validated first!"))
+        self._action_posted()
 
     def _action_posted(self):
+        """Post the operations together: the stock moves, analytic lines and
+        seed values of all of them are created or updated in batch."""
         self.write(
             {
                 "state": "posted",
                 "posted_date": date.today(),
             }
         )
-        if self.operation_type_id.type_operation == "harvest":
-            self._generate_stock_move() if self.harvest_product_id else False
-            self._estate_harvest_post()
-        else:
-            (
-                self._compute_entire_block(self.labour_line_ids)
-                if self.labour_line_ids
-                else False
-            )
-            (
-                self._compute_entire_block(self.material_line_ids)
-                if self.material_line_ids
-                else False
-            )
-            self._upkeep_labour_post()
-        context = self._context.copy()
-        context.pop("default_name", None)
-
-    def _compute_entire_block(self, lines):
-        for line in lines:
-            vals = {
-                "block_id": line.location_id,
-                "amount": (
-                    line.total_amount
-                    if lines == self.labour_line_ids
-                    else line.price_total
-                ),
-            }
-            self._compute_seed_value(vals)
-
-    def _compute_seed_value(self, vals):
-        batch_ids = self.env["estate.seed.batch"].search(
-            [("block_id", "=", vals["block_id"].id), ("state", "=", "active")]
+        harvests = self.filtered(
+            lambda o: o.operation_type_id.type_operation == "harvest"
         )
-        if len(batch_ids) > 0:
-            divided_amount = vals["amount"] / len(batch_ids)
-            for batch in batch_ids:
-                batch.batch_value += divided_amount
-        vals["block_id"]._compute_block_values()
+        upkeeps = self - harvests
+        if harvests:
+            harvests.filtered("harvest_product_id")._generate_stock_move()
+            harvests._estate_harvest_post()
+            harvests.estate_harvest_ids._refresh_harvest_daily()
+        if upkeeps:
+            upkeeps._compute_entire_block()
+            upkeeps._upkeep_labour_post()
+
+    def _compute_entire_block(self, sign=1):
+        """Add the labour and material cost of the operations, or remove it
+        with a negative sign, to the value of their blocks, their monthly
+        values and their seed batches. The cost is summed per block first."""
+        amount_by_block = defaultdict(float)
+        amount_by_month = defaultdict(lambda: [0.0, 0.0])
+        for operation in self:
+            month = operation.operation_date.replace(day=1)
+            for line in operation.labour_line_ids.filtered("location_id"):
+                amount = sign * line.total_amount
+                amount_by_block[line.location_id] += amount
+                amount_by_month[line.location_id.id, month][0] += amount
+            for line in operation.material_line_ids.filtered("location_id"):
+                amount = sign * line.price_total
+                amount_by_block[line.location_id] += amount
+                amount_by_month[line.location_id.id, month][1] += amount
+        self._compute_seed_value(amount_by_block)
+        self.env["estate.block.value"].sudo()._add_amounts(amount_by_month)
+        for block, amount in amount_by_block.items():
+            block.block_value += amount
+
+    def _compute_seed_value(self, amount_by_block):
+        """Spread the amount of each block evenly over its active seed
+        batches, with one grouped update for all the blocks"""
+        if not amount_by_block:
+            return
+        seed_batch = self.env["estate.seed.batch"]
+        seed_batch.flush_model(["block_id", "state", "batch_value"])
+        self.env.cr.execute(
+            """
+            UPDATE estate_seed_batch esb
+            SET batch_value = COALESCE(esb.batch_value, 0) + amount.value / batch.qty
+            FROM
+                UNNEST(%(block_ids)s::int[], %(amounts)s::numeric[])
+                    AS amount(block_id, value)
+                JOIN (
+                    SELECT block_id, COUNT(*) AS qty
+                    FROM estate_seed_batch
+                    WHERE state = 'active' AND block_id = ANY(%(block_ids)s)
+                    GROUP BY block_id
+                ) batch ON batch.block_id = amount.block_id
+            WHERE
+                esb.block_id = amount.block_id
+                AND esb.state = 'active'
+            RETURNING esb.id
+            """,
+            {
+                "block_ids": [block.id for block in amount_by_block],
+                "amounts": list(amount_by_block.values()),
+            },
+        )
+        batch_ids = [row[0] for row in self.env.cr.fetchall()]
+        seed_batch.browse(batch_ids).invalidate_recordset(["batch_value"])
 
     def _estate_harvest_post(self):
-        seq = 1
-        for rec in self.estate_harvest_ids:
-            rec.create_analytic_item()
-            rec.is_posted = True
-            if not rec.name:
-                rec.name = self.name, " - ", seq
+        self.estate_harvest_ids.create_analytic_item()
+        self.estate_harvest_ids.is_posted = True
+        for operation in self:
+            seq = 1
+            for rec in operation.estate_harvest_ids.filtered(lambda h: not h.name):
+                rec.name = operation.name, " - ", seq
                 seq += 1
 
     def _upkeep_labour_post(self):
-        for rec in self.labour_line_ids:
-            rec.create_analytic_item()
+        self.labour_line_ids.create_analytic_item()
 
     def _get_stock_location(self):
         source_location_id = self.afdeling_id.harvest_location_id
@@ -591,16 +618,19 @@ class FarmOperationActivity(models.Model):
         return source_location_id, destination_location_id
 
     def _generate_stock_move(self):
-        source_loc_id, dest_loc_id = self._get_stock_location()
-        move_vals = self._prepare_move_values(source_loc_id, dest_loc_id)
-        for move_val in move_vals:
-            move_id = (
+        move_vals = []
+        for operations in self.grouped("afdeling_id").values():
+            source_loc_id, dest_loc_id = operations[:1]._get_stock_location()
+            for operation in operations:
+                move_vals += operation._prepare_move_values(source_loc_id, dest_loc_id)
+        if move_vals:
+            moves = (
                 self.env["stock.move"]
                 .sudo()
                 .with_context(inventory_mode=False)
-                .create(move_val)
+                .create(move_vals)
             )
-            move_id._action_done(cancel_backorder=False)
+            moves._action_done(cancel_backorder=False)
 
     def _prepare_move_values(self, src_location, dest_location, cancel=False):
         self.ensure_one()
@@ -684,10 +714,13 @@ class FarmOperationActivity(models.Model):
                 if line.analytic_line_id:
                     line.analytic_line_id.unlink()
         else:
+            if self.state in ("posted", "done"):
+                self._compute_entire_block(sign=-1)
             for line in self.labour_line_ids:
                 if line.analytic_line_id:
                     line.analytic_line_id.unlink()
         self.write({"state": "cancel"})
+        self.estate_harvest_ids._refresh_harvest_daily()
 
     def _cancel_stock_move(self):
         dest_loc_id, source_loc_id = self._get_stock_location()
@@ -702,7 +735,13 @@ class FarmOperationActivity(models.Model):
             move_id._action_done(cancel_backorder=False)
 
     def action_reset_draft(self):
+        # a done upkeep still carries its cost in the block values
+        self.filtered(
+            lambda o: o.operation_type_id.type_operation != "harvest"
+            and o.state in ("posted", "done")
+        )._compute_entire_block(sign=-1)
         self.write({"state": "draft"})
+        self.estate_harvest_ids._refresh_harvest_daily()
 
     @api.depends("estate_harvest_ids", "estate_harvest_ids.penalty_harvest_ids")
     def _compute_penalty_supervisor(self):
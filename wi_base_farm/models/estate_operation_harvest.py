@@ -1,8 +1,11 @@
 from ast import literal_eval
+from collections import defaultdict
 
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError
 
+PREMI_DIRTY_KEY = "estate.harvest.premi_dirty"
+
 
 class EstateHarvest(models.Model):
     _name = "estate.harvest"
@@ -283,26 +286,10 @@ class EstateHarvest(models.Model):
             return False
 
     def _get_premi_harvest(self, block_id, operation_month):
-        premi_ids = self.env["estate.premi"].search(
-            [
-                ("estate_block_id", "=", block_id.id),
-                ("premi_type", "=", "monthly_harvest"),
-                ("active", "=", True),
-            ]
+        premi = self.env["estate.premi"]
+        return premi.browse(
+            premi._get_monthly_harvest_premi_id(block_id.id, int(operation_month))
         )
-        for premi_id in premi_ids:
-            if (
-                int(premi_id.start_month)
-                <= int(operation_month)
-                <= int(premi_id.end_month)
-            ):
-                return premi_id
-
-    def _get_base_weight(self):
-        for rec in self:
-            rec.base_weight = rec.premi_id.harvest_base_qty
-            if rec._check_attendance_condition():
-                rec.reduce_base_weight()
 
     def _compute_other_harvest_stock(self):
         # convert other harvest qty to stock uom with odoo function
@@ -310,79 +297,72 @@ class EstateHarvest(models.Model):
             self.other_harvest_qty, self.other_harvest_stock_uom_id, round=False
         )
 
-    def _calculate_premi(self, condition_applied):
-        if not self.premi_id:
-            return
-
-        other_harvest_premi = (
-            self.premi_id.other_harvest_premi * self.other_harvest_stock_qty
-        )
-
-        premi_applied = self.premi_id if not condition_applied else condition_applied
-        activity_harvest = self.get_harvest_activity(
-            self.member_id, self.operation_date
-        )
-        harvested_qty = (
-            sum(activity_harvest.mapped("harvest_qty_weight"))
-            if activity_harvest
-            else 0
-        )
-        premi_rules = premi_applied.premi_quantifier_ids.filtered(
-            lambda x: x.base_quantifier <= harvested_qty
-        ).sorted("base_quantifier", reverse=True)
-
-        premi_earned = (
-            self._calculate_premi_by_step_calculation(premi_rules, harvested_qty)
-            if premi_rules
-            else {"premi_base_extra": 0, "attendance_premi": 0}
-        )
-
-        attendance_condition = self._check_attendance_condition()
-        if attendance_condition:
-            premi_earned["attendance_premi"] = 0
+    def _get_harvest_activity_map(self):
+        """Group every harvest line sharing a member and operation date with
+        the lines of ``self``, ordered by id, in a single search.
+
+        Lines of ``self`` stand in for their stored version, so the map also
+        covers records being created or edited in a form.
+        """
+        activity_map = defaultdict(list)
+        members = self.member_id
+        dates = {rec.operation_date for rec in self if rec.operation_date}
+        origin_ids = {rec._origin.id for rec in self if rec._origin.id}
+        if members and dates:
+            harvest_ids = self.env["estate.harvest"].search(
+                [
+                    ("member_id", "in", members.ids),
+                    ("operation_date", "in", list(dates)),
+                    ("id", "not in", list(origin_ids)),
+                ],
+                order="id ASC",
+            )
+            for harvest in harvest_ids:
+                key = (harvest.member_id.id, harvest.operation_date)
+                activity_map[key].append(harvest)
+        for rec in self:
+            lines = activity_map[rec._get_harvest_activity_key()]
+            if rec not in lines:
+                lines.append(rec)
+        return {
+            key: self.browse(
+                [
+                    line.id
+                    # new lines come last, in the order of self
+                    for line in sorted(
+                        lines, key=lambda line: (not line._origin.id, line._origin.id)
+                    )
+                ]
+            )
+            for key, lines in activity_map.items()
+        }
 
-        self.write(
-            {
-                "premi_base_extra": premi_earned["premi_base_extra"],
-                "attendance_premi": premi_earned["attendance_premi"],
-                "other_harvest_premi": other_harvest_premi,
-                "total_premi": premi_earned["premi_base_extra"]
-                + premi_earned["attendance_premi"]
-                + other_harvest_premi,
-            }
-        )
+    def _get_harvest_activity_key(self):
+        if not self.member_id:
+            # lines without a team member are never grouped together
+            return (False, self.id)
+        return (self.member_id.id, self.operation_date)
 
     def _check_attendance_condition(self):
         if not self.member_id:
             return False
 
-        activity_harvest = self.get_harvest_activity(
-            self.member_id, self.operation_date
-        )
-        total_data = len(activity_harvest) + (self not in activity_harvest)
-
-        if total_data > 1:
-            first_harvest = activity_harvest[0]
-
-            return first_harvest != self
-
-        return False
-
-    def _calculate_premi_by_step_calculation(self, premi_rules, harvested_qty):
-        total_qty = harvested_qty
-        premi_base_extra = 0
+        activity_harvest = self._get_harvest_activity_map()[
+            self._get_harvest_activity_key()
+        ]
+        return len(activity_harvest) > 1 and activity_harvest[0] != self
 
-        for premi in premi_rules:
-            net_weight = max(harvested_qty - premi.base_quantifier, 0)
-            premi_base_extra += premi.premi_extra * net_weight
-            harvested_qty -= net_weight
+    def _calculate_premi_by_step_calculation(self, step_table, harvested_qty):
+        premi_base_extra, attendance_premi = self.env[
+            "estate.premi.quantifier"
+        ]._get_step_premi(step_table, harvested_qty)
 
-        price_per_weight = premi_base_extra / total_qty if total_qty > 0 else 0
+        price_per_weight = premi_base_extra / harvested_qty if harvested_qty > 0 else 0
         distributed_amount = price_per_weight * self.harvest_qty_weight
 
         return {
             "premi_base_extra": distributed_amount,
-            "attendance_premi": premi_rules[0].attendance_premi if premi_rules else 0,
+            "attendance_premi": attendance_premi,
         }
 
     def get_harvest_activity(self, member_id, operation_date):
@@ -394,18 +374,71 @@ class EstateHarvest(models.Model):
             order="id ASC",
         )
 
-    def reduce_base_weight(self):
-        base_weight = self.base_weight
-        estate_harvest = self.get_harvest_activity(self.member_id, self.operation_date)
-        for rec in estate_harvest:
-            if rec.id == self.id:
-                break
-            base_weight -= rec.harvest_qty_weight
+    def _compute_premi_batch(self):
+        """Compute the premi fields of the whole recordset in one pass.
+
+        Lines are grouped by (member, operation date) once; base weight
+        reduction, attendance, step premi and other harvest premi are then
+        resolved in memory and assigned without nested writes.
+        """
+        activity_map = self._get_harvest_activity_map()
+        pending_ids = set(self.ids)
+
+        harvest_weights = {}
+        for lines in activity_map.values():
+            for line in lines:
+                harvest_weights[line.id] = (
+                    line.avg_weight * line.harvest_qty_unit
+                    if line.id in pending_ids
+                    else line.harvest_qty_weight
+                )
 
-        if base_weight < 0:
-            base_weight = 0
+        for rec in self:
+            lines = activity_map[rec._get_harvest_activity_key()]
+            is_first_harvest = len(lines) <= 1 or lines[0] == rec
+            harvest_weight = harvest_weights[rec.id]
+
+            base_weight = rec.premi_id.harvest_base_qty
+            if not is_first_harvest:
+                for line in lines:
+                    if line == rec:
+                        break
+                    base_weight -= harvest_weights[line.id]
+                base_weight = max(base_weight, 0)
+
+            rec.base_weight = base_weight
+            rec.harvest_qty_weight = harvest_weight
+            extra_base_weight = harvest_weight - base_weight
+            rec.base_extra_weight = max(extra_base_weight, 0)
+            if extra_base_weight <= 0 or not rec.premi_id:
+                rec.premi_base_extra = 0
+                rec.attendance_premi = 0
+                rec.other_harvest_premi = 0
+                rec.total_premi = 0
+                continue
 
-        self.base_weight = base_weight
+            condition_to_applied = rec.premi_id._compute_condition_to_applied(
+                rec.operation_date, rec.member_id
+            )
+            premi_applied = condition_to_applied or rec.premi_id
+            harvested_qty = sum(harvest_weights[line.id] for line in lines)
+            premi_earned = rec._calculate_premi_by_step_calculation(
+                premi_applied.premi_step_table, harvested_qty
+            )
+            if not is_first_harvest:
+                premi_earned["attendance_premi"] = 0
+
+            other_harvest_premi = (
+                rec.premi_id.other_harvest_premi * rec.other_harvest_stock_qty
+            )
+            rec.premi_base_extra = premi_earned["premi_base_extra"]
+            rec.attendance_premi = premi_earned["attendance_premi"]
+            rec.other_harvest_premi = other_harvest_premi
+            rec.total_premi = (
+                premi_earned["premi_base_extra"]
+                + premi_earned["attendance_premi"]
+                + other_harvest_premi
+            )
 
     def _get_other_average_weight(self):
         if self.harvest_qty_unit > 0:
@@ -457,20 +490,7 @@ class EstateHarvest(models.Model):
         "other_harvest_stock_qty",
     )
     def _compute_premi_total(self):
-        for rec in self:
-            rec._get_base_weight()
-            rec.harvest_qty_weight = rec.avg_weight * rec.harvest_qty_unit
-            extra_base_weight = rec.harvest_qty_weight - rec.base_weight
-            if extra_base_weight > 0:
-                rec.base_extra_weight = extra_base_weight
-                condition_to_applied = rec.premi_id._compute_condition_to_applied(
-                    rec.operation_date, rec.member_id
-                )
-                rec._calculate_premi(condition_to_applied)
-            else:
-                rec.base_extra_weight = 0
-                rec.premi_base_extra = 0
-                rec.attendance_premi = 0
+        self._compute_premi_batch()
 
     @api.depends("other_harvest_qty")
     def _compute_other_harvest_stock_qty(self):
@@ -585,12 +605,59 @@ class EstateHarvest(models.Model):
             "target": "new",
         }
 
-    def create_analytic_item(self):
-        block = self.env.ref("wi_base_farm.analytic_plan_block")
-        block_column = block._column_name()
-        activity = self.env.ref("wi_base_farm.analytic_plan_activities")
-        activity_column = activity._column_name()
-        localdict = {
+    def _refresh_harvest_daily(self):
+        harvests = self.filtered(lambda h: h.block_id and h.operation_date)
+        if not harvests:
+            return
+        self.env["estate.harvest.daily"].sudo()._refresh(
+            harvests.block_id.ids, set(harvests.mapped("operation_date"))
+        )
+        afdelings = harvests.block_id.estate_id
+        (afdelings | afdelings.parent_id)._recompute_estate_summary()
+        harvests._mark_premi_dirty()
+
+    def _mark_premi_dirty(self):
+        """Queue the daily premi, by (employee, date), and the monthly premi,
+        by (assistant, afdeling, date), sourced from these harvests. They are
+        recomputed once at the end of the transaction."""
+        data = self.env.cr.precommit.data
+        if PREMI_DIRTY_KEY not in data:
+            self.env.cr.precommit.add(self._process_premi_dirty)
+        dirty = data.setdefault(PREMI_DIRTY_KEY, {"daily": set(), "monthly": set()})
+        for harvest in self.filtered("operation_date"):
+            operation = harvest.estate_operation_id
+            day = harvest.operation_date
+            employees = (
+                operation.foreman_id
+                | operation.foreman_extra_id
+                | operation.clerk_id
+                | operation.recorder_id
+            )
+            dirty["daily"].update((employee.id, day) for employee in employees)
+            if operation.assistant_id and operation.afdeling_id:
+                dirty["monthly"].add(
+                    (operation.assistant_id.id, operation.afdeling_id.id, day)
+                )
+
+    @api.model
+    def _process_premi_dirty(self):
+        """Recompute the premi queued by _mark_premi_dirty and return the
+        number of daily and monthly premi rows touched"""
+        dirty = self.env.cr.precommit.data.pop(PREMI_DIRTY_KEY, None)
+        if not dirty:
+            return {"daily": 0, "monthly": 0}
+        env = self.sudo().env
+        daily = env["estate.premi.operation.daily"]._recompute_dirty(dirty["daily"])
+        monthly = env["estate.premi.operation.line"]._recompute_dirty(
+            dirty["monthly"]
+        )
+        # precommit hooks run after the final flush of the transaction
+        env.flush_all()
+        return {"daily": len(daily), "monthly": len(monthly)}
+
+    def _prepare_analytic_line_vals(self, block_column, activity_column):
+        self.ensure_one()
+        return {
             "name": self.name,
             "date": self.operation_date,
             "company_id": self.company_id.id,
@@ -602,7 +669,22 @@ class EstateHarvest(models.Model):
             "unit_amount": self.harvest_qty_unit,
             "operation_type_id": self.estate_operation_id.operation_type_id.id,
         }
-        self.analytic_line_id = self.env["account.analytic.line"].create(localdict)
+
+    def create_analytic_item(self):
+        """Create the analytic lines of all the records in one batch and link
+        each record to its line"""
+        block = self.env.ref("wi_base_farm.analytic_plan_block")
+        block_column = block._column_name()
+        activity = self.env.ref("wi_base_farm.analytic_plan_activities")
+        activity_column = activity._column_name()
+        analytic_lines = self.env["account.analytic.line"].create(
+            [
+                rec._prepare_analytic_line_vals(block_column, activity_column)
+                for rec in self
+            ]
+        )
+        for rec, analytic_line in zip(self, analytic_lines):
+            rec.analytic_line_id = analytic_line
 
 
 class FarmHarvestPenalty(models.Model):
@@ -223,12 +223,9 @@ class UpkeepLabour(models.Model):
         res = super().write(vals)
         return res
 
-    def create_analytic_item(self):
-        block = self.env.ref("wi_base_farm.analytic_plan_block")
-        block_column = block._column_name()
-        activity = self.env.ref("wi_base_farm.analytic_plan_activities")
-        activity_column = activity._column_name()
-        localdict = {
+    def _prepare_analytic_line_vals(self, block_column, activity_column):
+        self.ensure_one()
+        return {
             "name": self.name,
             "date": self.operation_date,
             "company_id": self.company_id.id,
@@ -240,7 +237,22 @@ class UpkeepLabour(models.Model):
             "unit_amount": self.quantity,
             "operation_type_id": self.operation_type_id.id,
         }
-        self.analytic_line_id = self.env["account.analytic.line"].create(localdict)
+
+    def create_analytic_item(self):
+        """Create the analytic lines of all the records in one batch and link
+        each record to its line"""
+        block = self.env.ref("wi_base_farm.analytic_plan_block")
+        block_column = block._column_name()
+        activity = self.env.ref("wi_base_farm.analytic_plan_activities")
+        activity_column = activity._column_name()
+        analytic_lines = self.env["account.analytic.line"].create(
+            [
+                rec._prepare_analytic_line_vals(block_column, activity_column)
+                for rec in self
+            ]
+        )
+        for rec, analytic_line in zip(self, analytic_lines):
+            rec.analytic_line_id = analytic_line
 
 
 class UpkeepMaterial(models.Model):
@@ -1,11 +1,16 @@
+import logging
+from bisect import bisect_right
+from collections import defaultdict
 from datetime import date
 
 from dateutil.relativedelta import relativedelta
 
-from odoo import Command, _, api, fields, models
+from odoo import Command, _, api, fields, models, tools
 from odoo.exceptions import UserError
 from odoo.tools.misc import format_date
 
+_logger = logging.getLogger(__name__)
+
 PREMI_TYPE = [
     ("non_harvest", "Non-Harvest Work Unit Rates"),
     ("loaded_premi", "Loaded Premi"),
@@ -29,11 +34,35 @@ MONTHLY = [
 
 LOADED_TYPE = [("truck", "Dump Truck"), ("fuso", "Fuso")]
 
+# Operation fields of the supervisor and of its penalty, per daily premi role
+SUPERVISOR_FIELDS = {
+    "foreman": ("foreman_id", "foreman_total_penalty"),
+    "clerk": ("clerk_id", "recorder_total_penalty"),
+    "recorder": ("recorder_id", False),
+}
+
+# Monthly premi lines computed and committed together by the premi job
+PREMI_COMPUTE_CHUNK_SIZE = 100
+
 CONDITIONAL_PREMI = [
     ("by_day", "By Day"),
     ("by_holidays", "By Holidays"),
 ]
 
+# Fields of estate.premi used to resolve the monthly harvest premi of a block
+PREMI_RESOLVER_FIELDS = {
+    "active",
+    "estate_block_id",
+    "premi_type",
+    "start_month",
+    "end_month",
+}
+
+# Sequences versioning the cached premi and public holiday resolution
+PREMI_RESOLVER_VERSION = "estate_premi_resolver_version"
+HOLIDAY_VERSION = "estate_premi_holiday_version"
+PREMI_CACHE_VERSIONS = "estate_premi_cache_versions"
+
 
 class EstatePremiConfig(models.Model):
     _name = "estate.premi.config"
@@ -184,10 +213,20 @@ class EstatePremi(models.Model):
         inverse_name="premi_id",
         string="Conditions",
     )
+    premi_step_table = fields.Json(compute="_compute_premi_step_table", store=True)
 
     force_premi_amount = fields.Boolean(default=False)
     minimal_unit = fields.Float()
 
+    @api.depends(
+        "premi_quantifier_ids.base_quantifier",
+        "premi_quantifier_ids.premi_extra",
+        "premi_quantifier_ids.attendance_premi",
+    )
+    def _compute_premi_step_table(self):
+        for premi in self:
+            premi.premi_step_table = premi.premi_quantifier_ids._compile_step_table()
+
     @api.depends("account_activity_id", "estate_block_id")
     def _compute_name(self):
         for premi in self:
@@ -199,6 +238,125 @@ class EstatePremi(models.Model):
                     f"{premi.estate_block_id.code}"
                 )
 
+    def init(self):
+        for sequence in (PREMI_RESOLVER_VERSION, HOLIDAY_VERSION):
+            self.env.cr.execute(f"CREATE SEQUENCE IF NOT EXISTS {sequence}")
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        self._renew_cache_version(PREMI_RESOLVER_VERSION)
+        return res
+
+    def write(self, vals):
+        res = super().write(vals)
+        if PREMI_RESOLVER_FIELDS & set(vals):
+            self._renew_cache_version(PREMI_RESOLVER_VERSION)
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self._renew_cache_version(PREMI_RESOLVER_VERSION)
+        return res
+
+    @api.model
+    def _get_cache_version(self, sequence):
+        """Version of a cached resolution, read once per transaction. None
+        when the resolved records were changed by the current transaction, as
+        the change is not visible to the other workers before the commit."""
+        if sequence in self.env.cr.postcommit.data:
+            return None
+        versions = self.env.cr.precommit.data.setdefault(PREMI_CACHE_VERSIONS, {})
+        if sequence not in versions:
+            # a new sequence reports the value its first nextval returns
+            self.env.cr.execute(
+                f"""
+                SELECT CASE WHEN is_called THEN last_value ELSE 0 END
+                FROM {sequence}
+                """
+            )
+            versions[sequence] = self.env.cr.fetchone()[0]
+        return versions[sequence]
+
+    @api.model
+    def _renew_cache_version(self, sequence):
+        """Renew the version of a cached resolution once the current
+        transaction is committed."""
+        if sequence in self.env.cr.postcommit.data:
+            return
+        self.env.cr.postcommit.data[sequence] = True
+
+        @self.env.cr.postcommit.add
+        def renew_version():
+            with self.env.registry.cursor() as cr:
+                cr.execute(f"SELECT nextval('{sequence}')")
+
+    @api.model
+    def _get_monthly_harvest_premi_id(self, block_id, operation_month):
+        """Return the id of the monthly harvest premi applied to a block in a
+        month. Cached per (block, month) until a premi is changed."""
+        version = self._get_cache_version(PREMI_RESOLVER_VERSION)
+        if version is None:
+            return self._resolve_monthly_harvest_premi_id(block_id, operation_month)
+        return self._get_cached_monthly_harvest_premi_id(
+            block_id, operation_month, version
+        )
+
+    @api.model
+    @tools.ormcache("block_id", "operation_month", "version")
+    def _get_cached_monthly_harvest_premi_id(self, block_id, operation_month, version):
+        return self._resolve_monthly_harvest_premi_id(block_id, operation_month)
+
+    @api.model
+    def _resolve_monthly_harvest_premi_id(self, block_id, operation_month):
+        premi_ids = self.sudo().search(
+            [
+                ("estate_block_id", "=", block_id),
+                ("premi_type", "=", "monthly_harvest"),
+                ("active", "=", True),
+            ]
+        )
+        for premi_id in premi_ids:
+            if (
+                int(premi_id.start_month)
+                <= int(operation_month)
+                <= int(premi_id.end_month)
+            ):
+                return premi_id.id
+        return False
+
+    @api.model
+    def _is_holiday(self, calendar_id, operation_date):
+        """Check for a public holiday of a working schedule on a date.
+        Cached per (calendar, date) until a public holiday is changed."""
+        version = self._get_cache_version(HOLIDAY_VERSION)
+        if version is None:
+            return self._resolve_holiday(calendar_id, operation_date)
+        return self._get_cached_holiday(calendar_id, operation_date, version)
+
+    @api.model
+    @tools.ormcache("calendar_id", "operation_date", "version")
+    def _get_cached_holiday(self, calendar_id, operation_date, version):
+        return self._resolve_holiday(calendar_id, operation_date)
+
+    @api.model
+    def _resolve_holiday(self, calendar_id, operation_date):
+        return bool(
+            self.env["resource.calendar.leaves"]
+            .sudo()
+            .search_count(
+                [
+                    ("resource_id", "=", False),
+                    ("date_from", "<=", operation_date),
+                    ("date_to", ">=", operation_date),
+                    "|",
+                    ("calendar_id", "=", False),
+                    ("calendar_id", "=", calendar_id),
+                ],
+                limit=1,
+            )
+        )
+
     def _compute_condition_to_applied(self, operation_date, member_id):
         if not self.use_condition:
             return False
@@ -207,18 +365,7 @@ class EstatePremi(models.Model):
 
         for condition in self.premi_condition_ids:
             if condition.condition == "by_holidays":
-                holiday_ids = self.env["resource.calendar.leaves"].search(
-                    [
-                        ("resource_id", "=", False),
-                        ("date_from", "<=", operation_date),
-                        ("date_to", ">=", operation_date),
-                        "|",
-                        ("calendar_id", "=", False),
-                        ("calendar_id", "=", shift_id.id),
-                    ]
-                )
-
-                if holiday_ids:
+                if self._is_holiday(shift_id.id, operation_date):
                     return condition
             elif condition.condition == "by_day":
                 if int(condition.condition_day) == operation_date.isoweekday():
@@ -269,6 +416,40 @@ class EstatePremiQuantifier(models.Model):
             )
             row.base_quantifier = base_weight * row.quantifier
 
+    def _compile_step_table(self):
+        """Compile the quantifiers into a step table sorted by base quantifier.
+
+        Each step holds its base quantifier, its premi per weight, its
+        attendance premi and the premi earned up to its base, so the step
+        premi of a weight is found by a binary search on the bases. On equal
+        bases the first quantifier wins, like the step walk did.
+        """
+        table = {"bases": [], "premi_extra": [], "attendance": [], "cumulative": []}
+        for row in self.sorted(lambda r: (r.base_quantifier, r.id)):
+            if table["bases"] and table["bases"][-1] == row.base_quantifier:
+                continue
+            cumulative = 0.0
+            if table["bases"]:
+                cumulative = table["cumulative"][-1] + table["premi_extra"][-1] * (
+                    row.base_quantifier - table["bases"][-1]
+                )
+            table["bases"].append(row.base_quantifier)
+            table["premi_extra"].append(row.premi_extra)
+            table["attendance"].append(row.attendance_premi)
+            table["cumulative"].append(cumulative)
+        return table
+
+    @api.model
+    def _get_step_premi(self, step_table, harvested_qty):
+        """Return the step premi and attendance premi of a harvested weight"""
+        index = bisect_right((step_table or {}).get("bases", []), harvested_qty) - 1
+        if index < 0:
+            return 0.0, 0.0
+        premi = step_table["cumulative"][index] + step_table["premi_extra"][index] * (
+            harvested_qty - step_table["bases"][index]
+        )
+        return premi, step_table["attendance"][index]
+
 
 class EstatePremiCondition(models.Model):
     _name = "estate.premi.condition"
@@ -321,11 +502,23 @@ class EstatePremiCondition(models.Model):
     )
 
     premi_quantifier_ids = fields.One2many("estate.premi.quantifier", "condition_id")
+    premi_step_table = fields.Json(compute="_compute_premi_step_table", store=True)
 
     premi_amount = fields.Monetary(
         string="Premi", currency_field="currency_id", default=0.0
     )
 
+    @api.depends(
+        "premi_quantifier_ids.base_quantifier",
+        "premi_quantifier_ids.premi_extra",
+        "premi_quantifier_ids.attendance_premi",
+    )
+    def _compute_premi_step_table(self):
+        for condition in self:
+            condition.premi_step_table = (
+                condition.premi_quantifier_ids._compile_step_table()
+            )
+
 
 class EstatePremiOperationDaily(models.Model):
     _name = "estate.premi.operation.daily"
@@ -448,14 +641,119 @@ class EstatePremiOperationDaily(models.Model):
         return [
             ("state", "in", ["posted", "done"]),
             ("operation_type_id", "in", harvest_operation.ids),
-            ("operation_date", "=", self.operation_date),
-            ("afdeling_id", "in", self.estate_id.child_ids.ids),
+            ("operation_date", "in", list(set(self.mapped("operation_date")))),
+            ("afdeling_id.parent_id", "in", self.estate_id.ids),
         ]
 
-    def get_operation_ids(self, domain, field_name):
-        return self.env["estate.operation"].search(
-            domain + [(field_name, "=", self.employee_id.id)]
+    def _get_supervisor_premi_data(self, work_as):
+        """Return the harvest premi per member and the penalty of the
+        supervisors of self working as work_as, keyed by (employee id, date,
+        estate id), from grouped queries on the posted harvest operations"""
+        employee_field, penalty_field = SUPERVISOR_FIELDS[work_as]
+        self.env["estate.harvest"].flush_model(
+            ["estate_operation_id", "member_id", "total_premi"]
+        )
+        self.env["estate.operation"].flush_model()
+        self.env["estate.operation.type"].flush_model(["type_operation"])
+        self.env["estate.estate"].flush_model(["parent_id"])
+        operation_query = f"""
+            WITH operation AS (
+                SELECT
+                    eo.id,
+                    eo.{employee_field} AS employee_id,
+                    eo.operation_date,
+                    ee.parent_id AS estate_id,
+                    {f"eo.{penalty_field}" if penalty_field else "0"} AS penalty
+                FROM
+                    estate_operation eo
+                    JOIN estate_operation_type eot ON eo.operation_type_id = eot.id
+                    JOIN estate_estate ee ON eo.afdeling_id = ee.id
+                WHERE
+                    eo.state IN ('posted', 'done')
+                    AND eot.type_operation = 'harvest'
+                    AND eo.operation_date = ANY(%(dates)s)
+                    AND eo.{employee_field} = ANY(%(employee_ids)s)
+                    AND ee.parent_id = ANY(%(estate_ids)s)
+            )
+        """
+        params = {
+            "dates": list(set(self.mapped("operation_date"))),
+            "employee_ids": self.employee_id.ids,
+            "estate_ids": self.estate_id.ids,
+        }
+        self.env.cr.execute(
+            f"""
+            {operation_query}
+            SELECT
+                o.employee_id,
+                o.operation_date,
+                o.estate_id,
+                eh.member_id,
+                SUM(eh.total_premi)
+            FROM
+                operation o
+                JOIN estate_harvest eh ON eh.estate_operation_id = o.id
+            WHERE
+                eh.member_id IS NOT NULL
+            GROUP BY
+                o.employee_id,
+                o.operation_date,
+                o.estate_id,
+                eh.member_id
+            """,
+            params,
+        )
+        member_premi = defaultdict(dict)
+        for employee_id, day, estate_id, member_id, total in self.env.cr.fetchall():
+            member_premi[employee_id, day, estate_id][member_id] = float(total or 0)
+        self.env.cr.execute(
+            f"""
+            {operation_query}
+            SELECT employee_id, operation_date, estate_id, SUM(penalty)
+            FROM operation
+            GROUP BY employee_id, operation_date, estate_id
+            """,
+            params,
+        )
+        penalty = {
+            (employee_id, day, estate_id): float(total or 0)
+            for employee_id, day, estate_id, total in self.env.cr.fetchall()
+        }
+        return member_premi, penalty
+
+    def _get_extra_foreman_premi_data(self):
+        """Return the daily premi of the foremen under the extra foremen of
+        self and their penalty, keyed by (employee id, date, estate id)"""
+        operations = self.env["estate.operation"].search(
+            self._get_activity_domain()
+            + [("foreman_extra_id", "in", self.employee_id.ids)]
+        )
+        foreman_premi = self.search(
+            [
+                ("operation_date", "in", list(set(self.mapped("operation_date")))),
+                ("employee_id", "in", operations.foreman_id.ids),
+                ("state", "!=", "cancel"),
+            ]
         )
+        # a foreman can have several premi on a date, one per estate
+        premi_by_foreman = defaultdict(lambda: defaultdict(float))
+        for premi in foreman_premi:
+            premi_by_foreman[premi.employee_id.id, premi.operation_date][
+                premi.employee_id.id
+            ] += premi.premi_total
+        member_premi = defaultdict(dict)
+        penalty = defaultdict(float)
+        for operation in operations:
+            key = (
+                operation.foreman_extra_id.id,
+                operation.operation_date,
+                operation.afdeling_id.parent_id.id,
+            )
+            member_premi[key].update(
+                premi_by_foreman[operation.foreman_id.id, operation.operation_date]
+            )
+            penalty[key] += operation.extra_foreman_total_penalty
+        return member_premi, penalty
 
     @api.onchange("estate_id", "employee_id")
     def _onchange_estate_id(self):
@@ -466,74 +764,59 @@ class EstatePremiOperationDaily(models.Model):
 
     @api.depends("employee_id", "operation_date", "work_as", "estate_id")
     def _compute_source_ids(self):
-        for record in self:
-            record.source_ids = [Command.clear()]
-
-            operation_ids = record.env["estate.operation"]
-            domain = record._get_activity_domain()
-            data = []
-            penalty_deduction = 0
-
-            if record.work_as in ["foreman", "clerk", "recorder"]:
-                operation_field_map = {
-                    "foreman": "foreman_id",
-                    "clerk": "clerk_id",
-                    "recorder": "recorder_id",
-                }
-                operation_ids = record.get_operation_ids(
-                    domain, operation_field_map[record.work_as]
-                )
-                harvest = operation_ids.mapped("estate_harvest_ids")
+        member_premi, penalty = {}, {}
+        records = self.filtered(lambda r: r.employee_id and r.operation_date)
+        for work_as in [*SUPERVISOR_FIELDS, "extra_foreman"]:
+            premis = records.filtered(lambda r, work_as=work_as: r.work_as == work_as)
+            if not premis:
+                continue
+            if work_as == "extra_foreman":
+                premi_data, penalty_data = premis._get_extra_foreman_premi_data()
+            else:
+                premi_data, penalty_data = premis._get_supervisor_premi_data(work_as)
+            member_premi.update(premi_data)
+            penalty.update(penalty_data)
 
-                penalty_field_map = {
-                    "foreman": "foreman_total_penalty",
-                    "clerk": "recorder_total_penalty",
-                    "recorder": False,
-                }
-                penalty_deduction = (
-                    sum(operation_ids.mapped(penalty_field_map[record.work_as]))
-                    if penalty_field_map[record.work_as]
-                    else 0
-                )
+        for record in self:
+            key = (record.employee_id.id, record.operation_date, record.estate_id.id)
+            record._update_source_ids(
+                dict(member_premi.get(key, {})), penalty.get(key, 0.0)
+            )
 
-                for employee in harvest.mapped("member_id"):
-                    premi = sum(
-                        harvest.filtered(lambda x: x.member_id == employee).mapped(
-                            "total_premi"
-                        )
-                    )
-                    data.append(
-                        Command.create(
-                            {
-                                "employee_id": employee.id,
-                                "total_premi": premi,
-                            }
-                        )
-                    )
-            elif record.work_as == "extra_foreman":
-                operation_ids = record.get_operation_ids(domain, "foreman_extra_id")
-                foreman_ids = operation_ids.mapped("foreman_id")
-                daily_premi_ids = record.search(
-                    [
-                        ("operation_date", "=", record.operation_date),
-                        ("employee_id", "in", foreman_ids.ids),
-                        ("state", "!=", "cancel"),
-                    ]
-                )
-                penalty_deduction = sum(
-                    operation_ids.mapped("extra_foreman_total_penalty")
-                )
-                for premi in daily_premi_ids:
-                    data.append(
-                        Command.create(
-                            {
-                                "employee_id": premi.employee_id.id,
-                                "total_premi": premi.premi_total,
-                            }
-                        )
-                    )
-
-            record.write({"source_ids": data, "penalty_deduction": penalty_deduction})
+    def _update_source_ids(self, member_premi, penalty_deduction):
+        """Update the source lines to the given premi per member id, only
+        touching the lines whose member or amount changed"""
+        commands = []
+        for source in self.source_ids:
+            total_premi = member_premi.pop(source.employee_id.id, None)
+            if total_premi is None:
+                commands.append(Command.delete(source.id))
+            elif source.total_premi != total_premi:
+                commands.append(Command.update(source.id, {"total_premi": total_premi}))
+        commands += [
+            Command.create({"employee_id": employee_id, "total_premi": total_premi})
+            for employee_id, total_premi in member_premi.items()
+        ]
+        self.write({"source_ids": commands, "penalty_deduction": penalty_deduction})
+
+    @api.model
+    def _recompute_dirty(self, keys):
+        """Recompute the sources of the draft daily premi of the given
+        (employee id, date) keys, the extra foremen after the foremen they
+        are sourced from. Posted and locked premi are left untouched."""
+        if not keys:
+            return self.browse()
+        premis = self.search(
+            [
+                ("state", "=", "draft"),
+                ("employee_id", "in", list({key[0] for key in keys})),
+                ("operation_date", "in", list({key[1] for key in keys})),
+            ]
+        ).filtered(lambda p: (p.employee_id.id, p.operation_date) in keys)
+        extra_foreman = premis.filtered(lambda p: p.work_as == "extra_foreman")
+        (premis - extra_foreman)._compute_source_ids()
+        extra_foreman._compute_source_ids()
+        return premis
 
     @api.depends(
         "source_ids", "premi_multiplier", "source_ids.total_premi", "additional_premi"
@@ -763,6 +1046,41 @@ class EstatePremiOperationMonthly(models.Model):
         store=True,
     )
 
+    compute_state = fields.Selection(
+        [
+            ("queued", "Queued"),
+            ("running", "Running"),
+            ("done", "Computed"),
+            ("failed", "Failed"),
+        ],
+        copy=False,
+        readonly=True,
+    )
+    compute_error = fields.Text(copy=False, readonly=True)
+    compute_start_date = fields.Datetime(copy=False, readonly=True)
+    compute_line_count = fields.Integer(copy=False, readonly=True)
+    compute_line_done = fields.Integer(copy=False, readonly=True)
+    compute_progress = fields.Float(compute="_compute_compute_progress")
+    compute_eta = fields.Datetime(
+        string="Estimated End", compute="_compute_compute_progress"
+    )
+
+    @api.depends("compute_start_date", "compute_line_count", "compute_line_done")
+    def _compute_compute_progress(self):
+        now = fields.Datetime.now()
+        for record in self:
+            record.compute_progress = (
+                100.0 * record.compute_line_done / record.compute_line_count
+                if record.compute_line_count
+                else 0.0
+            )
+            record.compute_eta = False
+            if record.compute_start_date and record.compute_line_done:
+                done = record.compute_line_done
+                elapsed = now - record.compute_start_date
+                remaining = record.compute_line_count - done
+                record.compute_eta = now + elapsed * remaining / done
+
     @api.depends("afdeling_premi_ids", "estate_premi_ids")
     def _compute_premi_total(self):
         for record in self:
@@ -818,12 +1136,89 @@ class EstatePremiOperationMonthly(models.Model):
         return cache[key]
 
     def action_compute_premi(self):
+        """Queue the premi computation, run in chunks by the premi cron"""
         for record in self:
-            record.afdeling_premi_ids.action_compute_premi()
-            record.estate_premi_ids.action_compute_premi()
-            record._compute_premi_total()
+            lines = record.afdeling_premi_ids | record.estate_premi_ids
+            lines.write({"premi_pending": True})
+            record.write(
+                {
+                    "compute_state": "queued",
+                    "compute_start_date": False,
+                    "compute_line_count": len(lines),
+                    "compute_line_done": 0,
+                    "compute_error": False,
+                }
+            )
+        self.env.ref("wi_base_farm.ir_cron_compute_monthly_premi")._trigger()
+
+    @api.model
+    def _cron_compute_premi(self):
+        for record in self.search(
+            [("compute_state", "in", ["queued", "running"])], order="id"
+        ):
+            try:
+                record._run_compute_premi()
+            except Exception as error:
+                _logger.exception("Monthly premi %s computation failed", record.id)
+                self._rollback_progress()
+                record.write({"compute_state": "failed", "compute_error": str(error)})
+                self._commit_progress()
+
+    def _run_compute_premi(self):
+        """Compute the pending premi lines chunk by chunk, committing after
+        each chunk. An interrupted run resumes from the lines still pending
+        on the next cron run."""
+        self.ensure_one()
+        if self.state != "draft":
+            # only draft premi are computed, the others keep their lines
+            (self.afdeling_premi_ids | self.estate_premi_ids).premi_pending = False
+            self.compute_state = False
+            self._commit_progress()
+            return
+        if self.compute_state == "queued":
+            self.write(
+                {
+                    "compute_state": "running",
+                    "compute_start_date": fields.Datetime.now(),
+                }
+            )
+        # The estate premi average the afdeling premi, compute those first
+        for lines in (self.afdeling_premi_ids, self.estate_premi_ids):
+            pending = lines.filtered("premi_pending")
+            actual_harvest = pending._get_actual_harvest()
+            for chunk in tools.split_every(
+                PREMI_COMPUTE_CHUNK_SIZE, pending.ids, pending.browse
+            ):
+                chunk._set_actual_harvest(actual_harvest)
+                chunk._compute_employee_premi()
+                chunk.premi_pending = False
+                self.compute_line_done += len(chunk)
+                self._commit_progress()
+        self._compute_premi_total()
+        self.write(
+            {"compute_state": "done", "compute_line_done": self.compute_line_count}
+        )
+        self._commit_progress()
+
+    def _commit_progress(self):
+        if not self.env.registry.in_test_mode():
+            self.env.cr.commit()
+
+    def _rollback_progress(self):
+        if not self.env.registry.in_test_mode():
+            self.env.cr.rollback()
+
+    def _check_compute_pending(self):
+        if any(record.compute_state in ("queued", "running") for record in self):
+            raise UserError(
+                _(
+                    "Wait for the premi computation to finish before confirming "
+                    "or cancelling the premi."
+                )
+            )
 
     def action_post(self):
+        self._check_compute_pending()
         for record in self:
             record.state = "posted"
 
@@ -832,6 +1227,7 @@ class EstatePremiOperationMonthly(models.Model):
             record.state = "done"
 
     def action_cancel(self):
+        self._check_compute_pending()
         for record in self:
             record.state = "cancel"
 
@@ -926,6 +1322,9 @@ class EstatePremiOperationLine(models.Model):
         compute="_compute_employee_premi",
         store=True,
     )
+    premi_pending = fields.Boolean(
+        copy=False, help="Queued for the next run of the monthly premi job"
+    )
 
     def _compute_operation_id(self):
         for record in self:
@@ -934,14 +1333,71 @@ class EstatePremiOperationLine(models.Model):
             )
 
     def action_compute_premi(self):
-        for record in self:
-            record._compute_actual_harvest()
-            record._compute_employee_premi()
+        self._compute_actual_harvest()
+        self._compute_employee_premi()
+
+    @api.model
+    def _recompute_dirty(self, keys):
+        """Recompute the afdeling premi of the draft monthly premi covering the
+        given (assistant id, afdeling id, date) keys, then the estate premi
+        and totals of their monthly premi"""
+        if not keys:
+            return self.browse()
+        dates = defaultdict(list)
+        for employee_id, afdeling_id, day in keys:
+            dates[employee_id, afdeling_id].append(day)
+        lines = self.search(
+            [
+                ("operation_id.state", "=", "draft"),
+                ("line_type", "=", "afdeling"),
+                ("employee_id", "in", list({key[0] for key in keys})),
+                ("estate_id", "in", list({key[1] for key in keys})),
+                ("date_from", "<=", max(key[2] for key in keys)),
+                ("date_to", ">=", min(key[2] for key in keys)),
+            ]
+        ).filtered(
+            lambda line: any(
+                line.date_from <= day <= line.date_to
+                for day in dates[line.employee_id.id, line.estate_id.id]
+            )
+        )
+        lines.action_compute_premi()
+        operations = lines.operation_id
+        operations.estate_premi_ids.action_compute_premi()
+        operations._compute_premi_total()
+        return lines | operations.estate_premi_ids
 
     @api.depends(
         "employee_id", "estate_id", "date_from", "date_to", "operation_id.estate_id"
     )
     def _compute_actual_harvest(self):
+        self._set_actual_harvest(self._get_actual_harvest())
+
+    def _get_actual_harvest(self):
+        """Return the harvest quantity of the posted operations in the period
+        of the lines, per (monthly premi id, assistant id, afdeling id), with
+        one grouped query per monthly premi"""
+        actual_harvest = {}
+        lines = self.filtered(lambda line: line.line_type == "afdeling")
+        for operation, operation_lines in lines.grouped("operation_id").items():
+            if not operation.date_from or not operation.date_to:
+                continue
+            groups = self.env["estate.operation"]._read_group(
+                [
+                    ("assistant_id", "in", operation_lines.employee_id.ids),
+                    ("afdeling_id", "in", operation_lines.estate_id.ids),
+                    ("operation_date", ">=", operation.date_from),
+                    ("operation_date", "<=", operation.date_to),
+                    ("state", "in", ["posted", "done"]),
+                ],
+                ["assistant_id", "afdeling_id"],
+                ["harvest_uom_qty:sum"],
+            )
+            for assistant, afdeling, quantity in groups:
+                actual_harvest[operation.id, assistant.id, afdeling.id] = quantity
+        return actual_harvest
+
+    def _set_actual_harvest(self, actual_harvest):
         for record in self:
             record.planned_optimal = (
                 record.operation_id.estate_id.planned_optimal or 0.0
@@ -960,18 +1416,13 @@ class EstatePremiOperationLine(models.Model):
                 and record.date_to
                 and record.line_type == "afdeling"
             ):
-                record.actual_harvest = sum(
-                    record.env["estate.operation"]
-                    .search(
-                        [
-                            ("assistant_id", "=", record.employee_id.id),
-                            ("operation_date", ">=", record.date_from),
-                            ("operation_date", "<=", record.date_to),
-                            ("afdeling_id", "=", record.estate_id.id),
-                            ("state", "in", ["posted", "done"]),
-                        ]
-                    )
-                    .mapped("harvest_uom_qty")
+                record.actual_harvest = actual_harvest.get(
+                    (
+                        record.operation_id.id,
+                        record.employee_id.id,
+                        record.estate_id.id,
+                    ),
+                    0.0,
                 )
 
     @api.depends(
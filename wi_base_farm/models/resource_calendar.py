@@ -0,0 +1,30 @@
+from odoo import api, models
+
+from .estate_premi import HOLIDAY_VERSION
+
+
+class ResourceCalendarLeaves(models.Model):
+    _inherit = "resource.calendar.leaves"
+
+    # Public holidays are cached per (calendar, date) by estate.premi._is_holiday
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        res._renew_holiday_version()
+        return res
+
+    def write(self, vals):
+        self._renew_holiday_version()
+        res = super().write(vals)
+        self._renew_holiday_version()
+        return res
+
+    def unlink(self):
+        self._renew_holiday_version()
+        return super().unlink()
+
+    def _renew_holiday_version(self):
+        # leaves of a resource are not public holidays
+        if self.filtered(lambda leave: not leave.resource_id):
+            self.env["estate.premi"]._renew_cache_version(HOLIDAY_VERSION)
@@ -0,0 +1,4 @@
+from . import test_block_value
+from . import test_premi_batch
+from . import test_premi_holiday
+from . import test_premi_step_table
@@ -0,0 +1,88 @@
+from datetime import date
+
+from odoo.tests import TransactionCase
+
+
+class EstateCommon(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env.company
+        cls.harvest_product = cls.env["product.product"].create(
+            {
+                "name": "Test Fresh Fruit Bunch",
+                "default_code": "TFFB",
+                "type": "consu",
+                "uom_id": cls.env.ref("uom.product_uom_kgm").id,
+                "uom_po_id": cls.env.ref("uom.product_uom_kgm").id,
+                "farm_data": True,
+            }
+        )
+        cls.estate = cls.env["estate.estate"].create(
+            {
+                "name": "Test Estate",
+                "code": "TEST-EST",
+                "parent_id": False,
+                "company_id": cls.company.id,
+                "location_type": "estate",
+            }
+        )
+        cls.afdeling = cls.env["estate.estate"].create(
+            {
+                "name": "Test Afdeling",
+                "code": "TEST-AFD",
+                "parent_id": cls.estate.id,
+                "company_id": cls.company.id,
+                "location_type": "afdeling",
+                "harvest_product_id": cls.harvest_product.id,
+                "harvest_product_uom_id": cls.env.ref("uom.product_uom_kgm").id,
+            }
+        )
+        cls.block = cls._create_block("TEST-BLK-1")
+        cls.harvest_type = cls.env.ref("wi_base_farm.estate_operation_harvest")
+        cls.upkeep_type = cls.env.ref("wi_base_farm.estate_operation_mature")
+
+    @classmethod
+    def _create_block(cls, code):
+        return cls.env["estate.block"].create(
+            {
+                "name": code,
+                "code": code,
+                "estate_id": cls.afdeling.id,
+                "company_id": cls.company.id,
+                "type_id": cls.env.ref("wi_base_farm.estate_type_00").id,
+                "typography_id": cls.env.ref("wi_base_farm.estate_typography_00").id,
+            }
+        )
+
+    @classmethod
+    def _create_employee(cls, name):
+        employee = cls.env["hr.employee"].create(
+            {"name": name, "company_id": cls.company.id}
+        )
+        # the harvest wages are read from the running contract
+        cls.env["hr.contract"].create(
+            {
+                "name": name,
+                "employee_id": employee.id,
+                "company_id": cls.company.id,
+                "wage": 3000000.0,
+                "date_start": date(2025, 1, 1),
+                "state": "open",
+            }
+        )
+        return employee
+
+    @classmethod
+    def _create_operation(cls, operation_type, operation_date, **vals):
+        return cls.env["estate.operation"].create(
+            dict(
+                {
+                    "operation_type_id": operation_type.id,
+                    "operation_date": operation_date,
+                    "afdeling_id": cls.afdeling.id,
+                    "company_id": cls.company.id,
+                },
+                **vals,
+            )
+        )
@@ -0,0 +1,114 @@
+from datetime import date
+
+from odoo.tests import tagged
+
+from .common import EstateCommon
+
+
+@tagged("post_install", "-at_install")
+class TestBlockValue(EstateCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.other_block = cls._create_block("TEST-BLK-2")
+        cls.material = cls.env["product.product"].create(
+            {"name": "Test Fertilizer", "type": "consu", "farm_data": True}
+        )
+        cls.seed_batches = cls.env["estate.seed.batch"].create(
+            [
+                {
+                    "block_id": cls.block.id,
+                    "seed_id": cls.material.id,
+                    "seed_qty": 10,
+                    "planting_date": date(2020, 1, 1),
+                }
+                for _index in range(2)
+            ]
+        )
+
+    def _create_upkeep(self, operation_date, block_amount, other_block_amount):
+        operation = self._create_operation(self.upkeep_type, operation_date)
+        operation.material_line_ids = [
+            (
+                0,
+                0,
+                {
+                    "location_id": block.id,
+                    "product_id": self.material.id,
+                    "product_qty": 2.0,
+                    "product_standard_price": amount / 2,
+                },
+            )
+            for block, amount in (
+                (self.block, block_amount),
+                (self.other_block, other_block_amount),
+            )
+        ]
+        return operation
+
+    def _post(self, operations):
+        operations.action_validate()
+        operations.action_post()
+
+    def _get_month_amount(self, block, month):
+        return sum(
+            self.env["estate.block.value"]
+            .search([("block_id", "=", block.id), ("month", "=", month)])
+            .mapped("amount")
+        )
+
+    def _assert_values(self, block_value, other_block_value, months):
+        self.assertAlmostEqual(self.block.block_value, block_value)
+        self.assertAlmostEqual(self.other_block.block_value, other_block_value)
+        for month, amount in months.items():
+            self.assertAlmostEqual(self._get_month_amount(self.block, month), amount)
+        for batch in self.seed_batches:
+            self.assertAlmostEqual(batch.batch_value, block_value / 2)
+
+    def test_post(self):
+        march = self._create_upkeep(date(2025, 3, 10), 200.0, 50.0)
+        april = self._create_upkeep(date(2025, 4, 2), 100.0, 0.0)
+        self._post(march | april)
+        self._assert_values(
+            300.0, 50.0, {date(2025, 3, 1): 200.0, date(2025, 4, 1): 100.0}
+        )
+        self.assertAlmostEqual(
+            self._get_month_amount(self.other_block, date(2025, 3, 1)), 50.0
+        )
+
+    def test_cancel(self):
+        march = self._create_upkeep(date(2025, 3, 10), 200.0, 50.0)
+        april = self._create_upkeep(date(2025, 4, 2), 100.0, 0.0)
+        self._post(march | april)
+        march.action_cancel()
+        self._assert_values(
+            100.0, 0.0, {date(2025, 3, 1): 0.0, date(2025, 4, 1): 100.0}
+        )
+        # cancelling a draft operation does not remove its cost again
+        draft = self._create_upkeep(date(2025, 3, 11), 30.0, 0.0)
+        draft.action_cancel()
+        self._assert_values(100.0, 0.0, {date(2025, 3, 1): 0.0})
+
+    def test_reset_draft_and_repost(self):
+        operation = self._create_upkeep(date(2025, 3, 10), 200.0, 50.0)
+        self._post(operation)
+        operation.action_reset_draft()
+        self._assert_values(0.0, 0.0, {date(2025, 3, 1): 0.0})
+        self._post(operation)
+        self._assert_values(200.0, 50.0, {date(2025, 3, 1): 200.0})
+
+    def test_rebuild_block_value(self):
+        march = self._create_upkeep(date(2025, 3, 10), 200.0, 50.0)
+        april = self._create_upkeep(date(2025, 4, 2), 100.0, 0.0)
+        self._post(march | april)
+        march.action_reset_draft()
+        blocks = self.block | self.other_block
+        self.assertEqual(blocks._rebuild_block_value(blocks.ids), {})
+        self._assert_values(
+            100.0, 0.0, {date(2025, 3, 1): 0.0, date(2025, 4, 1): 100.0}
+        )
+
+        self.block.block_value = 999.0
+        drift = blocks._rebuild_block_value(blocks.ids)
+        self.assertEqual(drift, {self.block.id: (999.0, 100.0)})
+        self.assertAlmostEqual(self.block.block_value, 100.0)
@@ -0,0 +1,128 @@
+from datetime import date
+
+from odoo.tests import tagged
+
+from .common import EstateCommon
+
+PREMI_FIELDS = (
+    "base_weight",
+    "premi_base_extra",
+    "attendance_premi",
+    "other_harvest_premi",
+    "total_premi",
+)
+
+
+@tagged("post_install", "-at_install")
+class TestPremiBatch(EstateCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.operation_date = date(2025, 3, 10)
+        cls.env["estate.bjr"].create(
+            {
+                "block_id": cls.block.id,
+                "harvesting_date": cls.operation_date,
+                "harvest_qty": 100.0,
+                "harvest_uom_qty": 1000.0,
+            }
+        )
+        cls.premi = cls.env["estate.premi"].create(
+            {
+                "premi_type": "monthly_harvest",
+                "country_id": cls.env.ref("base.id").id,
+                "state_id": cls.env.ref("base.state_id_su").id,
+                "qty_uom": cls.env.ref("uom.product_uom_kgm").id,
+                "estate_block_id": cls.block.id,
+                "start_month": "1",
+                "end_month": "12",
+                "harvest_base_qty": 100.0,
+                "premi_quantifier_ids": [
+                    (
+                        0,
+                        0,
+                        {
+                            "quantifier": 1.0,
+                            "premi_extra": 50.0,
+                            "attendance_premi": 5000.0,
+                        },
+                    ),
+                    (
+                        0,
+                        0,
+                        {
+                            "quantifier": 1.5,
+                            "premi_extra": 80.0,
+                            "attendance_premi": 7000.0,
+                        },
+                    ),
+                ],
+            }
+        )
+        cls.member_a = cls._create_employee("Harvester A")
+        cls.member_b = cls._create_employee("Harvester B")
+        cls.operation = cls._create_operation(cls.harvest_type, cls.operation_date)
+
+    def _create_harvests(self):
+        return self.env["estate.harvest"].create(
+            [
+                {
+                    "estate_operation_id": self.operation.id,
+                    "block_id": self.block.id,
+                    "member_id": member.id,
+                    "harvest_qty_unit": qty_unit,
+                }
+                for member, qty_unit in (
+                    (self.member_a, 12),
+                    (self.member_a, 8),
+                    (self.member_b, 9),
+                )
+            ]
+        )
+
+    def _read_premi(self, harvests):
+        return [
+            {field: harvest[field] for field in PREMI_FIELDS} for harvest in harvests
+        ]
+
+    def test_premi_batch(self):
+        first, second, other = self._create_harvests()
+        self.assertEqual(first.premi_id, self.premi)
+        self.assertEqual(first.harvest_qty_weight, 120.0)
+        # 200 kg harvested by member A earn 50 * 50 + 80 * 50 of step premi,
+        # shared by weight between its two lines
+        self.assertEqual(first.base_weight, 100.0)
+        self.assertAlmostEqual(first.premi_base_extra, 3900.0)
+        self.assertEqual(first.attendance_premi, 7000.0)
+        self.assertAlmostEqual(first.total_premi, 10900.0)
+        # the base weight was reached by the first line of the day
+        self.assertEqual(second.base_weight, 0.0)
+        self.assertEqual(second.base_extra_weight, 80.0)
+        self.assertAlmostEqual(second.premi_base_extra, 2600.0)
+        self.assertEqual(second.attendance_premi, 0.0)
+        self.assertAlmostEqual(second.total_premi, 2600.0)
+        # member B stays under the base weight
+        self.assertEqual(other.base_weight, 100.0)
+        self.assertEqual(other.base_extra_weight, 0.0)
+        self.assertEqual(other.total_premi, 0.0)
+
+    def test_premi_batch_equals_single(self):
+        harvests = self._create_harvests()
+        expected = self._read_premi(harvests)
+        fields_to_compute = [harvests._fields[field] for field in PREMI_FIELDS]
+        for harvest in harvests:
+            for field in fields_to_compute:
+                self.env.add_to_compute(field, harvest)
+            harvest.flush_recordset()
+        self.assertEqual(self._read_premi(harvests), expected)
+
+    def test_activity_map_edited_line(self):
+        first, second, _other = self._create_harvests()
+        edited = second.new({"harvest_qty_unit": 10}, origin=second)
+        lines = edited._get_harvest_activity_map()[edited._get_harvest_activity_key()]
+        # the edited line stands in for its stored version
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0], first)
+        self.assertEqual(lines[1], edited)
+        self.assertTrue(edited._check_attendance_condition())
+        self.assertFalse(first._check_attendance_condition())
@@ -0,0 +1,45 @@
+from datetime import date, datetime
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.wi_base_farm.models.estate_premi import PREMI_CACHE_VERSIONS
+
+
+@tagged("post_install", "-at_install")
+class TestPremiHoliday(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.calendar = cls.env.company.resource_calendar_id
+        cls.holiday_date = date(2031, 8, 17)
+
+    def _commit(self):
+        """Run the hooks of a commit and start a new transaction cache"""
+        self.env.cr.postcommit.run()
+        self.env.cr.precommit.data.pop(PREMI_CACHE_VERSIONS, None)
+
+    def _is_holiday(self):
+        return self.env["estate.premi"]._is_holiday(
+            self.calendar.id, self.holiday_date
+        )
+
+    def test_is_holiday_after_holiday_change(self):
+        self._commit()
+        self.assertFalse(self._is_holiday())
+
+        holiday = self.env["resource.calendar.leaves"].create(
+            {
+                "name": "Test Public Holiday",
+                "calendar_id": self.calendar.id,
+                "date_from": datetime(2031, 8, 17, 0, 0, 0),
+                "date_to": datetime(2031, 8, 17, 23, 59, 59),
+            }
+        )
+        # seen by the transaction that changed it, then by the other workers
+        self.assertTrue(self._is_holiday())
+        self._commit()
+        self.assertTrue(self._is_holiday())
+
+        holiday.unlink()
+        self._commit()
+        self.assertFalse(self._is_holiday())
@@ -0,0 +1,80 @@
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestPremiStepTable(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.condition = cls.env["estate.premi.condition"].create(
+            {
+                "harvest_base_qty": 100.0,
+                "premi_quantifier_ids": [
+                    (0, 0, {"quantifier": 1.0, "premi_extra": 20.0}),
+                    (0, 0, {"quantifier": 5.0, "premi_extra": 35.0}),
+                    (0, 0, {"quantifier": 10.0, "premi_extra": 50.0}),
+                    (0, 0, {"quantifier": 15.0, "premi_extra": 65.0}),
+                ],
+            }
+        )
+        cls.condition.premi_quantifier_ids[0].attendance_premi = 5000.0
+
+    def _walk_steps(self, quantifiers, harvested_qty):
+        """Step premi computed by walking the quantifiers"""
+        premi_rules = quantifiers.filtered(
+            lambda x: x.base_quantifier <= harvested_qty
+        ).sorted("base_quantifier", reverse=True)
+        premi_base_extra = 0
+        for premi in premi_rules:
+            net_weight = max(harvested_qty - premi.base_quantifier, 0)
+            premi_base_extra += premi.premi_extra * net_weight
+            harvested_qty -= net_weight
+        return (
+            premi_base_extra,
+            premi_rules[0].attendance_premi if premi_rules else 0,
+        )
+
+    def _assert_same_as_walk(self, record, quantities):
+        get_step_premi = self.env["estate.premi.quantifier"]._get_step_premi
+        for qty in quantities:
+            premi, attendance = get_step_premi(record.premi_step_table, qty)
+            walk_premi, walk_attendance = self._walk_steps(
+                record.premi_quantifier_ids, qty
+            )
+            self.assertAlmostEqual(premi, walk_premi, places=6, msg=qty)
+            self.assertEqual(attendance, walk_attendance, qty)
+
+    def test_step_table_equals_walk(self):
+        self._assert_same_as_walk(
+            self.condition,
+            [0, 50, 99.99, 100, 250.5, 500, 750, 1000, 1499.9, 1500, 2500],
+        )
+
+    def test_step_table_below_first_base(self):
+        premi = self.env["estate.premi.quantifier"]._get_step_premi(
+            self.condition.premi_step_table, 99.0
+        )
+        self.assertEqual(premi, (0.0, 0.0))
+        self.assertEqual(
+            self.env["estate.premi.quantifier"]._get_step_premi({}, 500.0),
+            (0.0, 0.0),
+        )
+
+    def test_step_table_equal_bases(self):
+        self.condition.premi_quantifier_ids = [
+            (0, 0, {"quantifier": 5.0, "premi_extra": 90.0, "attendance_premi": 1.0})
+        ]
+        self.assertEqual(self.condition.premi_step_table["bases"].count(500.0), 1)
+        self._assert_same_as_walk(self.condition, [499, 500, 750, 1200])
+
+    def test_step_table_rebuilt_on_quantifier_change(self):
+        self.condition.premi_quantifier_ids[1].premi_extra = 40.0
+        self.assertEqual(self.condition.premi_step_table["premi_extra"][1], 40.0)
+        self._assert_same_as_walk(self.condition, [600, 1200, 2000])
+
+    def test_step_table_rebuilt_on_base_weight_change(self):
+        self.condition.harvest_base_qty = 80.0
+        self.assertEqual(
+            self.condition.premi_step_table["bases"], [80.0, 400.0, 800.0, 1200.0]
+        )
+        self._assert_same_as_walk(self.condition, [79, 80, 500, 900, 1300])
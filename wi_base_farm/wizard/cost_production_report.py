@@ -16,237 +16,96 @@ class CostProductionReport(models.TransientModel):
     def print_report(self):
         self.ensure_one()
         localstr = """
+            WITH production AS (
+                SELECT
+                    ehd.block_id AS id,
+                    SUM(ehd.harvest_qty_weight + ehd.other_harvest_stock_qty)
+                        FILTER (WHERE ehd.operation_date = %(op_date)s)
+                    AS production_ttd,
+                    SUM(ehd.harvest_qty_weight + ehd.other_harvest_stock_qty)
+                        FILTER (WHERE ehd.operation_date >= %(month_start)s)
+                    AS production_mtd,
+                    SUM(ehd.harvest_qty_weight + ehd.other_harvest_stock_qty)
+                    AS production_ytd,
+                    SUM(ehd.total_include_penalty)
+                        FILTER (WHERE ehd.operation_date = %(op_date)s)
+                    AS harvest_ttd,
+                    SUM(ehd.total_include_penalty)
+                        FILTER (WHERE ehd.operation_date >= %(month_start)s)
+                    AS harvest_mtd,
+                    SUM(ehd.total_include_penalty) AS harvest_ytd
+                FROM
+                    estate_harvest_daily ehd
+                    JOIN estate_block eb ON ehd.block_id = eb.id
+                    JOIN estate_estate ee ON eb.estate_id = ee.id
+                WHERE
+                    ee.parent_id = %(estate_id)s
+                    AND ehd.operation_date BETWEEN %(year_start)s AND %(op_date)s
+                GROUP BY
+                    ehd.block_id
+            ), upkeeping AS (
+                SELECT
+                    eul.location_id AS id,
+                    SUM(eul.total_amount)
+                        FILTER (WHERE eul.operation_date = %(op_date)s)
+                    AS upkeep_ttd,
+                    SUM(eul.total_amount)
+                        FILTER (WHERE eul.operation_date >= %(month_start)s)
+                    AS upkeep_mtd,
+                    SUM(eul.total_amount) AS upkeep_ytd
+                FROM
+                    estate_upkeep_labour eul
+                    JOIN estate_block eb ON eul.location_id = eb.id
+                    JOIN estate_estate ee ON eb.estate_id = ee.id
+                WHERE
+                    ee.parent_id = %(estate_id)s
+                    AND eul.state IN ('posted', 'done')
+                    AND eul.operation_date BETWEEN %(year_start)s AND %(op_date)s
+                GROUP BY
+                    eul.location_id
+            )
             SELECT
                 eb.code,
                 eb.planting_year,
                 eb.total_area,
                 eps.name AS planting_state,
-                COALESCE(MAX(_data.production_ttd),0) AS production_ttd,
-                COALESCE(MAX(_data.production_mtd),0) AS production_mtd,
-                COALESCE(MAX(_data.production_ytd),0) AS production_ytd,
-                COALESCE(MAX(_data.harvest_ttd),0) AS harvest_ttd,
-                COALESCE(MAX(_data.upkeep_ttd),0) AS upkeep_ttd,
-                COALESCE(MAX(_data.harvest_ttd),0) + COALESCE(MAX(_data.upkeep_ttd),0)
+                COALESCE(production.production_ttd, 0) AS production_ttd,
+                COALESCE(production.production_mtd, 0) AS production_mtd,
+                COALESCE(production.production_ytd, 0) AS production_ytd,
+                COALESCE(production.harvest_ttd, 0) AS harvest_ttd,
+                COALESCE(upkeeping.upkeep_ttd, 0) AS upkeep_ttd,
+                COALESCE(production.harvest_ttd, 0) + COALESCE(upkeeping.upkeep_ttd, 0)
                 AS total_ttd,
-                COALESCE(MAX(_data.harvest_mtd),0) AS harvest_mtd,
-                COALESCE(MAX(_data.upkeep_mtd),0) AS upkeep_mtd,
-                COALESCE(MAX(_data.harvest_mtd),0) + COALESCE(MAX(_data.upkeep_mtd),0)
+                COALESCE(production.harvest_mtd, 0) AS harvest_mtd,
+                COALESCE(upkeeping.upkeep_mtd, 0) AS upkeep_mtd,
+                COALESCE(production.harvest_mtd, 0) + COALESCE(upkeeping.upkeep_mtd, 0)
                 AS total_mtd,
-                COALESCE(MAX(_data.harvest_ytd),0) AS harvest_ytd,
-                COALESCE(MAX(_data.upkeep_ytd),0) AS upkeep_ytd,
-                COALESCE(MAX(_data.harvest_ytd),0) + COALESCE(MAX(_data.upkeep_ytd),0)
+                COALESCE(production.harvest_ytd, 0) AS harvest_ytd,
+                COALESCE(upkeeping.upkeep_ytd, 0) AS upkeep_ytd,
+                COALESCE(production.harvest_ytd, 0) + COALESCE(upkeeping.upkeep_ytd, 0)
                 AS total_ytd
             FROM
                 (
-                    SELECT
-                        COALESCE(production.id, harvesting.id, upkeeping.id) AS id,
-                        production.production_ttd,
-                        production.production_mtd,
-                        production.production_ytd,
-                        harvesting.harvest_ttd,
-                        harvesting.harvest_mtd,
-                        harvesting.harvest_ytd,
-                        upkeeping.upkeep_ttd,
-                        upkeeping.upkeep_mtd,
-                        upkeeping.upkeep_ytd
-                    FROM
-                    (
-                        SELECT
-                            production_year.id,
-                            production_today.production_ttd,
-                            production_month.production_mtd,
-                            production_year.production_ytd
-                        FROM
-                            (
-                                SELECT
-                                    eb.id,
-                                    SUM(harvest_qty_weight + other_harvest_stock_qty)
-                                    AS production_ytd
-                                FROM
-                                    estate_harvest eh
-                                    JOIN estate_block eb ON eh.block_id = eb.id
-                                WHERE
-                                    DATE_TRUNC('year', operation_date) =
-                                    DATE_TRUNC('year', CAST(%(op_date)s as DATE))
-                                    AND operation_date <= CAST(%(op_date)s as DATE)
-			                        AND eh.state in ('posted','done')
-                                GROUP BY
-                                    eb.id
-                            ) production_year
-                            FULL JOIN
-                            (
-                                SELECT
-                                    eb.id,
-                                    SUM(harvest_qty_weight + other_harvest_stock_qty)
-                                    AS production_mtd
-                                FROM
-                                    estate_harvest eh
-                                    JOIN estate_block eb ON eh.block_id = eb.id
-                                WHERE
-                                    DATE_TRUNC('month', operation_date) =
-                                    DATE_TRUNC('month', CAST(%(op_date)s as DATE))
-                                    AND operation_date <= CAST(%(op_date)s as DATE)
-			                        AND eh.state in ('posted','done')
-                                GROUP BY
-                                    eb.id
-                            ) production_month
-                            ON production_year.id = production_month.id
-                            FULL JOIN
-                            (
-                                SELECT
-                                    eb.id,
-                                    SUM(harvest_qty_weight + other_harvest_stock_qty)
-                                    AS production_ttd
-                                FROM
-                                    estate_harvest eh
-                                    JOIN estate_block eb ON eh.block_id = eb.id
-                                WHERE
-                                    DATE_TRUNC('day', operation_date) =
-                                    DATE_TRUNC('day', CAST(%(op_date)s as DATE))
-                                    AND operation_date <= CAST(%(op_date)s as DATE)
-			                        AND eh.state in ('posted','done')
-                                GROUP BY
-                                    eb.id
-                            ) production_today
-                            ON production_year.id = production_today.id
-                    ) production
-                    FULL JOIN
-                    (
-                        SELECT
-                            harvest_year.id,
-                            harvest_today.harvest_ttd,
-                            harvest_month.harvest_mtd,
-                            harvest_year.harvest_ytd
-                        FROM
-                            (
-                                SELECT
-                                    eb.id,
-                                    SUM(total_include_penalty) AS harvest_ytd
-                                FROM
-                                    estate_harvest eh
-                                    JOIN estate_block eb ON eh.block_id = eb.id
-                                WHERE
-                                    DATE_TRUNC('year', operation_date) =
-                                    DATE_TRUNC('year', CAST(%(op_date)s as DATE))
-                                    AND operation_date <= CAST(%(op_date)s as DATE)
-			                        AND eh.state in ('posted','done')
-                                GROUP BY
-                                    eb.id
-                            ) harvest_year
-                            FULL JOIN
-                            (
-                                SELECT
-                                    eb.id,
-                                    SUM(total_include_penalty) AS harvest_mtd
-                                FROM
-                                    estate_harvest eh
-                                    JOIN estate_block eb ON eh.block_id = eb.id
-                                WHERE
-                                    DATE_TRUNC('month', operation_date) =
-                                    DATE_TRUNC('month', CAST(%(op_date)s as DATE))
-                                    AND operation_date <= CAST(%(op_date)s as DATE)
-			                        AND eh.state in ('posted','done')
-                                GROUP BY
-                                    eb.id
-                            ) harvest_month
-                            ON harvest_year.id = harvest_month.id
-                            FULL JOIN
-                            (
-                                SELECT
-                                    eb.id,
-                                    SUM(total_include_penalty) AS harvest_ttd
-                                FROM
-                                    estate_harvest eh
-                                    JOIN estate_block eb ON eh.block_id = eb.id
-                                WHERE
-                                    DATE_TRUNC('day', operation_date) =
-                                    DATE_TRUNC('day', CAST(%(op_date)s as DATE))
-                                    AND operation_date <= CAST(%(op_date)s as DATE)
-			                        AND eh.state in ('posted','done')
-                                GROUP BY
-                                    eb.id
-                            ) harvest_today
-                            ON harvest_year.id = harvest_today.id
-                    ) harvesting
-                    ON production.id = harvesting.id
-                    FULL JOIN
-                    (
-                        SELECT
-                            upkeep_year.id,
-                            upkeep_today.upkeep_ttd,
-                            upkeep_month.upkeep_mtd,
-                            upkeep_year.upkeep_ytd
-                        FROM
-                            (
-                                SELECT
-                                    eb.id,
-                                    SUM(total_amount) AS upkeep_ytd
-                                FROM
-                                    estate_upkeep_labour eul
-                                    JOIN estate_block eb ON eul.location_id = eb.id
-                                WHERE
-                                    DATE_TRUNC('year', operation_date) =
-                                    DATE_TRUNC('year', CAST(%(op_date)s as DATE))
-                                    AND operation_date <= CAST(%(op_date)s as DATE)
-			                        AND eul.state in ('posted','done')
-                                GROUP BY
-                                    eb.id
-                            ) upkeep_year
-                            FULL JOIN
-                            (
-                                SELECT
-                                    eb.id,
-                                    SUM(total_amount) AS upkeep_mtd
-                                FROM
-                                    estate_upkeep_labour eul
-                                    JOIN estate_block eb ON eul.location_id = eb.id
-                                WHERE
-                                    DATE_TRUNC('month', operation_date) =
-                                    DATE_TRUNC('month', CAST(%(op_date)s as DATE))
-                                    AND operation_date <= CAST(%(op_date)s as DATE)
-			                        AND eul.state in ('posted','done')
-                                GROUP BY
-                                    eb.id
-                            ) upkeep_month
-                            ON upkeep_year.id = upkeep_month.id
-                            FULL JOIN
-                            (
-                                SELECT
-                                    eb.id,
-                                    SUM(total_amount) AS upkeep_ttd
-                                FROM
-                                    estate_upkeep_labour eul
-                                    JOIN estate_block eb ON eul.location_id = eb.id
-                                WHERE
-                                    DATE_TRUNC('day', operation_date) =
-                                    DATE_TRUNC('day', CAST(%(op_date)s as DATE))
-                                    AND operation_date <= CAST(%(op_date)s as DATE)
-			                        AND eul.state in ('posted','done')
-                                GROUP BY
-                                    eb.id
-                            ) upkeep_today
-                            ON upkeep_year.id = upkeep_today.id
-                    ) upkeeping
-                ON production.id = upkeeping.id) _data
-                LEFT JOIN estate_block eb ON eb.id = _data.id
-                LEFT JOIN estate_estate ee ON eb.estate_id = ee.id
+                    SELECT id FROM production
+                    UNION
+                    SELECT id FROM upkeeping
+                ) _data
+                JOIN estate_block eb ON eb.id = _data.id
+                JOIN estate_estate ee ON eb.estate_id = ee.id
                 LEFT JOIN estate_planting_state eps ON eb.planting_state_id = eps.id
-                LEFT JOIN estate_harvest eh ON eb.id = eh.block_id
-                LEFT JOIN estate_upkeep_labour eul ON eb.id = eul.location_id
-            WHERE
-                ee.parent_id = %(estate_id)s
-            GROUP BY
-                eb.id,
-                ee.id,
-                eps.id
+                LEFT JOIN production ON production.id = eb.id
+                LEFT JOIN upkeeping ON upkeeping.id = eb.id
             ORDER BY
                 ee.id
         """
 
+        self.env["estate.upkeep.labour"].flush_model()
         self.env.cr.execute(
             localstr,
             {
-                "op_date": self.date.strftime("%Y-%m-%d"),
+                "op_date": self.date,
+                "month_start": self.date.replace(day=1),
+                "year_start": self.date.replace(month=1, day=1),
                 "estate_id": self.estate_id.id,
             },
         )
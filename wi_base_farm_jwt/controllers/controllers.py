@@ -1,4 +1,7 @@
-from odoo.http import request, route
+import base64
+
+from odoo.http import Response, request, route
+from odoo.tools.mimetypes import guess_mimetype
 
 from odoo.addons.wi_base_auth_jwt.controllers.base import BaseController
 
@@ -10,6 +13,12 @@ API_ENDPOINTS = {
             "get_employee_data",
             "Success Get Employee Data",
         ),
+        (
+            "/api/farm/employee/image",
+            "hr.employee",
+            "get_employee_image_data",
+            "Success Get Employee Image Data",
+        ),
         (
             "/api/farm/partners",
             "res.partner",
@@ -91,6 +100,8 @@ API_ENDPOINTS = {
     ],
 }
 
+IMAGE_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+
 
 def generate_api_path_data(method):
     if method in ["POST", "PUT"]:
@@ -128,7 +139,43 @@ class FarmController(BaseController):
         methods=["GET", "OPTIONS"],
     )
     def get_employee_data(self):
-        return self.get_api_data(request)
+        return self.get_api_data(request, since=request.params.get("since"))
+
+    @route(
+        "/api/farm/employee/image",
+        type="http",
+        auth="jwt_farm",
+        csrf=False,
+        cors="*",
+        save_session=False,
+        methods=["GET", "OPTIONS"],
+    )
+    def get_employee_image_data(self):
+        return self.get_api_data(request, params=request.params.get("ids"))
+
+    @route(
+        "/api/farm/employee/image/<int:employee_id>",
+        type="http",
+        auth="jwt_farm",
+        csrf=False,
+        cors="*",
+        save_session=False,
+        methods=["GET", "OPTIONS"],
+    )
+    def get_employee_image(self, employee_id):
+        employee = request.env["hr.employee"]._get_api_employee_image(
+            employee_id, company=getattr(request, "jwt_company_id", None)
+        )
+        if not employee:
+            return Response(status=404)
+        headers = [
+            ("ETag", f'"{employee.farm_image_checksum}"'),
+            ("Cache-Control", f"private, max-age={IMAGE_CACHE_MAX_AGE}"),
+        ]
+        if request.httprequest.if_none_match.contains(employee.farm_image_checksum):
+            return Response(status=304, headers=headers)
+        image = base64.b64decode(employee.image_128)
+        return Response(image, content_type=guess_mimetype(image), headers=headers)
 
     @route(
         "/api/farm/partners",
@@ -140,7 +187,7 @@ class FarmController(BaseController):
         methods=["GET", "OPTIONS"],
     )
     def get_farm_partner_data(self):
-        return self.get_api_data(request)
+        return self.get_api_data(request, since=request.params.get("since"))
 
     @route(
         "/api/farm/estate",
@@ -152,7 +199,7 @@ class FarmController(BaseController):
         methods=["GET", "OPTIONS"],
     )
     def get_estate_data(self):
-        return self.get_api_data(request)
+        return self.get_api_data(request, since=request.params.get("since"))
 
     @route(
         "/api/farm/afdeling",
@@ -164,7 +211,7 @@ class FarmController(BaseController):
         methods=["GET", "OPTIONS"],
     )
     def get_afdeling_data(self):
-        return self.get_api_data(request)
+        return self.get_api_data(request, since=request.params.get("since"))
 
     @route(
         "/api/farm/block",
@@ -176,7 +223,7 @@ class FarmController(BaseController):
         methods=["GET", "OPTIONS"],
     )
     def get_block_data(self):
-        return self.get_api_data(request)
+        return self.get_api_data(request, since=request.params.get("since"))
 
     @route(
         "/api/farm/product/category",
@@ -188,7 +235,7 @@ class FarmController(BaseController):
         methods=["GET", "OPTIONS"],
     )
     def get_product_category_data(self):
-        return self.get_api_data(request)
+        return self.get_api_data(request, since=request.params.get("since"))
 
     @route(
         "/api/farm/product/items",
@@ -200,7 +247,7 @@ class FarmController(BaseController):
         methods=["GET", "OPTIONS"],
     )
     def get_product_data(self):
-        return self.get_api_data(request)
+        return self.get_api_data(request, since=request.params.get("since"))
 
     @route(
         "/api/farm/penalty",
@@ -212,7 +259,7 @@ class FarmController(BaseController):
         methods=["GET", "OPTIONS"],
     )
     def get_penalty_data(self):
-        return self.get_api_data(request)
+        return self.get_api_data(request, since=request.params.get("since"))
 
     @route(
         "/api/farm/activity",
@@ -224,7 +271,7 @@ class FarmController(BaseController):
         methods=["GET", "OPTIONS"],
     )
     def get_activity_data(self):
-        return self.get_api_data(request)
+        return self.get_api_data(request, since=request.params.get("since"))
 
     @route(
         "/api/farm/teams",
@@ -236,7 +283,7 @@ class FarmController(BaseController):
         methods=["GET", "OPTIONS"],
     )
     def get_team_data(self):
-        return self.get_api_data(request)
+        return self.get_api_data(request, since=request.params.get("since"))
 
     @route(
         "/api/farm/users",
@@ -248,7 +295,7 @@ class FarmController(BaseController):
         methods=["GET", "OPTIONS"],
     )
     def get_users_data(self):
-        return self.get_api_data(request)
+        return self.get_api_data(request, since=request.params.get("since"))
 
     @route(
         "/api/farm/operation_type",
@@ -260,7 +307,7 @@ class FarmController(BaseController):
         methods=["GET", "OPTIONS"],
     )
     def get_operation_type_data(self):
-        return self.get_api_data(request)
+        return self.get_api_data(request, since=request.params.get("since"))
 
     @route(
         "/api/farm/planning/harvest",
@@ -1,3 +1,4 @@
+from . import farm_api_sync
 from . import farm_product
 from . import estate_estate
 from . import estate_block
@@ -2,17 +2,25 @@ from odoo import models
 
 
 class EstateActivityPenalty(models.Model):
-    _inherit = "estate.activity.penalty"
+    _name = "estate.activity.penalty"
+    _inherit = ["estate.activity.penalty", "farm.api.sync.mixin"]
 
     def get_api_domain(self):
         return [("active", "=", True)]
 
-    def get_penalty_data(self, company=None):
+    def _get_api_tombstone_domain(self):
+        return self.get_api_domain()
+
+    def get_penalty_data(self, company=None, since=None):
         res = []
         domain = self.get_api_domain()
         if company:
             domain.append(("company_id", "=", company))
-        data = self.sudo().with_company(company).search(domain)
+        if since:
+            return self.with_company(company)._get_api_sync_data(
+                domain, since, self._prepare_data_penalty, company
+            )
+        data = self.sudo().with_company(company).search(domain)._api_paginate()
         if data:
             for penalty in data:
                 res.append(self._prepare_data_penalty(penalty))
@@ -27,7 +35,8 @@ class EstateActivityPenalty(models.Model):
 
 
 class AccountAnalyticAccount(models.Model):
-    _inherit = "account.analytic.account"
+    _name = "account.analytic.account"
+    _inherit = ["account.analytic.account", "farm.api.sync.mixin"]
 
     def get_api_domain(self):
         return [
@@ -39,12 +48,19 @@ class AccountAnalyticAccount(models.Model):
             ("active", "=", True),
         ]
 
-    def get_activity_data(self, company=None):
+    def _get_api_tombstone_domain(self):
+        return self.get_api_domain()
+
+    def get_activity_data(self, company=None, since=None):
         res = []
         domain = self.get_api_domain()
         if company:
             domain.append(("company_id", "=", company))
-        data = self.sudo().with_company(company).search(domain)
+        if since:
+            return self.with_company(company)._get_api_sync_data(
+                domain, since, self._prepare_data_activity, company
+            )
+        data = self.sudo().with_company(company).search(domain)._api_paginate()
         if data:
             for activity in data:
                 res.append(self._prepare_data_activity(activity))
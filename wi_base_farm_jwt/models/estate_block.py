@@ -2,17 +2,25 @@ from odoo import models
 
 
 class EstateBlock(models.Model):
-    _inherit = "estate.block"
+    _name = "estate.block"
+    _inherit = ["estate.block", "farm.api.sync.mixin"]
 
     def get_api_domain(self):
         return [("active", "=", True)]
 
-    def get_block_data(self, company=None):
+    def _get_api_tombstone_domain(self):
+        return self.get_api_domain()
+
+    def get_block_data(self, company=None, since=None):
         res = []
         domain = self.get_api_domain()
         if company:
             domain.append(("company_id", "=", company))
-        data = self.sudo().with_company(company).search(domain)
+        if since:
+            return self.with_company(company)._get_api_sync_data(
+                domain, since, self._prepare_data_block, company
+            )
+        data = self.sudo().with_company(company).search(domain)._api_paginate()
         if data:
             for block in data:
                 res.append(self._prepare_data_block(block))
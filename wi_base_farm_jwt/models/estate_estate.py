@@ -1,50 +1,71 @@
 from odoo import models
+from odoo.osv import expression
 
 
 class EstateEstate(models.Model):
-    _inherit = "estate.estate"
+    _name = "estate.estate"
+    _inherit = ["estate.estate", "farm.api.sync.mixin"]
 
     def get_api_domain(self, params=None):
         domain = [("location_type", "=", params), ("active", "=", True)]
         return domain
 
-    def get_estate_data(self, company=None):
+    def _get_api_tombstone_domain(self):
+        return expression.OR(
+            [self.get_api_domain("estate"), self.get_api_domain("afdeling")]
+        )
+
+    def get_estate_data(self, company=None, since=None):
         res = []
         domain = self.get_api_domain("estate")
         if company:
             domain.append(("company_id", "=", company))
-        data = self.sudo().with_company(company).search(domain)
+        if since:
+            return self.with_company(company)._get_api_sync_data(
+                domain, since, self._prepare_data_estate, company
+            )
+        data = self.sudo().with_company(company).search(domain)._api_paginate()
         if data:
             for estate in data:
-                response = self._prepare_data_response(estate)
-                response.update(
-                    {
-                        "company_partner_id": estate.company_id.partner_id.id or 0,
-                        "company_id": estate.company_id.id or 0,
-                        "partner_id": estate.partner_id.id or 0,
-                    }
-                )
-                res.append(response)
+                res.append(self._prepare_data_estate(estate))
         return res
 
-    def get_afdeling_data(self, company=None):
+    def get_afdeling_data(self, company=None, since=None):
         res = []
         domain = self.get_api_domain("afdeling")
         if company:
             domain.append(("company_id", "=", company))
-        data = self.sudo().with_company(company).search(domain)
+        if since:
+            return self.with_company(company)._get_api_sync_data(
+                domain, since, self._prepare_data_afdeling, company
+            )
+        data = self.sudo().with_company(company).search(domain)._api_paginate()
         if data:
             for estate in data:
-                response = self._prepare_data_response(estate)
-                response.update(
-                    {
-                        "estate_id": estate.parent_id.id or 0,
-                        "partner_id": estate.partner_id.id or 0,
-                    }
-                )
-                res.append(response)
+                res.append(self._prepare_data_afdeling(estate))
         return res
 
+    def _prepare_data_estate(self, data):
+        response = self._prepare_data_response(data)
+        response.update(
+            {
+                "company_partner_id": data.company_id.partner_id.id or 0,
+                "company_id": data.company_id.id or 0,
+                "partner_id": data.partner_id.id or 0,
+            }
+        )
+        return response
+
+    def _prepare_data_afdeling(self, data):
+        response = self._prepare_data_response(data)
+        response.update(
+            {
+                "estate_id": data.parent_id.id or 0,
+                "partner_id": data.partner_id.id or 0,
+            }
+        )
+        return response
+
     def _prepare_data_response(self, data):
         return {
             "id": data.id,
@@ -2,18 +2,26 @@ from odoo import models
 
 
 class HarvestTeam(models.Model):
-    _inherit = "estate.harvest.team"
+    _name = "estate.harvest.team"
+    _inherit = ["estate.harvest.team", "farm.api.sync.mixin"]
 
     def get_api_domain(self):
         domain = [("active", "=", True)]
         return domain
 
-    def get_team_data(self, company=None):
+    def _get_api_tombstone_domain(self):
+        return self.get_api_domain()
+
+    def get_team_data(self, company=None, since=None):
         res = []
         domain = self.get_api_domain()
         if company:
             domain.append(("company_id", "=", company))
-        data = self.sudo().with_company(company).search(domain)
+        if since:
+            return self.with_company(company)._get_api_sync_data(
+                domain, since, self._prepare_data_response, company
+            )
+        data = self.sudo().with_company(company).search(domain)._api_paginate()
         if data:
             for team in data:
                 res.append(self._prepare_data_response(team))
@@ -383,7 +383,7 @@ class EstateOperation(models.Model):
         current_user = self.env.user
         domain.append(("assigned_to", "in", [current_user.id]))
 
-        records = self.sudo().search(domain)
+        records = self.sudo().search(domain)._api_paginate()
 
         for rec in records:
             res.append(self._prepare_data_harvest(rec))
@@ -400,7 +400,7 @@ class EstateOperation(models.Model):
         current_user = self.env.user
         domain.append(("assigned_to", "in", [current_user.id]))
 
-        records = self.sudo().search(domain)
+        records = self.sudo().search(domain)._api_paginate()
 
         for rec in records:
             res.append(self._prepare_data_upkeep(rec))
@@ -474,15 +474,23 @@ class EstateOperation(models.Model):
 
 
 class OperationType(models.Model):
-    _inherit = "estate.operation.type"
+    _name = "estate.operation.type"
+    _inherit = ["estate.operation.type", "farm.api.sync.mixin"]
 
     def get_api_domain(self):
         return [("active", "=", True)]
 
-    def get_operation_type_data(self, company=None):
+    def _get_api_tombstone_domain(self):
+        return self.get_api_domain()
+
+    def get_operation_type_data(self, company=None, since=None):
         res = []
         domain = self.get_api_domain()
-        data = self.sudo().search(domain)
+        if since:
+            return self._get_api_sync_data(
+                domain, since, self._prepare_operation_type_data
+            )
+        data = self.sudo().search(domain)._api_paginate()
         if data:
             for op_type in data:
                 res.append(self._prepare_operation_type_data(op_type))
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+# Records written by transactions that were still running when a cursor was
+# issued carry a write_date older than the cursor, re-send that window.
+SYNC_CURSOR_OVERLAP = timedelta(minutes=5)
+
+
+class FarmApiSyncMixin(models.AbstractModel):
+    _name = "farm.api.sync.mixin"
+    _description = "Farm API Incremental Sync Mixin"
+
+    # Searched by the incremental sync with ``write_date >= since``
+    write_date = fields.Datetime(index=True)
+
+    def _get_api_sync_scope(self, company=None):
+        if company and "company_id" in self._fields:
+            return [("company_id", "in", [company, False])]
+        return []
+
+    def _get_api_sync_data(self, domain, since, prepare_func, company=None):
+        """Return the records changed after the ``since`` cursor.
+
+        Changed records still matching ``domain`` are serialized with
+        ``prepare_func``, the ones archived or moved out of the API domain and
+        the deleted ones are returned as tombstones in ``deleted``.
+        """
+        cursor = self.env.cr.now()
+        since = fields.Datetime.to_datetime(since) - SYNC_CURSOR_OVERLAP
+        changed = (
+            self.sudo()
+            .with_context(active_test=False)
+            .search(
+                self._get_api_sync_scope(company) + [("write_date", ">=", since)]
+            )
+        )
+        records = changed.filtered_domain(domain)
+        deleted = self.env["farm.api.tombstone"].sudo()._get_deleted_ids(
+            self._name, since
+        )
+        return {
+            "cursor": fields.Datetime.to_string(cursor),
+            "records": [prepare_func(record) for record in records],
+            "deleted": (changed - records).ids + deleted,
+        }
+
+    def _get_api_tombstone_domain(self):
+        """Domain of the records served by the API endpoints of the model,
+        only their deletion is recorded in a tombstone. The other ones were
+        never sent, or were already returned as deleted when they left the
+        API domain."""
+        return []
+
+    def unlink(self):
+        synced = (
+            self.sudo()
+            .with_context(active_test=False)
+            .filtered_domain(self._get_api_tombstone_domain())
+        )
+        if synced:
+            self.env["farm.api.tombstone"].sudo().create(
+                [{"res_model": self._name, "res_id": res_id} for res_id in synced.ids]
+            )
+        return super().unlink()
+
+
+class FarmApiTombstone(models.Model):
+    _name = "farm.api.tombstone"
+    _description = "Farm API Deleted Record"
+    _order = "id desc"
+    _log_access = False
+
+    res_model = fields.Char(required=True, index=True)
+    res_id = fields.Integer(required=True)
+    deleted_date = fields.Datetime(
+        required=True, index=True, default=fields.Datetime.now
+    )
+
+    @api.model
+    def _get_deleted_ids(self, res_model, since):
+        tombstones = self.search(
+            [("res_model", "=", res_model), ("deleted_date", ">=", since)]
+        )
+        return list(set(tombstones.mapped("res_id")))
+
+    @api.autovacuum
+    def _gc_tombstone(self):
+        limit_date = fields.Datetime.subtract(fields.Datetime.now(), days=90)
+        self.search([("deleted_date", "<", limit_date)]).unlink()
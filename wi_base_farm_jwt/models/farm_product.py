@@ -2,15 +2,23 @@ from odoo import models
 
 
 class ProductCategory(models.Model):
-    _inherit = "product.category"
+    _name = "product.category"
+    _inherit = ["product.category", "farm.api.sync.mixin"]
 
     def get_farm_api_domain(self):
         return [("farm_data", "=", True)]
 
-    def get_farm_product_category_data(self, company=None):
+    def _get_api_tombstone_domain(self):
+        return self.get_farm_api_domain()
+
+    def get_farm_product_category_data(self, company=None, since=None):
         res = []
         domain = self.get_farm_api_domain()
-        data = self.sudo().with_company(company).search(domain)
+        if since:
+            return self.with_company(company)._get_api_sync_data(
+                domain, since, self._prepare_data_category
+            )
+        data = self.sudo().with_company(company).search(domain)._api_paginate()
         if data:
             for category in data:
                 res.append(self._prepare_data_category(category))
@@ -27,12 +35,16 @@ class ProductCategory(models.Model):
 
 
 class ProductProduct(models.Model):
-    _inherit = "product.product"
+    _name = "product.product"
+    _inherit = ["product.product", "farm.api.sync.mixin"]
 
     def get_farm_api_domain(self):
         return [("farm_data", "=", True), ("active", "=", True)]
 
-    def get_farm_product_data(self, company=None):
+    def _get_api_tombstone_domain(self):
+        return self.get_farm_api_domain()
+
+    def get_farm_product_data(self, company=None, since=None):
         res = []
         domain = self.get_farm_api_domain()
         if company:
@@ -42,7 +54,11 @@ class ProductProduct(models.Model):
                 ("company_id", "=", company),
             ]
             domain.extend(company_domain)
-        data = self.sudo().with_company(company).search(domain)
+        if since:
+            return self.with_company(company)._get_api_sync_data(
+                domain, since, self._prepare_data_product, company
+            )
+        data = self.sudo().with_company(company).search(domain)._api_paginate()
         if data:
             for product in data:
                 res.append(self._prepare_data_product(product))
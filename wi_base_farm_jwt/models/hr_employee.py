@@ -1,27 +1,85 @@
 import base64
+import hashlib
 
-from odoo import models
+from odoo import api, fields, models
 
 
 class HrEmployee(models.Model):
-    _inherit = "hr.employee"
+    _name = "hr.employee"
+    _inherit = ["hr.employee", "farm.api.sync.mixin"]
+
+    farm_image_is_svg = fields.Boolean(
+        compute="_compute_farm_image",
+        store=True,
+        help="The employee image is the generated SVG placeholder",
+    )
+    farm_image_checksum = fields.Char(
+        compute="_compute_farm_image",
+        store=True,
+        help="Checksum of the image served to the farm mobile application",
+    )
+
+    @api.depends("image_128")
+    def _compute_farm_image(self):
+        for employee in self:
+            image = employee.image_128
+            is_image = bool(image) and self._check_image(image)
+            employee.farm_image_is_svg = bool(image) and not is_image
+            employee.farm_image_checksum = (
+                hashlib.sha1(base64.b64decode(image)).hexdigest() if is_image else False
+            )
 
     def get_api_domain(self):
         return [("job_id.farm_data", "=", True), ("active", "=", True)]
 
-    def get_employee_data(self, company=None):
+    def _get_api_tombstone_domain(self):
+        return self.get_api_domain()
+
+    def get_employee_data(self, company=None, since=None):
         res = []
         domain = self.get_api_domain()
         if company:
             domain.append(("company_id", "=", company))
-        data = self.sudo().with_company(company).search(domain)
+        if since:
+            return self.with_company(company)._get_api_sync_data(
+                domain, since, self._prepare_data_employee, company
+            )
+        data = self.sudo().with_company(company).search(domain)._api_paginate()
         if data:
             for employee in data:
                 res.append(self._prepare_data_employee(employee))
         return res
 
+    def get_employee_image_data(self, company=None, params=None):
+        res = []
+        domain = self.get_api_domain() + [("farm_image_checksum", "!=", False)]
+        if company:
+            domain.append(("company_id", "=", company))
+        if params:
+            ids = [int(res_id) for res_id in params.split(",") if res_id.isdigit()]
+            domain.append(("id", "in", ids))
+        data = self.sudo().with_company(company).search(domain)._api_paginate()
+        if data:
+            for employee in data:
+                res.append(
+                    {
+                        "id": employee.id,
+                        "image_checksum": employee.farm_image_checksum,
+                        "profile_image": employee.image_128.decode("utf-8"),
+                    }
+                )
+        return res
+
+    def _get_api_employee_image(self, employee_id, company=None):
+        domain = self.get_api_domain() + [
+            ("id", "=", employee_id),
+            ("farm_image_checksum", "!=", False),
+        ]
+        if company:
+            domain.append(("company_id", "=", company))
+        return self.sudo().search(domain, limit=1)
+
     def _prepare_data_employee(self, data):
-        is_image = self._check_image(data.image_128)
         return {
             "id": data.id,
             "name": data.name,
@@ -30,7 +88,10 @@ class HrEmployee(models.Model):
             "position": data.job_id.name or "",
             "department": data.department_id.id or 0,
             "company_id": data.company_id.id,
-            "profile_image": str(data.image_128.decode("utf-8")) if is_image else "",
+            "image_checksum": data.farm_image_checksum or "",
+            "image_url": f"/api/farm/employee/image/{data.id}"
+            if data.farm_image_checksum
+            else "",
         }
 
     def _check_image(self, image):
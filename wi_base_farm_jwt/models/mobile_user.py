@@ -6,7 +6,8 @@ CUSTOM_ROUNDS = 25000
 
 
 class ResUsers(models.Model):
-    _inherit = "res.users"
+    _name = "res.users"
+    _inherit = ["res.users", "farm.api.sync.mixin"]
 
     mobile_user = fields.Boolean(default=False)
 
@@ -42,17 +43,27 @@ class ResUsers(models.Model):
     def get_api_domain(self):
         return [("active", "=", True), ("mobile_user", "=", True)]
 
-    def get_users_data(self, company=None):
+    def _get_api_tombstone_domain(self):
+        return self.get_api_domain()
+
+    def get_users_data(self, company=None, since=None):
         res = []
         domain = self.get_api_domain()
         if company:
             domain.append(("company_ids", "in", company))
-        data = self.sudo().with_company(company).search(domain)
+        if since:
+            return self.with_company(company)._get_api_sync_data(
+                domain, since, self._prepare_data_user, company
+            )
+        data = self.sudo().with_company(company).search(domain)._api_paginate()
         if data:
             for user in data:
                 res.append(self._prepare_data_user(user))
         return res
 
+    def _get_api_sync_scope(self, company=None):
+        return [("company_ids", "in", company)] if company else []
+
     def _prepare_data_user(self, data):
         password_query = """
                             SELECT password FROM res_users
@@ -2,12 +2,16 @@ from odoo import models
 
 
 class ResPartner(models.Model):
-    _inherit = "res.partner"
+    _name = "res.partner"
+    _inherit = ["res.partner", "farm.api.sync.mixin"]
 
     def get_farm_api_domain(self):
         return [("farm_data", "=", True), ("active", "=", True)]
 
-    def get_farm_partner_data(self, company=None):
+    def _get_api_tombstone_domain(self):
+        return self.get_farm_api_domain()
+
+    def get_farm_partner_data(self, company=None, since=None):
         res = []
         domain = self.get_farm_api_domain()
         if company:
@@ -17,7 +21,11 @@ class ResPartner(models.Model):
                 ("company_id", "=", company),
             ]
             domain.extend(company_domain)
-        data = self.sudo().with_company(company).search(domain)
+        if since:
+            return self.with_company(company)._get_api_sync_data(
+                domain, since, self._prepare_farm_data_partner, company
+            )
+        data = self.sudo().with_company(company).search(domain)._api_paginate()
         if data:
             for partner in data:
                 res.append(self._prepare_farm_data_partner(partner))
@@ -17,6 +17,7 @@
         "report/picking_report_view.xml",
         "report/monitoring_bjr_report.xml",
         "wizard/monitoring_bjr_report_view.xml",
+        "wizard/estate_bjr_recompute_wizard_view.xml",
         "views/estate_restan_view.xml",
         "views/estate_picking_view.xml",
         "views/res_config_settings_view.xml",
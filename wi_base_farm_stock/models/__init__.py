@@ -1,4 +1,5 @@
 from . import estate_harvest
+from . import estate_harvest_daily
 from . import estate_picking
 from . import stock_move
 from . import estate_restan_logs
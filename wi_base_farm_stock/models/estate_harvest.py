@@ -17,3 +17,11 @@ class EstateHarvest(models.Model):
     restan_log_id = fields.One2many(
         "estate.restan.log", "harvest_id", string="Restan Logs"
     )
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "picking_id" in vals:
+            self.filtered(
+                lambda h: h.state in ("posted", "done")
+            )._refresh_harvest_daily()
+        return res
@@ -0,0 +1,32 @@
+from odoo import fields, models
+
+
+class EstateHarvestDaily(models.Model):
+    _inherit = "estate.harvest.daily"
+
+    picked_harvest_qty_unit = fields.Float(readonly=True)
+    picked_other_harvest_qty = fields.Float(readonly=True)
+
+    def init(self):
+        super().init()
+        self.env.cr.execute(
+            """
+            SELECT 1 FROM estate_harvest_daily
+            WHERE picked_harvest_qty_unit IS NULL
+            LIMIT 1
+            """
+        )
+        if self.env.cr.rowcount:
+            self._refresh()
+
+    def _get_daily_aggregates(self):
+        res = super()._get_daily_aggregates()
+        res.update(
+            {
+                "picked_harvest_qty_unit": """SUM(CASE WHEN eh.picking_id IS NOT NULL
+                    THEN eh.harvest_qty_unit ELSE 0 END)""",
+                "picked_other_harvest_qty": """SUM(CASE WHEN eh.picking_id IS NOT NULL
+                    THEN eh.other_harvest_qty ELSE 0 END)""",
+            }
+        )
+        return res
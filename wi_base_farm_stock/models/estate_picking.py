@@ -1,3 +1,6 @@
+import logging
+from collections import defaultdict
+
 from odoo import Command, _, api, fields, models
 from odoo.tools.mail import html2plaintext, is_html_empty
 
@@ -8,6 +11,9 @@ PICKING_STATE = [
     ("locked", "Locked"),
     ("cancel", "Cancelled"),
 ]
+BJR_DESCRIPTION = "Automatic Generate by System based on Harvest"
+
+_logger = logging.getLogger(__name__)
 
 
 class EstatePicking(models.Model):
@@ -205,174 +211,251 @@ class EstatePicking(models.Model):
     def action_compute_average_weight(self):
         # Get the operation date and afdeling IDs
         operation_date = self.harvest_ids.mapped("estate_operation_id.operation_date")
-        afdeling_ids = self.estate_ids.ids
-
-        for date in operation_date:
-            # Filter operations based on operation date and afdeling IDs
-            operation_ids = (
-                self.env["estate.operation"]
-                .sudo()
-                .search(
-                    [
-                        ("operation_date", "=", date),
-                        ("afdeling_id", "in", afdeling_ids),
-                    ]
-                )
-            )
-
-            # Get harvest and picking IDs from filtered operations
-            harvest_ids = operation_ids.mapped("estate_harvest_ids").filtered(
-                lambda h: not h.picking_id.exclude_from_bjr
-            )
-            picking_ids = harvest_ids.mapped("picking_id")
+        self._recompute_average_weight(operation_date, self.estate_ids.ids)
 
-            # Compute harvest average weight
-            self._compute_harvest_average_weight(picking_ids, harvest_ids, date)
-
-            # Compute harvest average weight for excluded pickings if any
-            exclude_picking_ids = picking_ids.filtered(lambda x: x.exclude_from_bjr)
-            if exclude_picking_ids:
-                exclude_harvest_ids = exclude_picking_ids.mapped("harvest_ids")
-                self._compute_harvest_average_weight(
-                    exclude_picking_ids, exclude_harvest_ids, date, excluded=False
-                )
-
-    def _compute_harvest_average_weight(
-        self, picking_ids, harvest_ids, operation_date, excluded=True
-    ):
-        block_data = {
-            x.id: {
-                "main_product_id": x.estate_id.harvest_product_id.id,
-                "other_product_id": x.estate_id.harvest_other_product_id.id,
-                "total_weight": 0,
-                "total_qty": 0,
-                "brondolan_weight": 0,
-                "brondolan_qty": 0,
-            }
-            for x in picking_ids.mapped("harvest_ids.block_id")
-        }
-        for picking in picking_ids:
-            scale_weight = picking.unload_weight + picking.additional_weight
-            total_tbs = picking.total_harvest_qty
-            total_brondolan = picking.total_other_harvest_qty
-            bjr, bjr_brondolan = 0, 0
-
-            if total_tbs > 0 and total_brondolan == 0:
-                bjr = scale_weight / total_tbs
-            elif total_tbs == 0 and total_brondolan > 0:
-                bjr_brondolan = scale_weight / total_brondolan
-            elif total_tbs > 0 and total_brondolan > 0:
-                brondolan_weight = sum(
-                    harvest._compute_other_harvest_stock()
-                    for harvest in picking.harvest_ids.filtered(
-                        lambda x: x.other_harvest_qty > 0
-                    )
-                )
-                bjr_brondolan = brondolan_weight / total_brondolan
-                bjr = (scale_weight - brondolan_weight) / total_tbs
-
-            block_data = self._get_block_bjr(
-                bjr, bjr_brondolan, picking, block_data, operation_date
-            )
-
-        for block_id, data in block_data.items():
-            bjr_block, brondolan_block = self._compute_average_weight(
-                data, block_id, operation_date
-            )
+    @api.model
+    def recompute_average_weight(self, date_from, date_to, afdeling_ids=None):
+        """Recompute the BJR of every harvest day between two dates, used to
+        backfill the average weights after late unloads"""
+        dates = self.env["estate.harvest"]._read_group(
+            [
+                ("operation_date", ">=", date_from),
+                ("operation_date", "<=", date_to),
+                ("picking_id", "!=", False),
+            ]
+            + ([("afdeling_id", "in", afdeling_ids)] if afdeling_ids else []),
+            ["operation_date:day"],
+        )
+        return self._recompute_average_weight(
+            [date for (date,) in dates], afdeling_ids
+        )
 
-            # Menulis rata-rata berat panen ke panen yang sesuai
-            harvest_ids.filtered(lambda x: x.block_id.id == block_id).write(
+    def _recompute_average_weight(self, operation_dates, afdeling_ids=None):
+        """Recompute the BJR of the given dates and the premi sourced from the
+        reweighted harvests, return the number of premi rows touched"""
+        if not operation_dates:
+            return {"daily": 0, "monthly": 0}
+        block_data = self._get_block_bjr_data(operation_dates, afdeling_ids)
+        self._upsert_bjr(block_data)
+
+        # Write the average weight of the block to its harvests of the day,
+        # one write per distinct weight
+        harvest_ids = self.env["estate.harvest"].search(
+            [
+                ("operation_date", "in", list(operation_dates)),
+                "|",
+                ("picking_id", "=", False),
+                ("picking_id.exclude_from_bjr", "=", False),
+            ]
+            + ([("afdeling_id", "in", afdeling_ids)] if afdeling_ids else [])
+        )
+        harvest_by_weight = defaultdict(lambda: self.env["estate.harvest"])
+        for harvest in harvest_ids:
+            data = block_data.get((harvest.block_id.id, harvest.operation_date))
+            if data:
+                harvest_by_weight[data["bjr"], data["brondolan_bjr"]] |= harvest
+        for (bjr, brondolan_bjr), harvests in harvest_by_weight.items():
+            harvests.write(
                 {
-                    "avg_weight": bjr_block,
-                    "other_avg_weight": brondolan_block,
-                    "exclude_from_bjr": excluded,
+                    "avg_weight": bjr,
+                    "other_avg_weight": brondolan_bjr,
+                    "exclude_from_bjr": True,
                 }
             )
-        # self._compute_move_ids()
 
-    def _compute_average_weight(self, data, block_id, operation_date):
-        bjr_block = (
-            data["total_weight"] / data["total_qty"] if data["total_qty"] > 0 else 0
+        # Keep the harvest daily figures in line with the new weights, then
+        # recompute the premi now instead of at commit to report them
+        harvest_ids._refresh_harvest_daily()
+        touched = self.env["estate.harvest"]._process_premi_dirty()
+        _logger.info(
+            "BJR update of %s day(s) touched %s daily and %s monthly premi rows",
+            len(operation_dates),
+            touched["daily"],
+            touched["monthly"],
         )
-        brondolan_block = (
-            data["brondolan_weight"] / data["brondolan_qty"]
-            if data["brondolan_qty"] > 0
-            else 0
-        )
-
-        harvest_average_logs = self.env["estate.bjr"]
-        logs = harvest_average_logs.search(
-            [
-                ("harvesting_date", "=", operation_date),
-                ("block_id", "=", block_id),
-            ]
+        return touched
+
+    def _get_block_bjr_data(self, operation_dates, afdeling_ids=None):
+        """Spread the scale weight of the pickings over their harvests and
+        return the weight and quantity of each block and operation date.
+
+        The weight of a picking is split in BJR of the main product and of
+        the other product (brondolan) from the picking totals, the weight of
+        the other product being its stock quantity when both are picked.
+        """
+        self.env["estate.harvest"].flush_model()
+        self.env["estate.operation"].flush_model(["operation_date", "afdeling_id"])
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            WITH harvest AS (
+                SELECT
+                    eh.id,
+                    eh.block_id,
+                    eo.operation_date,
+                    eh.picking_id,
+                    COALESCE(eh.harvest_qty_unit, 0) AS harvest_qty_unit,
+                    COALESCE(eh.other_harvest_qty, 0) AS other_harvest_qty
+                FROM
+                    estate_harvest eh
+                    JOIN estate_operation eo ON eh.estate_operation_id = eo.id
+                WHERE
+                    eo.operation_date = ANY(%(dates)s)
+                    AND (%(afdeling_ids)s IS NULL
+                        OR eo.afdeling_id = ANY(%(afdeling_ids)s))
+                    AND eh.picking_id IS NOT NULL
+            ), picking AS (
+                SELECT
+                    ep.id,
+                    COALESCE(ep.unload_weight, 0)
+                        + COALESCE(ep.additional_weight, 0) AS scale_weight,
+                    COALESCE(ep.total_harvest_qty, 0) AS total_qty,
+                    COALESCE(ep.total_other_harvest_qty, 0) AS brondolan_qty,
+                    COALESCE(SUM(COALESCE(eh.other_harvest_stock_qty, 0))
+                        FILTER (WHERE eh.other_harvest_qty > 0), 0)
+                    AS brondolan_weight
+                FROM
+                    estate_picking ep
+                    JOIN estate_harvest eh ON eh.picking_id = ep.id
+                WHERE
+                    ep.id IN (SELECT picking_id FROM harvest)
+                    AND NOT COALESCE(ep.exclude_from_bjr, FALSE)
+                GROUP BY
+                    ep.id
+            ), picking_bjr AS (
+                SELECT
+                    id,
+                    CASE
+                        WHEN total_qty > 0 AND brondolan_qty = 0
+                        THEN scale_weight / total_qty
+                        WHEN total_qty > 0 AND brondolan_qty > 0
+                        THEN (scale_weight - brondolan_weight) / total_qty
+                        ELSE 0
+                    END AS bjr,
+                    CASE
+                        WHEN total_qty = 0 AND brondolan_qty > 0
+                        THEN scale_weight / brondolan_qty
+                        WHEN total_qty > 0 AND brondolan_qty > 0
+                        THEN brondolan_weight / brondolan_qty
+                        ELSE 0
+                    END AS brondolan_bjr
+                FROM
+                    picking
+            )
+            SELECT
+                harvest.block_id,
+                harvest.operation_date,
+                SUM(harvest.harvest_qty_unit * picking_bjr.bjr) AS total_weight,
+                SUM(harvest.harvest_qty_unit) AS total_qty,
+                SUM(harvest.other_harvest_qty * picking_bjr.brondolan_bjr)
+                AS brondolan_weight,
+                SUM(harvest.other_harvest_qty) AS brondolan_qty
+            FROM
+                harvest
+                JOIN picking_bjr ON harvest.picking_id = picking_bjr.id
+            GROUP BY
+                harvest.block_id,
+                harvest.operation_date
+            """,
+            {
+                "dates": list(operation_dates),
+                "afdeling_ids": list(afdeling_ids) if afdeling_ids else None,
+            },
         )
-        if not logs:
-            self._create_bjr(data, block_id, operation_date, bjr_block, brondolan_block)
-        else:
-            for product_field, product_name in [
-                ("main_product_id", "total"),
-                ("other_product_id", "brondolan"),
-            ]:
-                # Filter logs based on product and date
-                logs.filtered(lambda x: x.product_id.id == data[product_field]).write(
-                    {
-                        "harvest_qty": data[f"{product_name}_qty"],
-                        "harvest_uom_qty": data[f"{product_name}_weight"],
-                        "bjr": bjr_block
-                        if product_field == "main_product_id"
-                        else brondolan_block,
-                    }
-                )
-        return bjr_block, brondolan_block
+        block_data = {}
+        for data in self.env.cr.dictfetchall():
+            data["bjr"] = (
+                data["total_weight"] / data["total_qty"] if data["total_qty"] else 0
+            )
+            data["brondolan_bjr"] = (
+                data["brondolan_weight"] / data["brondolan_qty"]
+                if data["brondolan_qty"]
+                else 0
+            )
+            block_data[data["block_id"], data["operation_date"]] = data
+        return block_data
 
-    def _create_bjr(self, data, block_id, operation_date, bjr_block, brondolan_block):
+    def _upsert_bjr(self, block_data):
+        if not block_data:
+            return
+        blocks = self.env["estate.block"].browse({key[0] for key in block_data})
+        bjr_logs = {
+            (log.block_id.id, log.harvesting_date, log.product_id.id): log
+            for log in self.env["estate.bjr"].search(
+                [
+                    ("block_id", "in", blocks.ids),
+                    ("harvesting_date", "in", list({key[1] for key in block_data})),
+                ]
+            )
+        }
         vals_list = []
-        for product_field in ["main_product_id", "other_product_id"]:
-            harvest_qty = (
-                data["total_qty"]
-                if product_field == "main_product_id"
-                else data["brondolan_qty"]
+        update_values = []
+        for (block_id, operation_date), data in block_data.items():
+            afdeling = blocks.browse(block_id).estate_id
+            for product, qty, weight, bjr in [
+                (
+                    afdeling.harvest_product_id,
+                    data["total_qty"],
+                    data["total_weight"],
+                    data["bjr"],
+                ),
+                (
+                    afdeling.harvest_other_product_id,
+                    data["brondolan_qty"],
+                    data["brondolan_weight"],
+                    data["brondolan_bjr"],
+                ),
+            ]:
+                log = bjr_logs.get((block_id, operation_date, product.id))
+                if log:
+                    update_values.append((log.id, qty, weight, bjr))
+                elif qty > 0 or weight > 0:
+                    vals_list.append(
+                        {
+                            "product_id": product.id,
+                            "harvesting_date": operation_date,
+                            "block_id": block_id,
+                            "harvest_qty": qty,
+                            "harvest_uom_qty": weight,
+                            "bjr": bjr,
+                            "description": BJR_DESCRIPTION,
+                        }
+                    )
+        if update_values:
+            self.env["estate.bjr"].flush_model()
+            ids, qtys, weights, bjrs = zip(*update_values)
+            self.env.cr.execute(
+                """
+                UPDATE estate_bjr bjr
+                SET
+                    harvest_qty = data.harvest_qty,
+                    harvest_uom_qty = data.harvest_uom_qty,
+                    bjr = data.bjr,
+                    write_uid = %(uid)s,
+                    write_date = NOW() AT TIME ZONE 'UTC'
+                FROM
+                    unnest(
+                        %(ids)s::int[],
+                        %(qtys)s::float8[],
+                        %(weights)s::float8[],
+                        %(bjrs)s::float8[]
+                    ) AS data(id, harvest_qty, harvest_uom_qty, bjr)
+                WHERE
+                    bjr.id = data.id
+                """,
+                {
+                    "uid": self.env.uid,
+                    "ids": list(ids),
+                    "qtys": list(qtys),
+                    "weights": list(weights),
+                    "bjrs": list(bjrs),
+                },
             )
-            harvest_uom_qty = (
-                data["total_weight"]
-                if product_field == "main_product_id"
-                else data["brondolan_weight"]
+            self.env["estate.bjr"].invalidate_model(
+                ["harvest_qty", "harvest_uom_qty", "bjr", "write_uid", "write_date"]
             )
-            if harvest_qty > 0 or harvest_uom_qty > 0:
-                vals_list.append(
-                    {
-                        "product_id": data[product_field],
-                        "harvesting_date": operation_date,
-                        "block_id": block_id,
-                        "harvest_qty": harvest_qty,
-                        "harvest_uom_qty": harvest_uom_qty,
-                        "bjr": bjr_block
-                        if product_field == "main_product_id"
-                        else brondolan_block,
-                        "description": "Automatic Generate by System based on Harvest",
-                    }
-                )
-
         self.env["estate.bjr"].create(vals_list)
 
-    def _get_block_bjr(self, bjr, bjr_brondolan, picking, block_data, operation_date):
-        harvest_ids = picking.mapped("harvest_ids").filtered(
-            lambda x: x.operation_date == operation_date
-        )
-        block_ids = harvest_ids.mapped("block_id")
-        for block in block_ids:
-            data = harvest_ids.filtered(lambda x: x.block_id == block)
-            total_tbs = sum(data.mapped("harvest_qty_unit"))
-            total_brondolan = sum(data.mapped("other_harvest_qty"))
-            tbs_weight = total_tbs * bjr
-            brondolan_weight = total_brondolan * bjr_brondolan
-            block_data[block.id]["total_weight"] += tbs_weight
-            block_data[block.id]["total_qty"] += total_tbs
-            block_data[block.id]["brondolan_weight"] += brondolan_weight
-            block_data[block.id]["brondolan_qty"] += total_brondolan
-        return block_data
-
     @api.model_create_multi
     def create(self, vals_list):
         for vals in vals_list:
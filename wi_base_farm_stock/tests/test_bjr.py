@@ -0,0 +1,94 @@
+from datetime import date
+
+from odoo.tests import tagged
+
+from odoo.addons.wi_base_farm.tests.common import EstateCommon
+
+
+@tagged("post_install", "-at_install")
+class TestBjr(EstateCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.operation_date = date(2025, 3, 10)
+        cls.other_block = cls._create_block("TEST-BLK-2")
+        # BJR of the year used by the harvests of the excluded picking
+        cls.env["estate.bjr"].create(
+            {
+                "block_id": cls.other_block.id,
+                "harvesting_date": date(2025, 1, 1),
+                "harvest_qty": 10.0,
+                "harvest_uom_qty": 90.0,
+            }
+        )
+        harvester = cls._create_employee("Harvester")
+        operation = cls._create_operation(cls.harvest_type, cls.operation_date)
+        cls.harvest_1, cls.harvest_2, cls.excluded_harvest = cls.env[
+            "estate.harvest"
+        ].create(
+            [
+                {
+                    "estate_operation_id": operation.id,
+                    "block_id": block.id,
+                    "member_id": harvester.id,
+                    "harvest_qty_unit": qty_unit,
+                }
+                for block, qty_unit in (
+                    (cls.block, 100),
+                    (cls.block, 50),
+                    (cls.other_block, 40),
+                )
+            ]
+        )
+        cls.pickings = cls.env["estate.picking"].create(
+            [
+                {
+                    "harvest_ids": [(6, 0, harvest.ids)],
+                    "unload_weight": unload_weight,
+                    "additional_weight": additional_weight,
+                    "exclude_from_bjr": exclude_from_bjr,
+                }
+                for harvest, unload_weight, additional_weight, exclude_from_bjr in (
+                    (cls.harvest_1, 1200.0, 0.0, False),
+                    (cls.harvest_2, 400.0, 100.0, False),
+                    (cls.excluded_harvest, 1000.0, 0.0, True),
+                )
+            ]
+        )
+
+    def _get_block_bjr(self, block):
+        return self.env["estate.bjr"].search(
+            [
+                ("block_id", "=", block.id),
+                ("harvesting_date", "=", self.operation_date),
+            ]
+        )
+
+    def test_compute_average_weight(self):
+        self.pickings.action_compute_average_weight()
+        # the scale weight of each picking is spread over its bunches
+        bjr = self._get_block_bjr(self.block)
+        self.assertEqual(len(bjr), 1)
+        self.assertEqual(bjr.product_id, self.harvest_product)
+        self.assertEqual(bjr.harvest_qty, 150.0)
+        self.assertAlmostEqual(bjr.harvest_uom_qty, 1700.0)
+        self.assertAlmostEqual(bjr.bjr, 1700.0 / 150.0)
+        for harvest in self.harvest_1 | self.harvest_2:
+            self.assertAlmostEqual(harvest.avg_weight, 1700.0 / 150.0)
+            self.assertTrue(harvest.exclude_from_bjr)
+        # the excluded picking neither creates a BJR nor reweighs its harvests
+        self.assertFalse(self._get_block_bjr(self.other_block))
+        self.assertEqual(self.excluded_harvest.avg_weight, 9.0)
+        self.assertFalse(self.excluded_harvest.exclude_from_bjr)
+
+    def test_recompute_average_weight_updates_bjr(self):
+        self.pickings.action_compute_average_weight()
+        bjr = self._get_block_bjr(self.block)
+        self.pickings[0].unload_weight = 1500.0
+        self.env["estate.picking"].recompute_average_weight(
+            self.operation_date, self.operation_date, self.afdeling.ids
+        )
+        self.assertEqual(self._get_block_bjr(self.block), bjr)
+        self.assertAlmostEqual(bjr.harvest_uom_qty, 2000.0)
+        self.assertAlmostEqual(bjr.bjr, 2000.0 / 150.0)
+        self.assertAlmostEqual(self.harvest_1.avg_weight, 2000.0 / 150.0)
@@ -1,2 +1,3 @@
 from . import estate_picking_wizard
 from . import monitoring_bjr_report
+from . import estate_bjr_recompute_wizard
@@ -0,0 +1,44 @@
+from datetime import date
+
+from odoo import _, api, fields, models
+from odoo.exceptions import ValidationError
+
+
+class EstateBjrRecomputeWizard(models.TransientModel):
+    _name = "estate.bjr.recompute.wizard"
+    _description = "Recompute Average Weight"
+
+    date_from = fields.Date(default=lambda self: date.today().replace(day=1))
+    date_to = fields.Date(default=fields.Date.today, required=True)
+    afdeling_ids = fields.Many2many(
+        comodel_name="estate.estate",
+        string="Afdeling",
+        domain="[('location_type','=','afdeling')]",
+        help="Leave empty to recompute every afdeling",
+    )
+
+    @api.constrains("date_from", "date_to")
+    def _check_dates(self):
+        for wizard in self:
+            if wizard.date_from and wizard.date_from > wizard.date_to:
+                raise ValidationError(_("Start date must be before end date."))
+
+    def action_recompute(self):
+        self.ensure_one()
+        touched = self.env["estate.picking"].recompute_average_weight(
+            self.date_from or date.min, self.date_to, self.afdeling_ids.ids
+        )
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Average Weight Recomputed"),
+                "message": _(
+                    "%(daily)s daily premi and %(monthly)s monthly premi lines "
+                    "recomputed.",
+                    **touched,
+                ),
+                "type": "success",
+                "next": {"type": "ir.actions.act_window_close"},
+            },
+        }
@@ -22,21 +22,20 @@ class MonitoringBjrReport(models.TransientModel):
         query_ = """
             SELECT
                 eb.id,
-                COALESCE(SUM(CASE WHEN eh.harvest_main_product_id = %(product_id)s
-                    THEN eh.harvest_qty_unit
-                    WHEN eh.harvest_other_product_id = %(product_id)s
-                    THEN eh.other_harvest_qty ELSE 0
+                COALESCE(SUM(CASE WHEN ehd.harvest_main_product_id = %(product_id)s
+                    THEN ehd.harvest_qty_unit
+                    WHEN ehd.harvest_other_product_id = %(product_id)s
+                    THEN ehd.other_harvest_qty ELSE 0
                     END),0) AS harvest_qty
             FROM
                 estate_estate ee
-                FULL JOIN estate_block eb ON eb.estate_id = ee.id
-                FULL JOIN estate_harvest eh ON eh.block_id = eb.id
+                JOIN estate_block eb ON eb.estate_id = ee.id
+                JOIN estate_harvest_daily ehd ON ehd.block_id = eb.id
             WHERE
                 ee.parent_id = %(estate_id)s
-                AND (eh.harvest_main_product_id = %(product_id)s
-                    OR eh.harvest_other_product_id = %(product_id)s)
-                AND eh.state != 'cancel'
-                AND CAST(eh.harvest_qty_unit + eh.other_harvest_qty AS numeric) != 0
+                AND (ehd.harvest_main_product_id = %(product_id)s
+                    OR ehd.harvest_other_product_id = %(product_id)s)
+                AND CAST(ehd.harvest_qty_unit + ehd.other_harvest_qty AS numeric) != 0
                 %(date_filter)s
             GROUP BY
                 eb.id
@@ -51,22 +50,21 @@ class MonitoringBjrReport(models.TransientModel):
         query_ = """
             SELECT
                 eb.id,
-                COALESCE(SUM(CASE WHEN eh.harvest_main_product_id = %(product_id)s
-                    THEN eh.harvest_qty_unit
-                    WHEN eh.harvest_other_product_id = %(product_id)s
-                    THEN eh.other_harvest_qty ELSE 0
+                COALESCE(SUM(CASE WHEN ehd.harvest_main_product_id = %(product_id)s
+                    THEN ehd.picked_harvest_qty_unit
+                    WHEN ehd.harvest_other_product_id = %(product_id)s
+                    THEN ehd.picked_other_harvest_qty ELSE 0
                     END),0) AS picking_qty
             FROM
                 estate_estate ee
-                FULL JOIN estate_block eb ON eb.estate_id = ee.id
-                FULL JOIN estate_harvest eh ON eh.block_id = eb.id
+                JOIN estate_block eb ON eb.estate_id = ee.id
+                JOIN estate_harvest_daily ehd ON ehd.block_id = eb.id
             WHERE
                 ee.parent_id = %(estate_id)s
-                AND (eh.harvest_main_product_id = %(product_id)s
-                    OR eh.harvest_other_product_id = %(product_id)s)
-                AND eh.state != 'cancel'
-                AND eh.picking_id != 0
-                AND CAST(eh.harvest_qty_unit + eh.other_harvest_qty AS numeric) != 0
+                AND (ehd.harvest_main_product_id = %(product_id)s
+                    OR ehd.harvest_other_product_id = %(product_id)s)
+                AND CAST(ehd.picked_harvest_qty_unit + ehd.picked_other_harvest_qty
+                    AS numeric) != 0
                 %(date_filter)s
             GROUP BY
                 eb.id
@@ -207,6 +205,9 @@ class MonitoringBjrReport(models.TransientModel):
         day_filter = self._get_date_filter(params="day", field="eh.operation_date")
         month_filter = self._get_date_filter(params="month", field="eh.operation_date")
         year_filter = self._get_date_filter(params="year", field="eh.operation_date")
+        day_daily = self._get_date_filter(params="day", field="ehd.operation_date")
+        month_daily = self._get_date_filter(params="month", field="ehd.operation_date")
+        year_daily = self._get_date_filter(params="year", field="ehd.operation_date")
         day_remnant = self._get_date_filter(params="day", field="erl.restan_date")
         query = """
             WITH harvest_ttd AS (
@@ -248,15 +249,15 @@ class MonitoringBjrReport(models.TransientModel):
 	            eb.planting_year
         """ % {
             "header_query": self.header_query(),
-            "harvest_ttd": self.harvest_query(day_filter),
-            "picking_ttd": self.picking_query(day_filter),
+            "harvest_ttd": self.harvest_query(day_daily),
+            "picking_ttd": self.picking_query(day_daily),
             "avg_weight_ttd": self.avg_weight_query(day_filter),
             "remnant_ttd": self.remnant_query(day_remnant),
-            "harvest_mtd": self.harvest_query(month_filter),
-            "picking_mtd": self.picking_query(month_filter),
+            "harvest_mtd": self.harvest_query(month_daily),
+            "picking_mtd": self.picking_query(month_daily),
             "avg_weight_mtd": self.avg_weight_query(month_filter),
-            "harvest_ytd": self.harvest_query(year_filter),
-            "picking_ytd": self.picking_query(year_filter),
+            "harvest_ytd": self.harvest_query(year_daily),
+            "picking_ytd": self.picking_query(year_daily),
             "avg_weight_ytd": self.avg_weight_query(year_filter),
         }
         return query
@@ -52,7 +52,7 @@ class EstateBlock(models.Model):
                 ELSE 0 END
             AS avg_other_harvest_weight
         FROM
-            estate_harvest
+            estate_harvest_daily
         WHERE
             operation_date BETWEEN %(fromDate)s AND %(toDate)s
             AND block_id IN %(block_id)s
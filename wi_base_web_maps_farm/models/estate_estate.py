@@ -42,7 +42,7 @@ class EstateEstate(models.Model):
                     ELSE 0 END
                 AS avg_other_harvest_weight
             FROM
-                estate_harvest
+                estate_harvest_daily
             WHERE
                 operation_date BETWEEN %(fromDate)s AND %(toDate)s
                 AND afdeling_id IN %(afdeling_id)s
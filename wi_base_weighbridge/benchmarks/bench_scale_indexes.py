@@ -0,0 +1,246 @@
+"""Benchmark of the weighbridge ticket hot paths with and without their indexes.
+
+Run it from an Odoo shell on a copy of a database with this module installed::
+
+    odoo-bin shell -d <database> < bench_scale_indexes.py
+
+A million synthetic tickets are seeded in SQL and the daily totals are
+rebuilt. Each access path then runs under ``EXPLAIN ANALYZE`` twice: once
+with the indexes declared by the weighbridge models dropped, and once after
+``init`` has created them again. The purchase order lookup is only measured
+when wi_base_weighbridge_purchase is installed and a purchase order exists
+to copy. Everything is rolled back at the end. Dropping an index locks its
+table until then, so do not run this on a database in use.
+"""
+
+import json
+import time
+import uuid
+
+TICKET_COUNT = 1000000
+PURCHASE_ORDER_COUNT = 100000
+DAY_COUNT = 730
+LOOKUP_COUNT = 100
+
+INDEXES = {
+    "weighbridge.scale": (
+        "weighbridge_scale_name_index",
+        "weighbridge_scale_partner_id_date_index",
+        "weighbridge_scale_product_id_date_counted_index",
+    ),
+    "weighbridge.scale.daily": (
+        "weighbridge_scale_daily_product_id_company_id_date_index",
+    ),
+    "purchase.order": ("purchase_order_weighbridge_date_partner_index",),
+}
+
+
+def _seed_tickets(env, prefix, count=TICKET_COUNT):
+    weighbridge = env["weighbridge.weighbridge"].search([], limit=1)
+    products = env["product.product"].search([("weighbridge_data", "=", True)])
+    partners = env["res.partner"].search([("weighbridge_data", "=", True)])
+    if not (weighbridge and products and partners):
+        raise ValueError(
+            "A weighbridge, a weighbridge product and a weighbridge partner "
+            "are required to run this benchmark."
+        )
+    env.cr.execute(
+        """
+        INSERT INTO weighbridge_scale (
+            name, company_id, weighbridge_id, date, product_id, partner_id,
+            state, delivery_type, weight_in, weight_out, net_weight,
+            net_after_quality_control,
+            create_uid, create_date, write_uid, write_date
+        )
+        SELECT
+            %(prefix)s || LPAD(g::text, 7, '0'),
+            %(company_id)s,
+            %(weighbridge_id)s,
+            CURRENT_DATE - (g %% %(days)s),
+            (%(product_ids)s::int[])[1 + g %% %(product_count)s],
+            (%(partner_ids)s::int[])[1 + g %% %(partner_count)s],
+            (ARRAY['draft', 'posted', 'locked', 'cancel'])[1 + g %% 4],
+            (ARRAY['acceptance', 'shipment'])[1 + g %% 2],
+            25000, 10000, 15000, 15000,
+            %(uid)s, NOW() AT TIME ZONE 'UTC',
+            %(uid)s, NOW() AT TIME ZONE 'UTC'
+        FROM
+            generate_series(1, %(count)s) AS g
+        """,
+        {
+            "prefix": prefix,
+            "company_id": env.company.id,
+            "weighbridge_id": weighbridge.id,
+            "days": DAY_COUNT,
+            "product_ids": products.ids,
+            "product_count": len(products),
+            "partner_ids": partners.ids,
+            "partner_count": len(partners),
+            "uid": env.uid,
+            "count": count,
+        },
+    )
+    env["weighbridge.scale.daily"]._refresh()
+    return weighbridge, products, partners
+
+
+def _seed_purchase_orders(env, prefix, weighbridge, partners):
+    if "purchase.order" not in env or (
+        "weighbridge_weighbridge_id" not in env["purchase.order"]._fields
+    ):
+        return False
+    template = env["purchase.order"].search([], limit=1)
+    if not template:
+        return False
+    overrides = {
+        "name": "%(prefix)s || LPAD(g::text, 7, '0')",
+        "weighbridge_weighbridge_id": "%(weighbridge_id)s",
+        "date_order": "CURRENT_DATE - (g %% %(days)s)",
+        "partner_id": "(%(partner_ids)s::int[])[1 + g %% %(partner_count)s]",
+        "state": "(ARRAY['purchase', 'cancel'])[1 + g %% 2]",
+    }
+    env.cr.execute(
+        """
+        SELECT column_name
+        FROM information_schema.columns
+        WHERE table_name = 'purchase_order' AND column_name != 'id'
+        """
+    )
+    columns = [column for (column,) in env.cr.fetchall()]
+    values = [overrides.get(column, f'po."{column}"') for column in columns]
+    env.cr.execute(
+        f"""
+        INSERT INTO purchase_order ({", ".join(f'"{c}"' for c in columns)})
+        SELECT {", ".join(values)}
+        FROM
+            purchase_order po,
+            generate_series(1, %(count)s) AS g
+        WHERE
+            po.id = %(template_id)s
+        """,
+        {
+            "prefix": f"PO/{prefix}",
+            "weighbridge_id": weighbridge.id,
+            "days": DAY_COUNT,
+            "partner_ids": partners.ids,
+            "partner_count": len(partners),
+            "count": PURCHASE_ORDER_COUNT,
+            "template_id": template.id,
+        },
+    )
+    return True
+
+
+def _get_paths(env, prefix, weighbridge, products, partners, purchase):
+    names = [
+        f"{prefix}{index:07d}"
+        for index in range(1, TICKET_COUNT, TICKET_COUNT // LOOKUP_COUNT)
+    ]
+    paths = [
+        (
+            "ticket by name",
+            "SELECT id FROM weighbridge_scale WHERE name = ANY(%s)",
+            [names],
+        ),
+        (
+            "portal partner",
+            """
+            SELECT id FROM weighbridge_scale
+            WHERE partner_id = %s
+            ORDER BY date DESC, id
+            LIMIT 80
+            """,
+            [partners[0].id],
+        ),
+        (
+            "daily refresh",
+            """
+            SELECT date, company_id, product_id, delivery_type, COUNT(1),
+                SUM(net_weight), SUM(net_after_quality_control)
+            FROM weighbridge_scale
+            WHERE state IN ('posted', 'locked')
+                AND product_id = ANY(%s)
+                AND date >= CURRENT_DATE - 7
+            GROUP BY date, company_id, product_id, delivery_type
+            """,
+            [products[:1].ids],
+        ),
+        (
+            "dashboard",
+            """
+            SELECT product_id, company_id, date, SUM(count),
+                SUM(net_weight), SUM(net_after_quality_control)
+            FROM weighbridge_scale_daily
+            WHERE product_id = ANY(%s)
+                AND company_id = ANY(%s)
+                AND date > CURRENT_DATE - 30
+                AND date <= CURRENT_DATE
+            GROUP BY product_id, company_id, date
+            """,
+            [products.ids, [env.company.id]],
+        ),
+    ]
+    if purchase:
+        paths.append(
+            (
+                "purchase order",
+                """
+                SELECT id FROM purchase_order
+                WHERE weighbridge_weighbridge_id = %s
+                    AND date_order = CURRENT_DATE - 1
+                    AND partner_id = %s
+                    AND state != 'cancel'
+                """,
+                [weighbridge.id, partners[0].id],
+            )
+        )
+    return paths
+
+
+def _explain(env, query, params):
+    env.cr.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {query}", params)
+    plan = env.cr.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Execution Time"], plan[0]["Plan"]["Node Type"]
+
+
+def _analyze(env):
+    for model in INDEXES:
+        if model in env:
+            env.cr.execute(f"ANALYZE {env[model]._table}")
+
+
+def run(env):
+    prefix = f"BENCH/{uuid.uuid4().hex[:8]}/"
+    start = time.perf_counter()
+    weighbridge, products, partners = _seed_tickets(env, prefix)
+    purchase = _seed_purchase_orders(env, prefix, weighbridge, partners)
+    print(f"seeded {TICKET_COUNT} tickets in {time.perf_counter() - start:.1f}s")
+    paths = _get_paths(env, prefix, weighbridge, products, partners, purchase)
+
+    for indexes in INDEXES.values():
+        for index in indexes:
+            env.cr.execute(f"DROP INDEX IF EXISTS {index}")
+    _analyze(env)
+    before = [_explain(env, query, params) for _name, query, params in paths]
+
+    for model in INDEXES:
+        if model in env:
+            env[model].init()
+    _analyze(env)
+    after = [_explain(env, query, params) for _name, query, params in paths]
+
+    print(f"{'path':<16} {'no index ms':>12} {'index ms':>10} {'speedup':>8}  plan")
+    for (name, _query, _params), before_plan, after_plan in zip(paths, before, after):
+        (before_ms, before_node), (after_ms, after_node) = before_plan, after_plan
+        print(
+            f"{name:<16} {before_ms:>12.2f} {after_ms:>10.2f} "
+            f"{before_ms / max(after_ms, 0.001):>7.1f}x  {before_node} -> {after_node}"
+        )
+    env.cr.rollback()
+    env.invalidate_all()
+
+
+if "env" in globals():
+    run(env)  # noqa: F821
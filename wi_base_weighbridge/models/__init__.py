@@ -1,4 +1,5 @@
 from . import weighbridge_scale
+from . import weighbridge_scale_daily
 from . import weighbridge_quality_type
 from . import weighbridge_weighbridge
 from . import weighbridge_quality_control
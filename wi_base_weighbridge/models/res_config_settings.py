@@ -46,6 +46,14 @@ class ResConfigSettings(models.TransientModel):
         help="This field is used to set the number of digits for the seal number",
     )
 
+    weighbridge_dashboard_cache_ttl = fields.Integer(
+        string="Dashboard Cache Duration",
+        config_parameter="wi_base_weighbridge.dashboard_cache_ttl",
+        default=300,
+        help="Seconds the weighbridge dashboard cards are served from the cache "
+        "before they are computed again, 0 to disable the cache",
+    )
+
     group_shrinkage = fields.Boolean(
         string="Shrinkage",
         implied_group="wi_base_weighbridge.group_shrinkage",
@@ -169,6 +169,16 @@ class WeighbridgeQualityControl(models.Model):
         for record in self:
             record.return_qty_total = sum(record.return_ids.mapped("return_qty"))
 
+    def write(self, vals):
+        scales = self.weighbridge_scale_id
+        res = super().write(vals)
+        (scales | self.weighbridge_scale_id)._refresh_scale_daily()
+        return res
+
+    def unlink(self):
+        self.weighbridge_scale_id._refresh_scale_daily()
+        return super().unlink()
+
     def action_post(self):
         if self.state == "draft":
             self.write({"state": "posted"})
@@ -193,7 +203,9 @@ class WeighbridgeQualityControl(models.Model):
                 vals["name"] = self.env["ir.sequence"].next_by_code(
                     "weighbridge.quality.control"
                 )
-        return super().create(vals_list)
+        records = super().create(vals_list)
+        records.weighbridge_scale_id._refresh_scale_daily()
+        return records
 
     def action_splitted_quality_control_tree(self):
         return self._get_action(
@@ -312,6 +324,22 @@ class WeighbridgeQualityControlPenalty(models.Model):
         readonly=True,
     )
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records.weighbridge_scale_id._refresh_scale_daily()
+        return records
+
+    def write(self, vals):
+        scales = self.weighbridge_scale_id
+        res = super().write(vals)
+        (scales | self.weighbridge_scale_id)._refresh_scale_daily()
+        return res
+
+    def unlink(self):
+        self.weighbridge_scale_id._refresh_scale_daily()
+        return super().unlink()
+
     @api.depends("penalty_id")
     def _compute_calculation_type(self):
         # Compute Calculation Type
@@ -1,7 +1,7 @@
 from ast import literal_eval
 from datetime import date, datetime
 
-from odoo import _, api, fields, models
+from odoo import _, api, fields, models, tools
 from odoo.exceptions import UserError
 
 SCALE_STATE = [
@@ -15,6 +15,25 @@ SCALE_STATE = [
 
 DELIVERY_TYPE = [("shipment", "Shipment"), ("acceptance", "Acceptance")]
 
+# Ticket states counted in the daily totals, and the fields changing them:
+# the fields read by the rollup and those its weights are computed from
+DAILY_SCALE_STATES = ("posted", "locked")
+DAILY_SCALE_FIELDS = {
+    "state",
+    "date",
+    "company_id",
+    "product_id",
+    "delivery_type",
+    "net_weight",
+    "net_after_quality_control",
+    "weight_in",
+    "weight_out",
+    "gross_quality_control",
+    "penalty_ids",
+    "quality_control_ids",
+}
+SCALE_DAILY_DIRTY_KEY = "weighbridge_scale_daily_dirty"
+
 
 class WeighbridgeScale(models.Model):
     _name = "weighbridge.scale"
@@ -295,6 +314,27 @@ class WeighbridgeScale(models.Model):
     )
     seal_number = fields.Char()
 
+    def init(self):
+        # ticket lookup by reference from the API ingest
+        tools.create_index(
+            self.env.cr, "weighbridge_scale_name_index", self._table, ["name"]
+        )
+        # portal list of a partner, sorted by date
+        tools.create_index(
+            self.env.cr,
+            "weighbridge_scale_partner_id_date_index",
+            self._table,
+            ["partner_id", "date DESC", "id"],
+        )
+        # refresh of the daily totals of counted tickets per product and day
+        tools.create_index(
+            self.env.cr,
+            "weighbridge_scale_product_id_date_counted_index",
+            self._table,
+            ["product_id", "date", "company_id"],
+            where="state IN ('posted', 'locked')",
+        )
+
     @api.depends("source_ids")
     def _compute_is_merge(self):
         for rec in self:
@@ -428,6 +468,50 @@ class WeighbridgeScale(models.Model):
                 vals["name"] = self.env["ir.sequence"].next_by_code("weighbridge.scale")
         return super().create(vals_list)
 
+    def write(self, vals):
+        if not DAILY_SCALE_FIELDS & set(vals):
+            return super().write(vals)
+        counted = self.filtered(lambda s: s.state in DAILY_SCALE_STATES)
+        keys = (set(counted.product_id.ids), set(counted.mapped("date")))
+        res = super().write(vals)
+        counted |= self.filtered(lambda s: s.state in DAILY_SCALE_STATES)
+        if counted:
+            counted._refresh_scale_daily(keys)
+        return res
+
+    def unlink(self):
+        counted = self.filtered(lambda s: s.state in DAILY_SCALE_STATES)
+        keys = (set(counted.product_id.ids), set(counted.mapped("date")))
+        res = super().unlink()
+        if counted:
+            self.env["weighbridge.scale"]._refresh_scale_daily(keys)
+        return res
+
+    def _refresh_scale_daily(self, keys=None):
+        """Queue the daily totals of the products and dates of the tickets
+        and of the (product ids, dates) they had before a change. They are
+        rebuilt once at the end of the transaction, from the final weights."""
+        product_ids, dates = keys or (set(), set())
+        data = self.env.cr.precommit.data
+        if SCALE_DAILY_DIRTY_KEY not in data:
+            self.env.cr.precommit.add(self._process_scale_daily_dirty)
+        dirty_product_ids, dirty_dates = data.setdefault(
+            SCALE_DAILY_DIRTY_KEY, (set(), set())
+        )
+        dirty_product_ids.update(product_ids, self.product_id.ids)
+        dirty_dates.update(dates, self.mapped("date"))
+
+    @api.model
+    def _process_scale_daily_dirty(self):
+        """Rebuild the daily totals queued by _refresh_scale_daily"""
+        product_ids, dates = self.env.cr.precommit.data.pop(
+            SCALE_DAILY_DIRTY_KEY, (set(), set())
+        )
+        if product_ids and dates:
+            # precommit hooks run after the final flush of the transaction
+            self.env.flush_all()
+            self.env["weighbridge.scale.daily"].sudo()._refresh(product_ids, dates)
+
     def action_cancel(self):
         self.write({"state": "cancel"})
         if self.state != "draft":
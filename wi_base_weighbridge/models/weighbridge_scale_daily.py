@@ -0,0 +1,122 @@
+from odoo import api, fields, models, tools
+
+from .weighbridge_scale import DAILY_SCALE_STATES, DELIVERY_TYPE
+
+
+class WeighbridgeScaleDaily(models.Model):
+    """
+    Ticket totals per company, product, delivery type and day, maintained
+    from the posted tickets so the dashboard does not scan weighbridge_scale
+    """
+
+    _name = "weighbridge.scale.daily"
+    _description = "Weighbridge Scale Daily"
+    _order = "date desc, product_id"
+
+    date = fields.Date(required=True, readonly=True, index=True)
+    company_id = fields.Many2one("res.company", readonly=True)
+    product_id = fields.Many2one("product.product", readonly=True)
+    delivery_type = fields.Selection(DELIVERY_TYPE, readonly=True)
+    count = fields.Integer(readonly=True)
+    net_weight = fields.Float(readonly=True)
+    net_after_quality_control = fields.Float(readonly=True)
+
+    def init(self):
+        tools.create_unique_index(
+            self.env.cr,
+            "weighbridge_scale_daily_unique_index",
+            self._table,
+            [
+                "date",
+                "COALESCE(company_id, 0)",
+                "COALESCE(product_id, 0)",
+                "COALESCE(delivery_type, '')",
+            ],
+        )
+        # dashboard cards read per product and company over a date window
+        tools.create_index(
+            self.env.cr,
+            "weighbridge_scale_daily_product_id_company_id_date_index",
+            self._table,
+            ["product_id", "company_id", "date"],
+        )
+        self.env.cr.execute(
+            "CREATE SEQUENCE IF NOT EXISTS weighbridge_scale_daily_version"
+        )
+        self.env.cr.execute("SELECT 1 FROM weighbridge_scale_daily LIMIT 1")
+        if not self.env.cr.rowcount:
+            self._refresh()
+
+    @api.model
+    def _refresh(self, product_ids=None, dates=None):
+        """Rebuild the rows of the given products and dates, all rows if none
+        are given, from the posted and locked tickets."""
+        self.env["weighbridge.scale"].flush_model()
+        conditions = ["TRUE"]
+        params = {"uid": self.env.uid, "states": list(DAILY_SCALE_STATES)}
+        if product_ids is not None:
+            conditions.append("{alias}product_id = ANY(%(product_ids)s)")
+            params["product_ids"] = list(product_ids)
+        if dates is not None:
+            conditions.append("{alias}date = ANY(%(dates)s)")
+            params["dates"] = list(dates)
+        where = " AND ".join(conditions)
+        self.env.cr.execute(
+            f"DELETE FROM weighbridge_scale_daily WHERE {where.format(alias='')}",
+            params,
+        )
+        self.env.cr.execute(
+            f"""
+            INSERT INTO weighbridge_scale_daily (
+                date, company_id, product_id, delivery_type,
+                count, net_weight, net_after_quality_control,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT
+                ws.date,
+                ws.company_id,
+                ws.product_id,
+                ws.delivery_type,
+                COUNT(1),
+                COALESCE(SUM(ws.net_weight), 0),
+                COALESCE(SUM(ws.net_after_quality_control), 0),
+                %(uid)s, NOW() AT TIME ZONE 'UTC',
+                %(uid)s, NOW() AT TIME ZONE 'UTC'
+            FROM
+                weighbridge_scale ws
+            WHERE
+                ws.state = ANY(%(states)s)
+                AND {where.format(alias="ws.")}
+            GROUP BY
+                ws.date,
+                ws.company_id,
+                ws.product_id,
+                ws.delivery_type
+            """,
+            params,
+        )
+        self.invalidate_model()
+        self._renew_version()
+
+    @api.model
+    def _get_version(self):
+        """Version of the daily totals, renewed after each committed refresh"""
+        # a new sequence reports the value its first nextval returns
+        self.env.cr.execute(
+            """
+            SELECT CASE WHEN is_called THEN last_value ELSE 0 END
+            FROM weighbridge_scale_daily_version
+            """
+        )
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _renew_version(self):
+        if "weighbridge_scale_daily_version" in self.env.cr.postcommit.data:
+            return
+        self.env.cr.postcommit.data["weighbridge_scale_daily_version"] = True
+
+        @self.env.cr.postcommit.add
+        def renew_version():
+            with self.env.registry.cursor() as cr:
+                cr.execute("SELECT nextval('weighbridge_scale_daily_version')")
@@ -1,12 +1,17 @@
 import json
+import time
 from ast import literal_eval
+from collections import defaultdict
 from datetime import date, timedelta
 
 from babel.dates import format_date
 
-from odoo import _, fields, models, tools
+from odoo import _, api, fields, models, tools
 from odoo.release import version
-from odoo.tools.misc import get_lang
+from odoo.tools.misc import format_datetime, get_lang
+
+# Seconds a computed card is served from the cache, 0 to disable the cache
+DASHBOARD_CACHE_TTL = 300
 
 
 class WeighbridgeScaleDashboard(models.Model):
@@ -38,130 +43,129 @@ class WeighbridgeScaleDashboard(models.Model):
     )
 
     kanban_dashboard_graph = fields.Text(
-        compute="_compute_kanban_dashboard_graph",
+        compute="_compute_kanban_dashboard",
     )
 
     def _compute_kanban_dashboard(self):
-        dashboard_data = self._get_scale_dashboard_data()
+        ttl = int(
+            self.env["ir.config_parameter"]
+            .sudo()
+            .get_param("wi_base_weighbridge.dashboard_cache_ttl", DASHBOARD_CACHE_TTL)
+        )
+        if ttl > 0:
+            payloads = self._get_cached_dashboard_payloads(
+                tuple(sorted(set(self.ids))),
+                get_lang(self.env).code,
+                fields.Date.context_today(self),
+                self.env["weighbridge.scale.daily"].sudo()._get_version(),
+                int(time.time() // ttl),
+            )
+        else:
+            payloads = self._get_dashboard_payloads()
+        company_count = len(self.env.companies)
         for product in self:
+            dashboard, graph, computed_at = payloads[product.id]
             product.kanban_dashboard = json.dumps(
-                dashboard_data[product.product_id], default=str
+                dict(
+                    dashboard,
+                    company_count=company_count,
+                    computed_at=format_datetime(
+                        self.env, computed_at, dt_format="short"
+                    ),
+                ),
+                default=str,
+            )
+            product.kanban_dashboard_graph = json.dumps(graph, default=str)
+
+    @api.model
+    @tools.ormcache("card_ids", "lang", "today", "version", "ttl_key")
+    def _get_cached_dashboard_payloads(self, card_ids, lang, today, version, ttl_key):
+        """Return the payloads of the cards. Cached per set of cards until the
+        TTL elapses or the daily totals are refreshed."""
+        return self.browse(card_ids).with_context(lang=lang)._get_dashboard_payloads()
+
+    def _get_dashboard_payloads(self):
+        """Return {card id: (dashboard data, graph data, computed at)}"""
+        daily_totals = self._fetch_daily_totals()
+        dashboard_data = self._get_scale_dashboard_data(daily_totals)
+        dashboard_graph_data = self._get_scale_dashboard_graph_data(daily_totals)
+        computed_at = fields.Datetime.now()
+        return {
+            product.id: (
+                dashboard_data[product.id],
+                dashboard_graph_data[product.id],
+                computed_at,
             )
+            for product in self
+        }
 
-    def _query_get_data(
-        self,
-        product_id,
-        company_id,
-        last_month,
-        today,
-        select_clause="",
-        from_clause="",
-        where_clause="",
-        group_by_clause="",
-    ):
-        _select = (
+    def _fetch_daily_totals(self):
+        """Return the daily rows of the last 31 days of all the cards, fetched
+        from the daily totals in a single query, as
+        {(product id, company id): [row, ...]} ordered by date"""
+        last_month, today = self._get_last_31_days()
+        self.env["weighbridge.scale.daily"].flush_model()
+        self.env.cr.execute(
             """
             SELECT
-                sum(net_after_quality_control) as net_after_quality_control,
-                count(1),
-                sum(net_weight) as net_weight
-                %s
-            """
-            % select_clause
-        )
-
-        _from = (
-            """
+                product_id,
+                company_id,
+                date,
+                SUM(count) AS count,
+                SUM(net_weight) AS net_weight,
+                SUM(net_after_quality_control) AS net_after_quality_control
             FROM
-                weighbridge_scale ws
-                %s
-            """
-            % from_clause
-        )
-
-        _where = """
+                weighbridge_scale_daily
             WHERE
-                product_id = %s
-                AND company_id = %s
-                AND date > '%s'
-                AND date <= '%s'
-                %s
-            """ % (
-            product_id,
-            company_id,
-            last_month,
-            today,
-            where_clause,
+                product_id = ANY(%s)
+                AND company_id = ANY(%s)
+                AND date > %s
+                AND date <= %s
+            GROUP BY
+                product_id,
+                company_id,
+                date
+            ORDER BY
+                date asc
+            """,
+            (self.product_id.ids, self.company_id.ids, last_month, today),
         )
+        daily_totals = defaultdict(list)
+        for row in self.env.cr.dictfetchall():
+            daily_totals[(row["product_id"], row["company_id"])].append(row)
+        return daily_totals
 
-        return "%s %s %s" % (_select, _from, _where)
-
-    def _get_scale_dashboard_data(self):
-        today = date.today()
-        last_month = today + timedelta(days=-30)
+    def _get_scale_dashboard_data(self, daily_totals=None):
+        if daily_totals is None:
+            daily_totals = self._fetch_daily_totals()
 
         dashboard_data = {}
         for product in self:
-            query = self._query_get_data(
-                product.id, self.env.company.id, last_month, today
-            )
-            self.env.cr.execute(query)
-            result = self.env.cr.dictfetchall()
-            dashboard_data[product.product_id] = {
-                "company_count": len(self.env.companies),
-                "net_after_quality_control": result[0]["net_after_quality_control"]
-                if result[0]["net_after_quality_control"] is not None
-                else 0,
-                "count": "{:,.2f}".format(result[0]["count"])
-                if result[0]["count"] is not None
-                else "0.00",
-                "net_weight": "{:,.2f}".format(result[0]["net_weight"])
-                if result[0]["net_weight"] is not None
-                else "0.00",
+            rows = daily_totals[(product.product_id.id, product.company_id.id)]
+            dashboard_data[product.id] = {
+                "net_after_quality_control": sum(
+                    row["net_after_quality_control"] for row in rows
+                ),
+                "count": "{:,.2f}".format(sum(row["count"] for row in rows)),
+                "net_weight": "{:,.2f}".format(sum(row["net_weight"] for row in rows)),
             }
 
         return dashboard_data
 
-    def _compute_kanban_dashboard_graph(self):
-        dashboard_graph_data = self._get_scale_dashboard_graph_data()
-        for product in self:
-            product.kanban_dashboard_graph = json.dumps(
-                dashboard_graph_data[product.product_id], default=str
-            )
-
-    def _get_scale_dashboard_graph_data(self):
+    def _get_scale_dashboard_graph_data(self, daily_totals=None):
         def build_graph_data(date, net_after_qc):
             name = format_date(date, "d LLLL Y", locale=locale)
             short_name = format_date(date, "d MMM", locale=locale)
             return {"x": short_name, "y": net_after_qc, "name": name}
 
-        today = date.today()
-        last_month = today + timedelta(days=-30)
+        if daily_totals is None:
+            daily_totals = self._fetch_daily_totals()
+        last_month, today = self._get_last_31_days()
         locale = get_lang(self.env).code
 
-        query = """
-            SELECT
-                ws.date,
-                sum(net_after_quality_control) as net_after_quality_control
-            FROM
-                weighbridge_scale ws
-            WHERE
-                product_id = %s
-                AND company_id = %s
-                AND date > %s
-                AND date <= %s
-            GROUP BY
-                ws.date
-            ORDER BY
-                ws.date asc
-        """
-
         dashboard_graph_data = {}
         for product in self:
-            self.env.cr.execute(
-                query, (product.id, self.env.company.id, last_month, today)
-            )
-            result = self.env.cr.dictfetchall()
+            result = daily_totals[(product.product_id.id, product.company_id.id)]
 
             graph_title, graph_key = product._graph_title_and_key()
             color = "#875A7B" if "e" in version else "#7c7bad"
@@ -185,7 +189,7 @@ class WeighbridgeScaleDashboard(models.Model):
                         )
                     )
 
-            dashboard_graph_data[product.product_id] = [
+            dashboard_graph_data[product.id] = [
                 {
                     "values": data,
                     "title": graph_title,
@@ -202,19 +206,19 @@ class WeighbridgeScaleDashboard(models.Model):
 
     def _query(self):
         select_ = """
-            ws.product_id as id,
-            count(1),
-            ws.product_id,
-            ws.company_id
+            min(wsd.id) as id,
+            sum(wsd.count) as count,
+            wsd.product_id,
+            wsd.company_id
         """
 
         from_ = """
-            weighbridge_scale ws
+            weighbridge_scale_daily wsd
         """
 
         group_by_ = """
-            ws.company_id,
-            ws.product_id
+            wsd.company_id,
+            wsd.product_id
         """
 
         return "(SELECT %s FROM %s GROUP BY %s)" % (select_, from_, group_by_)
@@ -16,48 +16,47 @@ class WeighbridgeScale(models.Model):
     )
 
     def action_post(self):
-        wb_map = {}
         res = super().action_post()
-        for wb in self:
+        for wb in self.filtered(lambda wb: not wb.auto_generated):
             company_sudo = (
                 self.env["res.company"]
                 .sudo()
                 ._find_company_from_partner(wb.partner_id.id)
             )
-            if (
-                company_sudo
-                and company_sudo.wb_rule_type == "weighbridge_scale"
-                and not wb.auto_generated
-            ):
-                wb_map.setdefault(company_sudo, self.env["weighbridge.scale"])
-                wb_map[company_sudo] += wb
-        for company_sudo, wb in wb_map.items():
-            context = dict(
-                self.env.context,
-                default_company_id=company_sudo.id,
-                default_auto_generated=True,
-                default_auto_shore_id=wb.id,
-                default_weight_in=wb.weight_out,
-                default_weight_out=wb.weight_in,
-                default_partner_id=wb.company_id.partner_id.id,
-                default_weighbridge_id=wb._get_default_weighbridge(company_sudo).id,
-            )
-            new_wb = (
-                wb.with_user(company_sudo.wb_intercompany_user_id.id)
-                .with_context(**context)
-                .with_company(company_sudo.id)
-                .copy()
-            )
-            new_wb.send_message(new_wb, wb)
-            new_wb._duplicate_quality_control_data(wb.quality_control_ids, new_wb)
-            wb.send_message(wb, new_wb)
-            wb.write(
-                {
-                    "auto_scale_id": new_wb.id,
-                }
-            )
+            if company_sudo and company_sudo.wb_rule_type == "weighbridge_scale":
+                wb._create_inter_company_scale(company_sudo)
         return res
 
+    def _create_inter_company_scale(self, company_sudo):
+        """Create the mirrored ticket of the ticket in the company of its
+        partner."""
+        self.ensure_one()
+        context = dict(
+            self.env.context,
+            default_company_id=company_sudo.id,
+            default_auto_generated=True,
+            default_auto_shore_id=self.id,
+            default_weight_in=self.weight_out,
+            default_weight_out=self.weight_in,
+            default_partner_id=self.company_id.partner_id.id,
+            default_weighbridge_id=self._get_default_weighbridge(company_sudo).id,
+        )
+        new_wb = (
+            self.with_user(company_sudo.wb_intercompany_user_id.id)
+            .with_context(**context)
+            .with_company(company_sudo.id)
+            .copy()
+        )
+        new_wb.send_message(new_wb, self)
+        new_wb._duplicate_quality_control_data(self.quality_control_ids, new_wb)
+        self.send_message(self, new_wb)
+        self.write(
+            {
+                "auto_scale_id": new_wb.id,
+            }
+        )
+        return new_wb
+
     def action_cancel(self):
         res = super().action_cancel()
         for wb in self:
@@ -0,0 +1,79 @@
+"""Benchmark of the scale ticket ingest used by /api/weighbridge/scale_ticket.
+
+Run it from an Odoo shell on a database with this module installed::
+
+    odoo-bin shell -d <database> < bench_scale_ticket_ingest.py
+
+For each batch size, the same synthetic tickets are ingested once with the
+batch path (``create_scale_data``) and once ticket by ticket, the way the
+endpoint used to work. Every run is rolled back, nothing is kept.
+"""
+
+import time
+import uuid
+
+BATCH_SIZES = (10, 100, 1000)
+
+
+def _prepare_tickets(env, size):
+    weighbridge = env["weighbridge.weighbridge"].search([], limit=1)
+    product = env["product.product"].search([("weighbridge_data", "=", True)], limit=1)
+    partner = env["res.partner"].search([("weighbridge_data", "=", True)], limit=1)
+    if not (weighbridge and product and partner):
+        raise ValueError(
+            "A weighbridge, a weighbridge product and a weighbridge partner "
+            "are required to run this benchmark."
+        )
+    prefix = uuid.uuid4().hex[:8]
+    return [
+        {
+            "ref_id": index,
+            "name": f"BENCH/{prefix}/{index:05d}",
+            "date": "01/01/2025",
+            "delivery_no": f"DO/{prefix}/{index:05d}",
+            "weighbridge_id": weighbridge.id,
+            "product_id": product.id,
+            "partner_id": partner.id,
+            "weight_in": 25000.0,
+            "weight_out": 10000.0,
+        }
+        for index in range(size)
+    ]
+
+
+def _ingest_one_by_one(scale_model, tickets, company):
+    for data in tickets:
+        if not scale_model.sudo().search([("name", "=", data["name"])]):
+            scale_model._create_scale_ticket(data, company)
+
+
+def _measure(env, function):
+    start = time.perf_counter()
+    function()
+    env.flush_all()
+    elapsed = time.perf_counter() - start
+    env.cr.rollback()
+    env.invalidate_all()
+    return elapsed
+
+
+def run(env, batch_sizes=BATCH_SIZES):
+    scale_model = env["weighbridge.scale"]
+    company = env.company.id
+    print(f"{'tickets':>8} {'batch t/s':>12} {'single t/s':>12} {'speedup':>8}")
+    for size in batch_sizes:
+        tickets = _prepare_tickets(env, size)
+        batch_time = _measure(
+            env, lambda t=tickets: scale_model.create_scale_data(t, company=company)
+        )
+        single_time = _measure(
+            env, lambda t=tickets: _ingest_one_by_one(scale_model, t, company)
+        )
+        print(
+            f"{size:>8} {size / batch_time:>12.1f} {size / single_time:>12.1f} "
+            f"{single_time / batch_time:>7.1f}x"
+        )
+
+
+if "env" in globals():
+    run(env)  # noqa: F821
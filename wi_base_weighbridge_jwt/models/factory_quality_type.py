@@ -10,7 +10,7 @@ class FactoryQualityType(models.Model):
     def get_product_quality_type(self, company=None):
         res = []
         domain = self.get_api_domain()
-        data = self.sudo().search(domain)
+        data = self.sudo().search(domain)._api_paginate()
         if data:
             for qtype in data:
                 res.append(self._prepare_data_prod_categ(qtype))
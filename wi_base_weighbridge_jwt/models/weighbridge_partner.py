@@ -22,7 +22,7 @@ class WeighbridgePartner(models.Model):
                 ("company_id", "=", company),
             ]
             domain.extend(company_domain)
-        data = self.sudo().with_company(company).search(domain)
+        data = self.sudo().with_company(company).search(domain)._api_paginate()
         if data:
             for partner in data:
                 res.append(self._prepare_weighbridge_data_partner(partner))
@@ -10,7 +10,7 @@ class ProductCategory(models.Model):
     def get_weighbridge_product_categories_data(self, company=None):
         res = []
         domain = self.get_api_domain()
-        data = self.sudo().with_company(company).search(domain)
+        data = self.sudo().with_company(company).search(domain)._api_paginate()
 
         if data:
             for category in data:
@@ -49,7 +49,7 @@ class ProductProduct(models.Model):
                 ("company_id", "=", company),
             ]
             domain.extend(company_domain)
-        data = self.sudo().with_company(company).search(domain)
+        data = self.sudo().with_company(company).search(domain)._api_paginate()
         if data:
             for product in data:
                 res.append(self._prepare_wb_data_product(product))
@@ -13,7 +13,7 @@ class WeighbridgeQualityType(models.Model):
             domain.append(("categories", "=", "return"))
         elif params == "fraction":
             domain.append(("categories", "=", "fraction"))
-        data = self.sudo().search(domain)
+        data = self.sudo().search(domain)._api_paginate()
         if data:
             calculation_uom = {
                 "percentage": "%",
@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from dateutil import parser
 
 from odoo import models
@@ -18,55 +20,102 @@ class WeighbridgeScale(models.Model):
         }
 
     def create_scale_data(self, requests, company=None):
+        """Create scale tickets sent by a weighbridge client.
+
+        Existing names are resolved with one search and all new tickets are
+        created and posted as a single batch. When the batch fails, it is
+        rolled back and every ticket is retried on its own so the response
+        still reports success or failure per ticket.
+        """
         try:
             success_data = []
             failed_data = []
             code = 201
-            savepoint = self.env.cr.savepoint()
+            existing_scales = {
+                scale.name: scale
+                for scale in self.sudo().search(
+                    [("name", "in", [data["name"] for data in requests])]
+                )
+            }
+            pending = {}
+            duplicates = []
             for data in requests:
-                try:
-                    record_exist = self.sudo().search([("name", "=", data["name"])])
-                    if not record_exist:
-                        savepoint = self.env.cr.savepoint()
+                record_exist = existing_scales.get(data["name"])
+                if record_exist:
+                    failed_data.append(
+                        self._prepare_scale_exist_response(record_exist, data)
+                    )
+                elif data["name"] in pending:
+                    duplicates.append(data)
+                else:
+                    try:
                         scale_data = self.prepare_weighbridge_scale_data(data)
-                        scale = self.sudo().with_company(company).create(scale_data)
-                        if scale:
-                            scale._auto_posting()
-                            success_data.append(
-                                self.prepare_response_data(
-                                    scale.id,
-                                    scale.name,
-                                    data["ref_id"],
-                                    "success",
-                                    "Record Created Successfully",
-                                )
+                    except Exception as e:
+                        code = 206
+                        failed_data.append(
+                            self.prepare_response_data(
+                                False, data["name"], data["ref_id"], "failed", str(e)
                             )
+                        )
+                        continue
+                    pending[data["name"]] = (data, scale_data)
+
+            scales = self._create_scale_batch(
+                [scale_data for _data, scale_data in pending.values()], company
+            )
+            if scales is None:
+                # Batch failed, isolate the faulty tickets
+                scales = self.browse()
+                for data, _scale_data in pending.values():
+                    scale, error = self._create_scale_ticket(data, company)
+                    if scale:
+                        scales |= scale
                     else:
+                        code = 206
                         failed_data.append(
                             self.prepare_response_data(
-                                record_exist.id,
-                                record_exist.name,
-                                data["ref_id"],
-                                "failed",
-                                (
-                                    f"A scale with the name '{data['name']}' "
-                                    f"already exists (ID: {record_exist.id})."
-                                ),
+                                False, data["name"], data["ref_id"], "failed", error
                             )
                         )
-                except Exception as e:
-                    code = 206
-                    failed_data.append(
+            created_scales = {scale.name: scale for scale in scales}
+            for data, _scale_data in pending.values():
+                scale = created_scales.get(data["name"])
+                if scale:
+                    success_data.append(
                         self.prepare_response_data(
-                            False,
-                            data["name"],
+                            scale.id,
+                            scale.name,
                             data["ref_id"],
-                            "failed",
-                            str(e),
+                            "success",
+                            "Record Created Successfully",
                         )
                     )
-                    savepoint.rollback()
+            for data in duplicates:
+                record_exist = created_scales.get(data["name"])
+                if record_exist:
+                    failed_data.append(
+                        self._prepare_scale_exist_response(record_exist, data)
+                    )
                     continue
+                scale, error = self._create_scale_ticket(data, company)
+                if scale:
+                    created_scales[scale.name] = scale
+                    success_data.append(
+                        self.prepare_response_data(
+                            scale.id,
+                            scale.name,
+                            data["ref_id"],
+                            "success",
+                            "Record Created Successfully",
+                        )
+                    )
+                else:
+                    code = 206
+                    failed_data.append(
+                        self.prepare_response_data(
+                            False, data["name"], data["ref_id"], "failed", error
+                        )
+                    )
             if len(success_data) == 0:
                 code = 400
             response = {"scale_ticket": success_data + failed_data}
@@ -76,6 +125,41 @@ class WeighbridgeScale(models.Model):
         except Exception as e:
             return 400, str(e), success_data
 
+    def _create_scale_batch(self, vals_list, company=None):
+        """Create and post all tickets at once, return None if any fails."""
+        if not vals_list:
+            return self.browse()
+        try:
+            with self.env.cr.savepoint():
+                scales = self.sudo().with_company(company).create(vals_list)
+                scales._auto_posting()
+        except Exception:
+            return None
+        return scales
+
+    def _create_scale_ticket(self, data, company=None):
+        """Create and post a single ticket, return the ticket and an error."""
+        try:
+            with self.env.cr.savepoint():
+                scale_data = self.prepare_weighbridge_scale_data(data)
+                scale = self.sudo().with_company(company).create(scale_data)
+                scale._auto_posting()
+        except Exception as e:
+            return self.browse(), str(e)
+        return scale, False
+
+    def _prepare_scale_exist_response(self, record_exist, data):
+        return self.prepare_response_data(
+            record_exist.id,
+            record_exist.name,
+            data["ref_id"],
+            "failed",
+            (
+                f"A scale with the name '{data['name']}' "
+                f"already exists (ID: {record_exist.id})."
+            ),
+        )
+
     def update_scale_data(self, requests, company=None):
         try:
             success_data = []
@@ -230,6 +314,11 @@ class WeighbridgeScale(models.Model):
         return load_info
 
     def _auto_posting(self):
-        for scale in self:
-            if scale.company_id.auto_post_scale_ticket:
-                scale.action_post()
+        """Post the tickets of the companies posting automatically, together
+        per company and date: posting tickets of several dates at once asks
+        for the merge order wizard instead of generating the orders."""
+        groups = defaultdict(lambda: self.browse())
+        for scale in self.filtered(lambda x: x.company_id.auto_post_scale_ticket):
+            groups[(scale.company_id, scale.date)] |= scale
+        for scales in groups.values():
+            scales.action_post()
@@ -17,7 +17,7 @@ class WeighbridgeWeighbridge(models.Model):
                 ("company_id", "=", company),
             ]
             domain.extend(company_domain)
-        data = self.sudo().search(domain)
+        data = self.sudo().search(domain)._api_paginate()
         if data:
             for weighbridge in data:
                 res.append(self._prepare_weighbridge_data(weighbridge))
@@ -1,4 +1,4 @@
-from odoo import api, fields, models
+from odoo import api, fields, models, tools
 
 
 class PurchaseOrder(models.Model):
@@ -19,6 +19,17 @@ class PurchaseOrder(models.Model):
         compute="_compute_weighbridge_scale_count",
     )
 
+    def init(self):
+        super().init()
+        # open order of a weighbridge, day and vendor looked up on ticket posting
+        tools.create_index(
+            self.env.cr,
+            "purchase_order_weighbridge_date_partner_index",
+            self._table,
+            ["weighbridge_weighbridge_id", "date_order", "partner_id"],
+            where="weighbridge_weighbridge_id IS NOT NULL AND state != 'cancel'",
+        )
+
     @api.depends("weighbridge_scale_ids")
     def _compute_weighbridge_scale_count(self):
         for rec in self:
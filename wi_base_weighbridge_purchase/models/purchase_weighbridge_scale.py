@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from odoo import fields, models
 
 
@@ -16,12 +18,12 @@ class WeighbridgeScale(models.Model):
         is_all_acceptance = all(data.delivery_type == "acceptance" for data in self)
         is_diff_date = any(data.date != date_ref for data in self)
         merge_po = self.company_id.merge_purchase_order
-        if is_all_acceptance and merge_po and (1 < len(self) <= 80) and is_diff_date:
+        if is_all_acceptance and merge_po and len(self) > 1 and is_diff_date:
             return self._trigger_wizard()
         else:
-            for rec in self:
-                if rec.delivery_type == "acceptance" and not rec.is_return:
-                    rec.purchase_id = rec.sudo()._generate_purchase_order()
+            self.filtered(
+                lambda rec: rec.delivery_type == "acceptance" and not rec.is_return
+            ).sudo()._generate_purchase_order()
 
         return res
 
@@ -40,61 +42,114 @@ class WeighbridgeScale(models.Model):
         }
 
     def _generate_purchase_order(self, date=False):
-        """Generate a purchase order using the vendor's parent company
-        if the setting is enabled.
-        If no parent company exists, use the original vendor.
-        Merges purchase orders if enabled, otherwise creates a new one.
+        """Generate the purchase orders of the tickets, grouped by weighbridge,
+        date and vendor. The vendor is the parent company of the partner if
+        the setting is enabled and it has one, otherwise the partner.
+        If merging is enabled, the lines of a group are added in one write to
+        the open order of its weighbridge, date and vendor when there is one.
+        Otherwise one order is created per group, or per ticket when merging
+        is disabled, and all new orders are confirmed together.
+        Return the orders.
         """
+        groups = defaultdict(lambda: self.browse())
+        for rec in self:
+            partner = rec._get_purchase_partner()
+            if not partner:
+                continue
+            # without merging, each ticket gets its own order
+            single_id = False if rec.company_id.merge_purchase_order else rec.id
+            groups[(rec.weighbridge_id, date or rec.date, partner, single_id)] |= rec
+
+        open_orders = self._get_open_purchase_orders(
+            [key[:3] for key in groups if not key[3]]
+        )
+        purchase_orders = self.env["purchase.order"]
+        new_orders_data = []
+        new_orders_scales = []
+        for (weighbridge, order_date, partner, single_id), scales in groups.items():
+            purchase_order_lines = [
+                scale._prepare_purchase_order_line(date=order_date) for scale in scales
+            ]
+            purchase_order = not single_id and open_orders.get(
+                (weighbridge, order_date, partner)
+            )
+            if purchase_order:
+                # Merge with existing purchase order
+                purchase_order.write(
+                    {
+                        "order_line": [(0, 0, line) for line in purchase_order_lines],
+                        "partner_ref": ", ".join(
+                            filter(
+                                None,
+                                [
+                                    purchase_order.partner_ref,
+                                    *scales.mapped("delivery_number"),
+                                ],
+                            )
+                        )
+                        or False,
+                        "origin": ", ".join(
+                            filter(
+                                None, [purchase_order.origin, *scales.mapped("name")]
+                            )
+                        ),
+                    }
+                )
+                scales.purchase_id = purchase_order
+                purchase_orders |= purchase_order
+            else:
+                purchase_order_data = scales._prepare_purchase_order(
+                    purchase_order_lines, date=order_date
+                )
+                purchase_order_data["partner_id"] = partner.id
+                new_orders_data.append(purchase_order_data)
+                new_orders_scales.append(scales)
 
-        date = self.date if not date else date
-        merge_po = self.company_id.merge_purchase_order
-
-        use_parent_company = self.company_id.purchase_to_parent_company
-
-        partner_id = self.partner_id.id
-        if use_parent_company and self.partner_id.parent_id:
-            partner_id = self.partner_id.parent_id.id
+        if new_orders_data:
+            new_orders = self.env["purchase.order"].create(new_orders_data)
+            new_orders.button_confirm()
+            for purchase_order, scales in zip(new_orders, new_orders_scales):
+                purchase_order.date_approve = purchase_order.date_planned
+                scales.purchase_id = purchase_order
+            purchase_orders |= new_orders
 
-        if not partner_id:
-            return False
+        return purchase_orders
 
-        purchase_order = self.env["purchase.order"].search(
+    def _get_purchase_partner(self):
+        self.ensure_one()
+        if self.company_id.purchase_to_parent_company and self.partner_id.parent_id:
+            return self.partner_id.parent_id
+        return self.partner_id
+
+    def _get_open_purchase_orders(self, keys):
+        """Return the open weighbridge orders of the given
+        (weighbridge, date, vendor) keys, found in a single search, as
+        {(weighbridge, date, vendor): purchase order}"""
+        if not keys:
+            return {}
+        purchase_orders = self.env["purchase.order"].search(
             [
-                ("weighbridge_weighbridge_id", "=", self.weighbridge_id.id),
-                ("date_order", "=", date),
-                ("partner_id", "=", partner_id),
+                ("weighbridge_weighbridge_id", "in", [key[0].id for key in keys]),
+                (
+                    "date_order",
+                    "in",
+                    list({fields.Datetime.to_datetime(key[1]) for key in keys}),
+                ),
+                ("partner_id", "in", [key[2].id for key in keys]),
                 ("state", "!=", "cancel"),
             ]
         )
-
-        if purchase_order and merge_po:
-            # Merge with existing purchase order
-            purchase_order_line_data = self._prepare_purchase_order_line(date=date)
-            purchase_order.write({"order_line": [(0, 0, purchase_order_line_data)]})
-
-            # Update partner reference
-            if purchase_order.partner_ref and self.delivery_number:
-                purchase_order.partner_ref += ", %s" % self.delivery_number
-            elif self.delivery_number:
-                purchase_order.partner_ref = self.delivery_number
-
-            # Update origin field
-            purchase_order.origin += ", %s" % self.name
-            purchase_id = purchase_order.id
-
-        else:
-            purchase_order_line_data = self._prepare_purchase_order_line(date=date)
-            purchase_order_data = self._prepare_purchase_order(
-                purchase_order_line_data, date=date
+        open_orders = {}
+        for purchase_order in purchase_orders:
+            open_orders.setdefault(
+                (
+                    purchase_order.weighbridge_weighbridge_id,
+                    purchase_order.date_order.date(),
+                    purchase_order.partner_id,
+                ),
+                purchase_order,
             )
-
-            purchase_order_data["partner_id"] = partner_id
-
-            purchase_id = self.env["purchase.order"].create(purchase_order_data)
-            purchase_id.button_confirm()
-            purchase_id.date_approve = purchase_id.date_planned
-
-        return purchase_id
+        return open_orders
 
     def _prepare_purchase_order_line(self, date=False):
         date = self.date if not date else date
@@ -108,19 +163,20 @@ class WeighbridgeScale(models.Model):
             "date_order": date,
         }
 
-    def _prepare_purchase_order(self, purchase_order_line, date=False):
-        date = self.date if not date else date
+    def _prepare_purchase_order(self, purchase_order_lines, date=False):
+        date = self[0].date if not date else date
         return {
             "weighbridge_scale_ids": self,
-            "weighbridge_weighbridge_id": self.weighbridge_id.id,
-            "partner_id": self.partner_id.id,
+            "weighbridge_weighbridge_id": self[0].weighbridge_id.id,
+            "partner_id": self[0].partner_id.id,
             "date_approve": date,
             "date_planned": date,
             "date_order": date,
-            "order_line": [(0, 0, purchase_order_line)],
-            "company_id": self.company_id.id,
-            "origin": self.name,
-            "partner_ref": self.delivery_number,
+            "order_line": [(0, 0, line) for line in purchase_order_lines],
+            "company_id": self[0].company_id.id,
+            "origin": ", ".join(self.mapped("name")),
+            "partner_ref": ", ".join(filter(None, self.mapped("delivery_number")))
+            or False,
         }
 
     def action_view_purchase_order(self):
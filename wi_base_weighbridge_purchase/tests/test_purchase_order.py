@@ -0,0 +1,130 @@
+from datetime import date
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestPurchaseOrder(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env.company
+        cls.weighbridge = cls.env["weighbridge.weighbridge"].create(
+            {
+                "name": "Test Weighbridge",
+                "code": "TWB",
+                "warehouse_id": cls.env["stock.warehouse"]
+                .search([("company_id", "=", cls.company.id)], limit=1)
+                .id,
+            }
+        )
+        cls.product = cls.env["product.product"].create(
+            {
+                "name": "Test Crude Palm Oil",
+                "type": "consu",
+                "uom_id": cls.env.ref("uom.product_uom_kgm").id,
+                "uom_po_id": cls.env.ref("uom.product_uom_kgm").id,
+                "weighbridge_data": True,
+            }
+        )
+        cls.vendor_a, cls.vendor_b = cls.env["res.partner"].create(
+            [{"name": "Test Vendor A"}, {"name": "Test Vendor B"}]
+        )
+        cls.ticket_date = date(2025, 3, 10)
+
+    def _create_tickets(self, *partner_dates):
+        return self.env["weighbridge.scale"].create(
+            [
+                {
+                    "weighbridge_id": self.weighbridge.id,
+                    "product_id": self.product.id,
+                    "partner_id": partner.id,
+                    "date": ticket_date,
+                    "weight_in": 25000.0 + index,
+                    "weight_out": 10000.0,
+                }
+                for index, (partner, ticket_date) in enumerate(partner_dates)
+            ]
+        )
+
+    def _get_orders(self):
+        return self.env["purchase.order"].search(
+            [("weighbridge_weighbridge_id", "=", self.weighbridge.id)]
+        )
+
+    def test_post_one_order_per_ticket(self):
+        self.company.merge_purchase_order = False
+        tickets = self._create_tickets(
+            (self.vendor_a, self.ticket_date),
+            (self.vendor_a, self.ticket_date),
+            (self.vendor_b, self.ticket_date),
+        )
+        tickets.action_post()
+        orders = self._get_orders()
+        self.assertEqual(len(orders), 3)
+        self.assertEqual(set(orders.mapped("state")), {"purchase"})
+        for ticket in tickets:
+            self.assertEqual(ticket.purchase_id.order_line.weighbridge_scale_id, ticket)
+            self.assertEqual(
+                ticket.purchase_id.order_line.product_qty, ticket.net_weight
+            )
+
+    def test_post_grouped_orders(self):
+        self.company.merge_purchase_order = True
+        tickets = self._create_tickets(
+            (self.vendor_a, self.ticket_date),
+            (self.vendor_a, self.ticket_date),
+            (self.vendor_b, self.ticket_date),
+        )
+        tickets.action_post()
+        orders = self._get_orders()
+        self.assertEqual(len(orders), 2)
+        self.assertEqual(set(orders.mapped("state")), {"purchase"})
+        order_a = orders.filtered(lambda o: o.partner_id == self.vendor_a)
+        self.assertEqual(tickets[:2].purchase_id, order_a)
+        self.assertEqual(order_a.order_line.weighbridge_scale_id, tickets[:2])
+        self.assertEqual(order_a.origin, ", ".join(tickets[:2].mapped("name")))
+
+        # a later ticket of the day is added to the open order of its vendor
+        later_ticket = self._create_tickets((self.vendor_a, self.ticket_date))
+        later_ticket.action_post()
+        self.assertEqual(self._get_orders(), orders)
+        self.assertEqual(later_ticket.purchase_id, order_a)
+        self.assertEqual(len(order_a.order_line), 3)
+        self.assertIn(later_ticket.name, order_a.origin)
+
+    def test_post_grouped_orders_of_several_dates(self):
+        self.company.merge_purchase_order = True
+        other_date = date(2025, 3, 11)
+        tickets = self._create_tickets(
+            (self.vendor_a, self.ticket_date),
+            (self.vendor_a, other_date),
+            (self.vendor_a, other_date),
+        )
+        action = tickets.action_post()
+        self.assertEqual(action["res_model"], "weighbridge.scale.merge.order")
+        self.assertFalse(self._get_orders())
+
+        # without a merge date, the tickets are grouped by their own date
+        orders = tickets.sudo()._generate_purchase_order()
+        self.assertEqual(len(orders), 2)
+        self.assertEqual(
+            tickets[1:].purchase_id.order_line.weighbridge_scale_id, tickets[1:]
+        )
+
+    def test_merge_order_wizard(self):
+        self.company.merge_purchase_order = True
+        tickets = self._create_tickets(
+            (self.vendor_a, self.ticket_date),
+            (self.vendor_a, date(2025, 3, 11)),
+        )
+        tickets.action_post()
+        wizard = (
+            self.env["weighbridge.scale.merge.order"]
+            .with_context(active_ids=tickets.ids)
+            .create({"merge": True, "date": self.ticket_date})
+        )
+        wizard.action_confirm()
+        order = tickets.purchase_id
+        self.assertEqual(len(order), 1)
+        self.assertEqual(order.order_line.weighbridge_scale_id, tickets)
@@ -9,7 +9,6 @@ class WeighbridgeScaleMergeOrder(models.TransientModel):
 
         is_acceptance = self.active_scale_ids[0].delivery_type == "acceptance"
         if is_acceptance:
-            for rec in self.active_scale_ids:
-                rec.purchase_id = rec.sudo()._generate_purchase_order(self.date)
+            self.active_scale_ids.sudo()._generate_purchase_order(self.date)
 
         return res
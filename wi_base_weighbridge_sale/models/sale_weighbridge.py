@@ -133,8 +133,13 @@ class SaleOrderLine(models.Model):
             self.product_qty = self.net_after_quality_control + self.adjustment
 
     def _action_launch_stock_rule(self, previous_product_uom_qty=False):
-        if not self.order_id.weighbridge_scale_ids:
-            return super()._action_launch_stock_rule()
+        # weighbridge tickets move the stock themselves
+        lines = self.filtered(lambda line: not line.order_id.weighbridge_scale_ids)
+        if lines:
+            return super(SaleOrderLine, lines)._action_launch_stock_rule(
+                previous_product_uom_qty=previous_product_uom_qty
+            )
+        return True
 
     @api.depends(
         "adjustment",
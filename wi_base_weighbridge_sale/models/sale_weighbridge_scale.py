@@ -1,4 +1,4 @@
-from datetime import timedelta
+from collections import defaultdict
 
 from odoo import fields, models
 
@@ -19,12 +19,12 @@ class WeighbridgeScale(models.Model):
         is_diff_date = any(data.date != date_ref for data in self)
         merge_so = self.company_id.merge_sale_order
 
-        if is_all_shipment and merge_so and (1 < len(self) <= 80) and is_diff_date:
+        if is_all_shipment and merge_so and len(self) > 1 and is_diff_date:
             return self._trigger_wizard()
         else:
-            for rec in self:
-                if rec.delivery_type == "shipment" and not rec.is_return:
-                    rec.sale_id = rec.sudo()._generate_sale_order()
+            self.filtered(
+                lambda rec: rec.delivery_type == "shipment" and not rec.is_return
+            ).sudo()._generate_sale_order()
 
         return res
 
@@ -43,37 +43,94 @@ class WeighbridgeScale(models.Model):
         }
 
     def _generate_sale_order(self, date=False):
-        date = self.date if not date else date
-        merge_so = self.company_id.merge_sale_order
-        date_start = date
-        date_end = date_start + timedelta(days=1)
-        partner_id = self.partner_id.id
-        if self.partner_id.parent_id:
-            partner_id = self.partner_id.parent_id.id
-        sale_order = self.env["sale.order"].search(
+        """Generate the sale orders of the tickets, grouped by customer, date
+        and weighbridge. The customer is the parent company of the partner if
+        it has one. If merging is enabled, the lines of a group are added in
+        one write to the open order of its customer, date and weighbridge when
+        there is one. Otherwise one order is created per group, or per ticket
+        when merging is disabled, and all new orders are confirmed together.
+        Return the orders.
+        """
+        groups = defaultdict(lambda: self.browse())
+        for rec in self:
+            partner = rec.partner_id.parent_id or rec.partner_id
+            # without merging, each ticket gets its own order
+            single_id = False if rec.company_id.merge_sale_order else rec.id
+            groups[(partner, date or rec.date, rec.weighbridge_id, single_id)] |= rec
+
+        open_orders = self._get_open_sale_orders(
+            [key[:3] for key in groups if not key[3]]
+        )
+        sale_orders = self.env["sale.order"]
+        new_orders_data = []
+        new_orders_scales = []
+        for (partner, order_date, weighbridge, single_id), scales in groups.items():
+            sale_order_lines = [
+                scale._prepare_sale_order_line(date=order_date) for scale in scales
+            ]
+            sale_order = not single_id and open_orders.get(
+                (partner, order_date, weighbridge)
+            )
+            if sale_order:
+                sale_order.write(
+                    {
+                        "order_line": [(0, 0, line) for line in sale_order_lines],
+                        "client_order_ref": ", ".join(
+                            filter(
+                                None,
+                                [
+                                    sale_order.client_order_ref,
+                                    *scales.mapped("delivery_number"),
+                                ],
+                            )
+                        )
+                        or False,
+                    }
+                )
+                scales.sale_id = sale_order
+                sale_orders |= sale_order
+            else:
+                sale_order_data = scales._prepare_sale_order(
+                    sale_order_lines, date=order_date
+                )
+                sale_order_data["partner_id"] = partner.id
+                new_orders_data.append(sale_order_data)
+                new_orders_scales.append(scales)
+
+        if new_orders_data:
+            new_orders = self.env["sale.order"].create(new_orders_data)
+            new_orders.action_confirm()
+            for sale_order, scales in zip(new_orders, new_orders_scales):
+                scales.sale_id = sale_order
+            sale_orders |= new_orders
+
+        return sale_orders
+
+    def _get_open_sale_orders(self, keys):
+        """Return the open weighbridge orders of the given
+        (customer, date, weighbridge) keys, found in a single search, as
+        {(customer, date, weighbridge): sale order}"""
+        if not keys:
+            return {}
+        sale_orders = self.env["sale.order"].search(
             [
-                ("weighbridge_weighbridge_id", "=", self.weighbridge_id.id),
-                ("validity_date", ">=", date_start),
-                ("validity_date", "<", date_end),
-                ("partner_id", "=", partner_id),
+                ("partner_id", "in", [key[0].id for key in keys]),
+                ("validity_date", "in", list({key[1] for key in keys})),
+                ("weighbridge_weighbridge_id", "in", [key[2].id for key in keys]),
                 ("state", "!=", "cancel"),
             ]
         )
-        if sale_order and merge_so:
-            sale_order_line_data = self._prepare_sale_order_line(date=date)
-            sale_order["order_line"] = [(0, 0, sale_order_line_data)]
-            if sale_order["client_order_ref"] and self.delivery_number:
-                sale_order["client_order_ref"] += ", %s" % self.delivery_number
-            elif self.delivery_number:
-                sale_order["client_order_ref"] = self.delivery_number
-            sale_id = sale_order.id
-        else:
-            sale_order_line_data = self._prepare_sale_order_line(date=date)
-            sale_order_data = self._prepare_sale_order(sale_order_line_data, date=date)
-            sale_id = sale_order.create(sale_order_data)
-            sale_id.action_confirm()
-
-        return sale_id
+        open_orders = {}
+        for sale_order in sale_orders:
+            open_orders.setdefault(
+                (
+                    sale_order.partner_id,
+                    sale_order.validity_date,
+                    sale_order.weighbridge_weighbridge_id,
+                ),
+                sale_order,
+            )
+        return open_orders
 
     def _prepare_sale_order_line(self, date=False):
         date = self.date if not date else date
@@ -86,17 +143,18 @@ class WeighbridgeScale(models.Model):
             "scheduled_date": date,
         }
 
-    def _prepare_sale_order(self, sale_order_line, date=False):
-        date = self.date if not date else date
+    def _prepare_sale_order(self, sale_order_lines, date=False):
+        date = self[0].date if not date else date
         return {
             "weighbridge_scale_ids": self,
-            "weighbridge_weighbridge_id": self.weighbridge_id.id,
-            "partner_id": self.partner_id.id,
+            "weighbridge_weighbridge_id": self[0].weighbridge_id.id,
+            "partner_id": self[0].partner_id.id,
             "validity_date": date,
-            "order_line": [(0, 0, sale_order_line)],
-            "company_id": self.company_id.id,
-            "origin": self.name,
-            "client_order_ref": self.delivery_number,
+            "order_line": [(0, 0, line) for line in sale_order_lines],
+            "company_id": self[0].company_id.id,
+            "origin": ", ".join(self.mapped("name")),
+            "client_order_ref": ", ".join(filter(None, self.mapped("delivery_number")))
+            or False,
         }
 
     def action_view_sale_order(self):
@@ -0,0 +1,129 @@
+from datetime import date
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestSaleOrder(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.env.company
+        cls.weighbridge = cls.env["weighbridge.weighbridge"].create(
+            {
+                "name": "Test Weighbridge",
+                "code": "TWB",
+                "warehouse_id": cls.env["stock.warehouse"]
+                .search([("company_id", "=", cls.company.id)], limit=1)
+                .id,
+            }
+        )
+        cls.product = cls.env["product.product"].create(
+            {
+                "name": "Test Palm Kernel",
+                "type": "consu",
+                "uom_id": cls.env.ref("uom.product_uom_kgm").id,
+                "weighbridge_data": True,
+            }
+        )
+        cls.customer_a, cls.customer_b = cls.env["res.partner"].create(
+            [{"name": "Test Customer A"}, {"name": "Test Customer B"}]
+        )
+        cls.ticket_date = date(2025, 3, 10)
+
+    def _create_tickets(self, *partner_dates):
+        return self.env["weighbridge.scale"].create(
+            [
+                {
+                    "weighbridge_id": self.weighbridge.id,
+                    "product_id": self.product.id,
+                    "partner_id": partner.id,
+                    "date": ticket_date,
+                    "weight_in": 10000.0,
+                    "weight_out": 25000.0 + index,
+                }
+                for index, (partner, ticket_date) in enumerate(partner_dates)
+            ]
+        )
+
+    def _get_orders(self):
+        return self.env["sale.order"].search(
+            [("weighbridge_weighbridge_id", "=", self.weighbridge.id)]
+        )
+
+    def test_post_one_order_per_ticket(self):
+        self.company.merge_sale_order = False
+        tickets = self._create_tickets(
+            (self.customer_a, self.ticket_date),
+            (self.customer_a, self.ticket_date),
+            (self.customer_b, self.ticket_date),
+        )
+        tickets.action_post()
+        orders = self._get_orders()
+        self.assertEqual(len(orders), 3)
+        self.assertEqual(set(orders.mapped("state")), {"sale"})
+        for ticket in tickets:
+            self.assertEqual(ticket.sale_id.order_line.weighbridge_scale_id, ticket)
+            self.assertEqual(
+                ticket.sale_id.order_line.product_uom_qty, ticket.net_weight
+            )
+
+    def test_post_grouped_orders(self):
+        self.company.merge_sale_order = True
+        tickets = self._create_tickets(
+            (self.customer_a, self.ticket_date),
+            (self.customer_a, self.ticket_date),
+            (self.customer_b, self.ticket_date),
+        )
+        tickets.action_post()
+        orders = self._get_orders()
+        self.assertEqual(len(orders), 2)
+        self.assertEqual(set(orders.mapped("state")), {"sale"})
+        order_a = orders.filtered(lambda o: o.partner_id == self.customer_a)
+        self.assertEqual(tickets[:2].sale_id, order_a)
+        self.assertEqual(order_a.order_line.weighbridge_scale_id, tickets[:2])
+        self.assertEqual(order_a.origin, ", ".join(tickets[:2].mapped("name")))
+
+        # a later ticket of the day is added to the open order of its customer
+        later_ticket = self._create_tickets((self.customer_a, self.ticket_date))
+        later_ticket.action_post()
+        self.assertEqual(self._get_orders(), orders)
+        self.assertEqual(later_ticket.sale_id, order_a)
+        self.assertEqual(len(order_a.order_line), 3)
+        self.assertIn(later_ticket, order_a.order_line.weighbridge_scale_id)
+
+    def test_post_grouped_orders_of_several_dates(self):
+        self.company.merge_sale_order = True
+        other_date = date(2025, 3, 11)
+        tickets = self._create_tickets(
+            (self.customer_a, self.ticket_date),
+            (self.customer_a, other_date),
+            (self.customer_a, other_date),
+        )
+        action = tickets.action_post()
+        self.assertEqual(action["res_model"], "weighbridge.scale.merge.order")
+        self.assertFalse(self._get_orders())
+
+        # without a merge date, the tickets are grouped by their own date
+        orders = tickets.sudo()._generate_sale_order()
+        self.assertEqual(len(orders), 2)
+        self.assertEqual(
+            tickets[1:].sale_id.order_line.weighbridge_scale_id, tickets[1:]
+        )
+
+    def test_merge_order_wizard(self):
+        self.company.merge_sale_order = True
+        tickets = self._create_tickets(
+            (self.customer_a, self.ticket_date),
+            (self.customer_a, date(2025, 3, 11)),
+        )
+        tickets.action_post()
+        wizard = (
+            self.env["weighbridge.scale.merge.order"]
+            .with_context(active_ids=tickets.ids)
+            .create({"merge": True, "date": self.ticket_date})
+        )
+        wizard.action_confirm()
+        order = tickets.sale_id
+        self.assertEqual(len(order), 1)
+        self.assertEqual(order.order_line.weighbridge_scale_id, tickets)
@@ -9,7 +9,6 @@ class WeighbridgeScaleMergeOrder(models.TransientModel):
 
         is_shipment = self.active_scale_ids[0].delivery_type == "shipment"
         if is_shipment:
-            for rec in self.active_scale_ids:
-                rec.sale_id = rec.sudo()._generate_sale_order(self.date)
+            self.active_scale_ids.sudo()._generate_sale_order(self.date)
 
         return res